@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Position, ProcessNote, InterviewEvent
+from .models import Position, PostingSnapshot, ProcessNote, InterviewEvent
 
 
 @admin.register(Position)
@@ -21,3 +21,10 @@ class InterviewEventAdmin(admin.ModelAdmin):
     list_display = ['position', 'event_type', 'title', 'start_datetime', 'duration']
     list_filter = ['event_type', 'start_datetime']
     search_fields = ['title', 'description']
+
+
+@admin.register(PostingSnapshot)
+class PostingSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['url', 'content_hash', 'content_length', 'fetched_at']
+    search_fields = ['url', 'content_hash']
+    exclude = ['content']
@@ -0,0 +1,10 @@
+"""
+Helpers for benchmarking the job page extraction pipeline offline.
+
+  pages    synthetic job pages of a chosen size and DOM depth
+  corpus   the benchmark corpus and a fake session that serves it
+  stages   the extraction pipeline run stage by stage, with timings
+  timing   repeated timing of a call and its summary
+  server   a local stand-in job board for fetch throttling and retries
+  legacy   the original extraction code, for side-by-side comparison
+"""
@@ -0,0 +1,105 @@
+"""
+The offline benchmark corpus and a stand-in session that serves it.
+"""
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+from requests import HTTPError
+from requests.structures import CaseInsensitiveDict
+
+from .. import utils
+from ..site_profiles import get_registry, load_fixture
+from .pages import generate_job_page, generate_nested_page
+
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / 'bench_corpus'
+
+
+def load_corpus(path=None, max_page_bytes=None):
+    """
+    Load the benchmark corpus manifest and return a list of page dicts with
+    'name', 'url', 'content' (bytes) and 'expected' fields.
+
+    Manifest entries either name a site profile fixture ('fixture'), a
+    checked-in HTML file ('file') or a page generator from bench.pages
+    ('generator' with its 'options'). max_page_bytes caps the size of
+    generated pages, for a quick accuracy run.
+    """
+    path = Path(path) if path else CORPUS_DIR / 'corpus.json'
+    manifest = json.loads(path.read_text(encoding='utf-8'))
+    generators = {'job_page': generate_job_page, 'nested_page': generate_nested_page}
+    profiles = {profile.fixture: profile for profile in get_registry().profiles if profile.fixture}
+
+    pages = []
+    for entry in manifest['pages']:
+        if 'fixture' in entry:
+            url, content, expected = load_fixture(profiles[entry['fixture']])
+        elif 'file' in entry:
+            url, content, expected = entry['url'], (path.parent / entry['file']).read_bytes(), entry['expected']
+        else:
+            options = dict(entry.get('options', {}))
+            if max_page_bytes is not None and 'target_bytes' in options:
+                options['target_bytes'] = min(options['target_bytes'], max_page_bytes)
+            content = generators[entry['generator']](**options)
+            url, expected = entry['url'], entry['expected']
+        pages.append({'name': entry['name'], 'url': url, 'content': content, 'expected': expected})
+    return pages
+
+
+class CorpusResponse:
+    """Just enough of requests.Response for utils._download()"""
+
+    def __init__(self, url, content, status_code=200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8'})
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(f'{self.status_code} Client Error for url: {self.url}', response=self)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CorpusSession:
+    """Stand-in for the requests session that serves corpus pages by URL"""
+
+    def __init__(self, pages):
+        self.pages = {page['url']: page['content'] for page in pages}
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        if url not in self.pages:
+            return CorpusResponse(url, b'', status_code=404)
+        return CorpusResponse(url, self.pages[url])
+
+
+@contextmanager
+def serve_corpus(pages):
+    """Route utils.fetch_page() to the corpus instead of the network"""
+    previous = utils._session
+    utils._session = CorpusSession(pages)
+    try:
+        yield
+    finally:
+        utils._session = previous
+
+
+def field_accuracy(result, expected):
+    """Return {field: matched} for every field with an expected value"""
+    return {
+        field: (result.get(field) or None) == (value or None)
+        for field, value in expected.items()
+    }
@@ -0,0 +1,253 @@
+"""
+The original extraction code, kept for side-by-side comparison with the
+optimized paths in the benchmark commands and ExtractionEquivalenceTests.
+"""
+from bs4 import BeautifulSoup
+
+from ..matchers import LOCATION_KEYWORD_MATCHER, SALARY_MATCHER
+from ..utils import extract_from_next_data
+
+
+def legacy_parse_job_page(content):
+    """The original per-field extraction path, kept for side-by-side comparison"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    next_data = extract_from_next_data(soup)
+    if next_data:
+        return next_data
+
+    return {
+        'company_name': extract_company_name(soup),
+        'position_title': extract_position_title(soup),
+        'job_description': extract_job_desc_content(soup),
+        'salary_range': extract_salary(soup),
+        'location': extract_location(soup),
+    }
+
+
+def extract_company_name(soup):
+    """Extract company name from HTML"""
+    # Common patterns for company name
+    selectors = [
+        ('meta', {'property': 'og:site_name'}),
+        ('meta', {'name': 'author'}),
+        ('h1', {'class': lambda x: x and 'company' in x.lower()}),
+        ('span', {'class': lambda x: x and 'company' in x.lower()}),
+        ('div', {'class': lambda x: x and 'company' in x.lower()}),
+    ]
+
+    for tag, attrs in selectors:
+        element = soup.find(tag, attrs)
+        if element:
+            if tag == 'meta':
+                return element.get('content', '').strip()
+            else:
+                text = element.get_text(strip=True)
+                if text:
+                    return text
+
+    return None
+
+
+def extract_position_title(soup):
+    """Extract position title from HTML"""
+    # Common patterns for job title
+    selectors = [
+        ('meta', {'property': 'og:title'}),
+        ('h1', {}),
+        ('h2', {'class': lambda x: x and any(k in x.lower() for k in ['title', 'position', 'job'])}),
+        ('title', {}),
+    ]
+
+    for tag, attrs in selectors:
+        element = soup.find(tag, attrs)
+        if element:
+            if tag == 'meta':
+                return element.get('content', '').strip()
+            else:
+                text = element.get_text(strip=True)
+                if text and len(text) < 200:  # Reasonable title length
+                    return text
+
+    return None
+
+
+def extract_job_desc_content(soup):
+    """Extract job description with preserved formatting"""
+
+    # Try to extract from __NEXT_DATA__ (Next.js sites like Wanted)
+    next_data = extract_from_next_data(soup)
+    if next_data:
+        return next_data
+    
+    # Remove noise elements first
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']):
+        element.decompose()
+
+    # Common selectors for job description sections
+    job_desc_selectors = [
+        # Wanted
+        {'class': lambda x: x and 'JobDescription_JobDescription' in str(x)},
+        {'data-cy': 'job-description'},
+        # Saramin
+        {'class': 'user_content'},
+        {'class': 'content'},
+        # Jobkorea
+        {'class': 'sumBx'},
+        {'class': 'jd-section'},
+        # LinkedIn
+        {'class': 'show-more-less-html__markup'},
+        # Indeed
+        {'id': 'jobDescriptionText'},
+        # Generic patterns
+        {'class': lambda x: x and 'job-description' in str(x).lower()},
+        {'id': lambda x: x and 'job-description' in str(x).lower()},
+    ]
+
+    job_desc_element = None
+
+    # Try each selector
+    for selector in job_desc_selectors:
+        job_desc_element = soup.find(['div', 'section', 'article'], selector)
+        if job_desc_element:
+            break
+
+    # Fallback: look for largest text block
+    if not job_desc_element:
+        # Find all divs and get the one with most text
+        all_divs = soup.find_all(['div', 'section', 'article'])
+        max_length = 0
+        for div in all_divs:
+            text_length = len(div.get_text(strip=True))
+            if text_length > max_length:
+                max_length = text_length
+                job_desc_element = div
+
+    if not job_desc_element:
+        return "Job description not found"
+
+    # Extract text with formatting preserved
+    return legacy_extract_text_with_formatting(job_desc_element)
+
+
+def extract_salary(soup):
+    """Extract salary information from HTML"""
+    # Look in meta tags first
+    for meta in soup.find_all('meta'):
+        match = SALARY_MATCHER.match(meta.get('content', ''))
+        if match:
+            return match
+
+    # Look in text content
+    for element in soup.find_all(['span', 'div', 'p', 'li']):
+        match = SALARY_MATCHER.match(element.get_text(strip=True))
+        if match:
+            return match
+
+    return None
+
+
+def extract_location(soup):
+    """Extract location from HTML"""
+    # Common patterns for location
+    selectors = [
+        ('meta', {'property': 'og:location'}),
+        ('span', {'class': lambda x: x and 'location' in str(x).lower()}),
+        ('div', {'class': lambda x: x and 'location' in str(x).lower()}),
+    ]
+
+    for tag, attrs in selectors:
+        element = soup.find(tag, attrs)
+        if element:
+            if tag == 'meta':
+                return element.get('content', '').strip()
+            else:
+                text = element.get_text(strip=True)
+                if text:
+                    return text
+
+    # Look for common location keywords
+    elements = soup.find_all(['span', 'div', 'p'])
+    for element in elements:
+        class_str = ' '.join(element.get('class', []))
+        if LOCATION_KEYWORD_MATCHER.search(class_str):
+            text = element.get_text(strip=True)
+            if text and len(text) < 100:  # Reasonable location length
+                return text
+
+    return None
+
+
+def legacy_extract_text_with_formatting(element):
+    """The original token-list formatter, kept for side-by-side comparison"""
+    result = []
+    previous_was_block = False
+
+    for child in element.descendants:
+        if isinstance(child, str):
+            # Text node
+            text = str(child).strip()
+            if text:
+                result.append(text)
+                previous_was_block = False
+        elif child.name:
+            # Element node
+            if child.name in ['script', 'style']:
+                continue
+            elif child.name == 'br':
+                result.append('\n')
+                previous_was_block = True
+            elif child.name in ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+                if result and not previous_was_block:
+                    result.append('\n')
+                previous_was_block = True
+            elif child.name == 'li':
+                if result and not result[-1].endswith('\n'):
+                    result.append('\n')
+                result.append('• ')
+                previous_was_block = False
+            elif child.name == 'ul' or child.name == 'ol':
+                if result and not previous_was_block:
+                    result.append('\n')
+                previous_was_block = True
+
+    # Join and clean up
+    text = ''.join(result)
+
+    # Clean up excessive whitespace
+    lines = text.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        line = ' '.join(line.split())  # Normalize spaces
+        if line:  # Skip empty lines
+            cleaned_lines.append(line)
+
+    # Join with single line breaks
+    final_text = '\n'.join(cleaned_lines)
+
+    # Remove excessive blank lines (more than 2)
+    while '\n\n\n' in final_text:
+        final_text = final_text.replace('\n\n\n', '\n\n')
+
+    # Filter out copyright/legal text
+    lines = final_text.split('\n')
+    filtered_lines = []
+    skip_keywords = ['저작권자', '무단전재', '재배포금지', 'copyright', '©']
+
+    for line in lines:
+        if not any(keyword in line for keyword in skip_keywords):
+            filtered_lines.append(line)
+
+    return '\n'.join(filtered_lines).strip()
+
+
+def legacy_largest_text_block(elements):
+    """The original fallback: get_text() on every container"""
+    best = None
+    max_length = 0
+    for element in elements:
+        text_length = len(element.get_text(strip=True))
+        if text_length > max_length:
+            max_length = text_length
+            best = element
+    return best
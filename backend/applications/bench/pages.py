@@ -0,0 +1,77 @@
+"""
+Synthetic job pages for the extraction benchmarks.
+"""
+import random
+
+
+KOREAN_LINES = [
+    '백엔드 서비스의 설계, 개발 및 운영을 담당합니다.',
+    '대용량 트래픽을 처리하는 API 서버를 개발합니다.',
+    '관련 분야 경력 3년 이상 또는 그에 준하는 역량을 보유하신 분',
+    '클라우드 환경에서의 서비스 운영 경험이 있으신 분',
+    '자율 출퇴근제 및 원격 근무를 지원합니다.',
+]
+
+ENGLISH_LINES = [
+    'Design, build and operate the services behind our product.',
+    'Collaborate with product and design to ship features end to end.',
+    '3+ years of experience with Python, Go or a similar language.',
+    'Experience running services on AWS, GCP or Azure.',
+    'Flexible hours, remote-friendly team and a learning budget.',
+]
+
+
+def generate_job_page(target_bytes=1_500_000, depth=40, seed=0, language='mixed'):
+    """
+    Build a synthetic career page of roughly target_bytes with a deep DOM:
+    a noisy header and footer, sections nested `depth` levels deep, long
+    bullet lists ('ko', 'en' or 'mixed' text) and salary/location hints
+    near the end.
+    """
+    rng = random.Random(seed)
+    choices = {'ko': [KOREAN_LINES], 'en': [ENGLISH_LINES]}.get(language, [KOREAN_LINES, ENGLISH_LINES])
+    head = (
+        '<html><head><title>Backend Engineer | Example Corp</title>'
+        '<meta property="og:title" content="Backend Engineer">'
+        '<meta name="description" content="Example Corp is hiring">'
+        '<script>window.__APP_STATE__ = {"items": [1, 2, 3]};</script>'
+        '<style>.job { color: #333; }</style></head><body>'
+        '<header><div class="company-logo">Example Corp</div>'
+        '<nav><ul><li><a href="/">Home</a></li><li><a href="/jobs">Jobs</a></li></ul></nav></header>'
+    )
+    tail = (
+        '<div class="job-meta"><span class="job-location">서울 강남구</span>'
+        '<p>연봉 5,000만원 ~ 7,000만원</p></div>'
+        '<footer><p>Copyright © Example Corp. 무단전재 및 재배포금지</p></footer></body></html>'
+    )
+
+    blocks = []
+    size = len(head) + len(tail)
+    while size < target_bytes:
+        level = rng.randint(1, depth)
+        lines = rng.choice(choices)
+        items = ''.join(f'<li><span>{rng.choice(lines)}</span></li>' for _ in range(rng.randint(3, 8)))
+        body = f'<h3>{rng.choice(lines)}</h3><p>{rng.choice(lines)} {rng.choice(lines)}</p><ul>{items}</ul>'
+        block = '<div class="section">' * level + body + '</div>' * level
+        blocks.append(block)
+        size += len(block)
+
+    return (head + '<section>' + ''.join(blocks) + '</section>' + tail).encode('utf-8')
+
+
+def generate_nested_page(depth, paragraphs_per_level=3):
+    """
+    Build a page whose content is nested `depth` divs deep, with a few
+    paragraphs at every level and no description selector to match, so the
+    extractor has to take the largest-text-block fallback.
+    """
+    lines = KOREAN_LINES + ENGLISH_LINES
+    parts = ['<html><head><title>Nested</title></head><body>']
+    for level in range(depth):
+        paragraphs = ''.join(
+            f'<p>{lines[(level + i) % len(lines)]}</p>' for i in range(paragraphs_per_level)
+        )
+        parts.append(f'<div class="level-{level}">{paragraphs}')
+    parts.append('</div>' * depth)
+    parts.append('</body></html>')
+    return ''.join(parts).encode('utf-8')
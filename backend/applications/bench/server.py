@@ -0,0 +1,96 @@
+"""
+A local stand-in job board for exercising fetch throttling and retries.
+"""
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInServer:
+    """
+    Local HTTP server that behaves like a job board under load, for
+    exercising fetch throttling and retries. Paths (any suffix):
+      /ok/...      200 with `page`
+      /flaky/...   503 for the first `flaky_failures` requests per path, then 200
+      /down/...    always 503
+      /hang/...    answers after `hang_seconds` (longer than a short fetch timeout)
+    Above `rate_limit` requests per second to one Host header it answers
+    429 with Retry-After: 1. Counters are in `statuses`.
+    """
+
+    def __init__(self, page, rate_limit=None, flaky_failures=2, hang_seconds=2.0):
+        self.page = page
+        self.rate_limit = rate_limit
+        self.flaky_failures = flaky_failures
+        self.hang_seconds = hang_seconds
+        self.statuses = {}
+        self._seen = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def url(self, path, host='127.0.0.1'):
+        return f'http://{host}:{self.port}{path}'
+
+    def respond(self, host, path):
+        """Return (status, headers, body) for a request and count it"""
+        with self._lock:
+            now = time.monotonic()
+            recent = self._recent.setdefault(host, deque())
+            while recent and now - recent[0] > 1:
+                recent.popleft()
+            if self.rate_limit is not None and len(recent) >= self.rate_limit:
+                status = 429
+            else:
+                recent.append(now)
+                seen = self._seen[path] = self._seen.get(path, 0) + 1
+                if path.startswith('/down/') or (path.startswith('/flaky/') and seen <= self.flaky_failures):
+                    status = 503
+                else:
+                    status = 200
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+        if status == 200 and path.startswith('/hang/'):
+            time.sleep(self.hang_seconds)
+        if status == 429:
+            return status, {'Retry-After': '1'}, b'Too Many Requests'
+        if status == 503:
+            return status, {}, b'Service Unavailable'
+        return status, {'Content-Type': 'text/html; charset=utf-8'}, self.page
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, headers, body = server.respond(self.headers.get('Host', ''), self.path)
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
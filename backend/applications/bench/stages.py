@@ -0,0 +1,101 @@
+"""
+The extraction pipeline run one stage at a time, for per-stage timings.
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from bs4 import BeautifulSoup
+from django.conf import settings
+
+from .. import utils
+from ..extraction import DocumentScan, largest_text_block
+from ..site_profiles import get_profile
+
+
+STAGES = ['fetch', 'next_data', 'parse', 'selectors', 'fallback', 'formatting']
+
+FIELDS = ['company_name', 'position_title', 'job_description', 'salary_range', 'location']
+
+
+class StageRecorder:
+    """
+    Times each pipeline stage and, when tracing, its peak memory and net
+    allocations. A stage entered twice for one page is added up.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.timings = {}
+        self.memory = {}
+
+    @contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            start_blocks = _traced_blocks()
+            tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - start
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            memory = self.memory.setdefault(name, {'peak_kib': 0, 'net_kib': 0, 'net_blocks': 0})
+            memory['peak_kib'] = max(memory['peak_kib'], (peak - start_bytes) / 1024)
+            memory['net_kib'] += (current - start_bytes) / 1024
+            memory['net_blocks'] += _traced_blocks() - start_blocks
+
+
+def _traced_blocks():
+    return sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+
+
+def run_stages(url, recorder, parser=None):
+    """
+    Run utils.extract_job_description() for url one stage at a time and
+    return the extracted fields. Mirrors utils.parse_job_page(); stages a
+    page does not reach (e.g. everything after next_data on a Next.js page)
+    are left out of the recorder.
+    """
+    parser = parser or getattr(settings, 'JOB_HTML_PARSER', 'html.parser')
+    profile = get_profile(url)
+
+    with recorder.stage('fetch'):
+        content = utils.fetch_page(url)
+
+    with recorder.stage('next_data'):
+        next_data = utils.load_next_data(content)
+        job_info = utils.job_info_from_next_data(next_data) if next_data is not None else None
+    if job_info:
+        return job_info
+
+    with recorder.stage('parse'):
+        soup = BeautifulSoup(content, parser)
+
+    if next_data is None:
+        with recorder.stage('next_data'):
+            job_info = utils.extract_from_next_data(soup)
+        if job_info:
+            return job_info
+
+    with recorder.stage('selectors'):
+        scan = DocumentScan(soup, profile)
+        fields = {'company_name': scan.company_name(), 'position_title': scan.position_title()}
+        scan.remove_noise()
+        desc_element = next((tag for tag in scan.first['desc'] if tag is not None), None)
+        fields['salary_range'] = scan.salary()
+        fields['location'] = scan.location()
+
+    if desc_element is None:
+        with recorder.stage('fallback'):
+            desc_element = largest_text_block(
+                soup, scan.containers, getattr(settings, 'JOB_DESC_FALLBACK_SCORING', 'length'),
+            )
+
+    if desc_element is None:
+        fields['job_description'] = "Job description not found"
+    else:
+        with recorder.stage('formatting'):
+            fields['job_description'] = utils.extract_text_with_formatting(desc_element)
+
+    return {field: fields[field] for field in FIELDS}
@@ -0,0 +1,26 @@
+"""
+Timing helpers for the benchmark commands.
+"""
+import statistics
+import time
+
+
+def time_call(func, *args, repeat=5):
+    """Run func repeat times and return (result, list of durations in seconds)"""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        durations.append(time.perf_counter() - start)
+    return result, durations
+
+
+def summarize(durations):
+    """Summary statistics in milliseconds"""
+    ordered = sorted(durations)
+    return {
+        'min': ordered[0] * 1000,
+        'median': statistics.median(ordered) * 1000,
+        'max': ordered[-1] * 1000,
+    }
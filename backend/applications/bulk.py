@@ -0,0 +1,295 @@
+"""
+Bulk create / update endpoints: POST <list url>/bulk/ with a JSON array.
+
+- an item with an "id" updates that row with the fields it carries (like
+  PATCH); rows it would not change are left alone ("unchanged"),
+- an item without one creates a row (like POST),
+- with ?upsert=<field> (only fields in the view's bulk_upsert_fields), an
+  item without an id updates the row whose field has the item's value, and
+  creates one when there is none.
+
+Items are validated one by one with the view's serializer (its many=True
+child), so a bad item is reported with its index and errors while the rest
+are written; related ids (e.g. a note's position) are looked up with one
+query per chunk. Valid items are written BULK_WRITE_CHUNK_SIZE at a time, one
+transaction per chunk, with bulk_create() and one executemany() UPDATE.
+
+Neither goes through save() or the model signals: derived fields are
+recomputed with the model's update_derived_fields(), and each chunk sends
+the bulk_saved signal, which re-indexes search and invalidates cached
+responses and dashboard stats (applications.signals).
+"""
+import copy
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections, router, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+from .signals import bulk_saved
+
+
+class BulkWriteMixin:
+    """Viewset mixin: POST <list url>/bulk/ creates and updates many rows per request"""
+
+    # Fields ?upsert= may match existing rows on
+    bulk_upsert_fields = ()
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create and update many rows; reports the outcome of every item by index"""
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'A non-empty JSON array of objects is required in the request body'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = getattr(settings, 'BULK_WRITE_MAX_ITEMS', 50000)
+        if len(items) > limit:
+            return Response(
+                {'error': f'At most {limit} items can be written per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        upsert = request.query_params.get('upsert')
+        if upsert is not None and upsert not in self.bulk_upsert_fields:
+            allowed = ', '.join(self.bulk_upsert_fields) or 'none'
+            return Response(
+                {'error': f'upsert must be one of: {allowed}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = []
+        chunk_size = getattr(settings, 'BULK_WRITE_CHUNK_SIZE', 1000)
+        for start in range(0, len(items), chunk_size):
+            results += self.bulk_write_chunk(items[start:start + chunk_size], start, upsert)
+
+        counts = {outcome: sum(1 for result in results if result['status'] == outcome)
+                  for outcome in ('created', 'updated', 'unchanged', 'failed')}
+        return Response(
+            {**counts, 'results': results},
+            status=status.HTTP_400_BAD_REQUEST if counts['failed'] == len(items) else status.HTTP_200_OK
+        )
+
+    def bulk_write_chunk(self, items, offset, upsert=None):
+        """Validate and write one chunk of items in one transaction; returns their results"""
+        serializer = self.get_serializer(many=True)
+        partial_serializer = self.get_serializer(many=True, partial=True)
+        model = serializer.child.Meta.model
+        prefetch_related_rows([serializer.child, partial_serializer.child], items)
+
+        # index -> validated data of new items, (pk, validated data) of
+        # updates by id, and upsert key of new items
+        creates, updates, keys = {}, {}, {}
+        errors = {}
+
+        with transaction.atomic():
+            for index, item in enumerate(items, offset):
+                if not isinstance(item, dict):
+                    errors[index] = {'non_field_errors': ['Expected an object']}
+                    continue
+                update = 'id' in item
+                try:
+                    if update:
+                        updates[index] = (parse_id(item['id']),)
+                    child = partial_serializer.child if update else serializer.child
+                    validated = child.run_validation(item)
+                except ValidationError as exc:
+                    errors[index] = exc.detail
+                    updates.pop(index, None)
+                    continue
+                if update:
+                    updates[index] += (validated,)
+                else:
+                    creates[index] = validated
+                    if upsert is not None and validated.get(upsert) not in (None, ''):
+                        keys[index] = validated[upsert]
+
+            existing = model._default_manager.in_bulk([pk for pk, _ in updates.values()])
+            # upsert key -> existing rows with it (the same instance when also updated by id)
+            matches = {}
+            if keys:
+                for instance in model._default_manager.filter(**{f'{upsert}__in': set(keys.values())}):
+                    matches.setdefault(getattr(instance, upsert), []).append(existing.setdefault(instance.pk, instance))
+
+            new_rows, pending = [], {}
+            # pk -> row, and the fields the chunk changes on it
+            changed, dirty, previous = {}, {}, {}
+            outcomes = {}
+            for index in sorted([*creates, *updates]):
+                key = keys.get(index)
+                if index in updates:
+                    pk, validated = updates[index]
+                    instance = existing.get(pk)
+                    if instance is None:
+                        errors[index] = {'id': ['Not found.']}
+                        continue
+                elif key is not None and key in pending:
+                    # Repeats the upsert key of a row created earlier in the chunk
+                    instance, validated = pending[key], creates[index]
+                elif key is not None and key in matches:
+                    if len(matches[key]) > 1:
+                        errors[index] = {upsert: [f'Matches {len(matches[key])} existing rows']}
+                        continue
+                    instance, validated = matches[key][0], creates[index]
+                else:
+                    instance = model(**creates[index])
+                    new_rows.append(instance)
+                    if key is not None:
+                        pending[key] = instance
+                    outcomes[index] = ('created', instance)
+                    continue
+
+                if instance.pk is None:
+                    apply_fields(instance, validated)
+                    outcomes[index] = ('created', instance)
+                    continue
+                # Items that would not change their row are not written, so
+                # re-syncing the same data is cheap
+                fields = changed_fields(instance, validated)
+                if fields:
+                    if instance.pk not in previous:
+                        previous[instance.pk] = copy.copy(instance)
+                    apply_fields(instance, {name: validated[name] for name in fields})
+                    changed[instance.pk] = instance
+                    dirty.setdefault(instance.pk, set()).update(fields)
+                outcomes[index] = ('updated' if fields else 'unchanged', instance)
+
+            for instance in new_rows:
+                derive_fields(instance)
+            model._default_manager.bulk_create(new_rows)
+
+            update_fields = []
+            if changed:
+                columns = set()
+                now = timezone.now()
+                for pk, instance in changed.items():
+                    columns.update(dirty[pk], derive_fields(instance, dirty[pk]))
+                    # auto_now is only applied by save()
+                    instance.updated_at = now
+                update_fields = [*sorted(columns), 'updated_at']
+                update_rows(model, changed.values(), update_fields)
+
+            if new_rows or changed:
+                bulk_saved.send(
+                    sender=model, created=new_rows, updated=list(changed.values()),
+                    update_fields=update_fields, previous=previous,
+                )
+
+        results = []
+        for index in range(offset, offset + len(items)):
+            if index in errors:
+                results.append({'index': index, 'status': 'failed', 'errors': errors[index]})
+            else:
+                outcome, instance = outcomes[index]
+                results.append({'index': index, 'status': outcome, 'id': instance.pk})
+        return results
+
+
+def parse_id(value):
+    if isinstance(value, bool):
+        raise ValidationError({'id': ['A valid integer is required.']})
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({'id': ['A valid integer is required.']})
+
+
+def changed_fields(instance, validated_data):
+    """Names of the fields validated_data would change on instance"""
+    changed = []
+    for name, value in validated_data.items():
+        field = instance._meta.get_field(name)
+        if field.is_relation:
+            # Compare ids, without loading the related row
+            current, value = getattr(instance, field.attname), getattr(value, 'pk', value)
+        else:
+            current = getattr(instance, name)
+        if current != value:
+            changed.append(name)
+    return changed
+
+
+def derive_fields(instance, update_fields=None):
+    """The model's update_derived_fields(), for models that have one"""
+    update = getattr(instance, 'update_derived_fields', None)
+    return update(update_fields) if update is not None else []
+
+
+class PrefetchedRows:
+    """
+    Stands in for a related field's queryset while a chunk is validated:
+    get(pk=) answers from rows loaded with one query, instead of a query
+    per item.
+    """
+
+    def __init__(self, queryset, pks):
+        self.model = queryset.model
+        pk_field = self.model._meta.pk
+        valid = set()
+        for pk in pks:
+            try:
+                valid.add(pk_field.to_python(pk))
+            except DjangoValidationError:
+                pass
+        # Only the key: the validated items just need the row to exist
+        self.rows = queryset.only(pk_field.name).in_bulk(valid)
+
+    def get(self, pk):
+        try:
+            pk = self.model._meta.pk.to_python(pk)
+        except DjangoValidationError:
+            # Reported by the field as an incorrect type
+            raise ValueError(pk)
+        try:
+            return self.rows[pk]
+        except KeyError:
+            raise self.model.DoesNotExist
+
+
+def prefetch_related_rows(serializers, items):
+    """Point the primary key related fields of serializers at PrefetchedRows for items"""
+    for name, field in serializers[0].fields.items():
+        if not isinstance(field, PrimaryKeyRelatedField) or field.read_only:
+            continue
+        pks = {
+            item[name] for item in items
+            if isinstance(item, dict) and isinstance(item.get(name), (int, str)) and not isinstance(item[name], bool)
+        }
+        rows = PrefetchedRows(field.get_queryset(), pks)
+        for serializer in serializers:
+            serializer.fields[name].queryset = rows
+
+
+def update_rows(model, instances, fields):
+    """
+    Write `fields` of instances with one executemany() UPDATE. bulk_update()
+    builds a CASE WHEN per field over every row instead, which takes minutes
+    for thousands of rows with a dozen fields.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    model_fields = [model._meta.get_field(name) for name in fields]
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote(model._meta.db_table),
+        ', '.join(f'{quote(field.column)} = %s' for field in model_fields),
+        quote(model._meta.pk.column),
+    )
+    params = [
+        [field.get_db_prep_save(getattr(instance, field.attname), connection) for field in model_fields]
+        + [instance.pk]
+        for instance in instances
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def apply_fields(instance, validated_data):
+    for field, value in validated_data.items():
+        setattr(instance, field, value)
@@ -0,0 +1,96 @@
+"""
+Conditional GET for the model viewsets.
+
+Validators are computed with aggregate queries instead of by rendering
+the body:
+- a list's ETag hashes MAX(updated_at) and COUNT(*) of the filtered
+  queryset, the full request URL (filters, cursor, fieldset) and the
+  negotiated media type. The count changes when a row is deleted, which
+  MAX(updated_at) alone would miss.
+- a detail view's ETag and Last-Modified come from the row's updated_at.
+- nested relations in the response (e.g. a position's notes and events,
+  or ?expand=) add the same aggregate over the related rows.
+
+A matching If-None-Match (or, for detail views, If-Modified-Since) gets a
+304 before the serializer runs. Responses carry Cache-Control: no-cache so
+browsers revalidate on every request instead of reusing a stale copy.
+"""
+import hashlib
+from functools import partial
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import serializers
+
+
+def queryset_version(queryset):
+    """(MAX(updated_at), COUNT(*)) of queryset"""
+    version = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'))
+    return version['last'], version['count']
+
+
+def related_versions(queryset, serializer):
+    """queryset_version() of the related rows each nested serializer field renders"""
+    versions = []
+    model = queryset.model
+    for name, field in serializer.fields.items():
+        nested = getattr(field, 'child', field)
+        if not isinstance(nested, serializers.BaseSerializer):
+            continue
+        model_field = model._meta.get_field(field.source.split('.')[0])
+        related = model_field.related_model._default_manager
+        if model_field.concrete:
+            related = related.filter(pk__in=queryset.values(model_field.name))
+        else:
+            related = related.filter(**{f'{model_field.field.name}__in': queryset.values('pk')})
+        versions.append((name, queryset_version(related)))
+    return versions
+
+
+def make_etag(*parts):
+    return '"%s"' % hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class ConditionalGetMixin:
+    """Viewset mixin: ETag / Last-Modified and 304s for list and retrieve"""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = make_etag(
+            request.build_absolute_uri(), request.accepted_media_type,
+            queryset_version(queryset), related_versions(queryset, self.get_serializer()),
+        )
+        return self.conditional_response(request, etag, None, partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        updated_at = queryset.values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            # Not found: let retrieve() answer the 404
+            return super().retrieve(request, *args, **kwargs)
+        related = related_versions(queryset, self.get_serializer())
+        etag = make_etag(request.build_absolute_uri(), request.accepted_media_type, updated_at, related)
+        # If-Modified-Since cannot see a deleted nested row, so only a lone
+        # row gets Last-Modified
+        last_modified = None if related else updated_at
+        return self.conditional_response(
+            request, etag, last_modified, partial(super().retrieve, request, *args, **kwargs)
+        )
+
+    def conditional_response(self, request, etag, last_modified, render):
+        """A 304 when the client's validators match, else render()'s response; both get the validators"""
+        timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+        response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
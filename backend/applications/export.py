@@ -0,0 +1,217 @@
+"""
+Streaming export of the whole tracker: every position with its notes and
+events, as NDJSON (one position per line, notes and events nested) or CSV
+(one row per position, note or event, told apart by the `record` column).
+
+Positions are read in primary key order with QuerySet.iterator(), and the
+notes and events of each chunk of positions with one range query each on
+their position indexes, so memory stays flat however long the history is.
+Rows are read with values() and formatted like the API (no serializers or
+model instances), then sent in blocks of about BLOCK_SIZE bytes; the first
+line goes out on its own so a download starts right away. gzip() compresses
+the stream as it is produced.
+"""
+import csv
+import json
+from datetime import date
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.text import compress_sequence
+from rest_framework import renderers
+
+from .models import InterviewEvent, Position, ProcessNote
+from .serializers import InterviewEventSerializer, PositionSerializer, ProcessNoteSerializer
+
+try:
+    import orjson
+except ImportError:  # optional, speeds up NDJSON encoding
+    orjson = None
+
+
+FORMATS = ('ndjson', 'csv')
+
+# The API's fields, without the nested relations
+POSITION_FIELDS = [name for name in PositionSerializer.Meta.fields if name not in ('notes', 'events')]
+NOTE_FIELDS = [name for name in ProcessNoteSerializer.Meta.fields if name != 'position']
+EVENT_FIELDS = [name for name in InterviewEventSerializer.Meta.fields if name != 'position']
+
+# CSV: the record type, then every field of the three record types once
+# (`position` is the position a row belongs to, its own id for a position)
+CSV_COLUMNS = ['record', 'id', 'position']
+for _fields in (POSITION_FIELDS, NOTE_FIELDS, EVENT_FIELDS):
+    CSV_COLUMNS += [name for name in _fields if name not in CSV_COLUMNS]
+
+BLOCK_SIZE = 64 * 1024
+
+# Positions in the first chunk, kept small so the first line goes out quickly
+FIRST_CHUNK_SIZE = 100
+
+
+def value_formatters(model, fields):
+    """
+    field name -> function giving a database value's API representation,
+    for fields that need one. Dates and datetimes are ISO 8601 like DRF's
+    fields (datetimes in the current time zone, UTC as 'Z'), without their
+    per-value time zone lookup, which dominates a large export.
+    """
+    current_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def datetime_representation(value):
+        if current_timezone is not None:
+            value = value.astimezone(current_timezone)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    formatters = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        if isinstance(field, models.DateTimeField):
+            formatters[name] = datetime_representation
+        elif isinstance(field, models.DateField):
+            formatters[name] = date.isoformat
+    return formatters
+
+
+def format_row(row, formatters):
+    for name, to_representation in formatters.items():
+        if row[name] is not None:
+            row[name] = to_representation(row[name])
+    return row
+
+
+def children(model, fields, first, last):
+    """position id -> formatted rows of model for the positions with ids first..last"""
+    formatters = value_formatters(model, fields)
+    grouped = {}
+    # In the order the position detail nests them, along the position index
+    rows = (
+        model.objects
+        .filter(position_id__gte=first, position_id__lte=last)
+        .order_by('position_id', *model._meta.ordering)
+        .values('position_id', *fields)
+    )
+    for row in rows:
+        grouped.setdefault(row.pop('position_id'), []).append(format_row(row, formatters))
+    return grouped
+
+
+def records(chunk_size=None, counts=None):
+    """
+    Yield (position, notes, events) for every position, as API-formatted
+    dicts, reading EXPORT_CHUNK_SIZE positions at a time (FIRST_CHUNK_SIZE
+    first). `counts` (a Counter) is updated with the number of rows of each
+    kind.
+    """
+    chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+    formatters = value_formatters(Position, POSITION_FIELDS)
+    positions = Position.objects.order_by('pk').values(*POSITION_FIELDS).iterator(chunk_size=chunk_size)
+
+    chunk, size = [], min(FIRST_CHUNK_SIZE, chunk_size)
+    for position in positions:
+        chunk.append(position)
+        if len(chunk) == size:
+            yield from with_children(chunk, formatters, counts)
+            chunk, size = [], chunk_size
+    if chunk:
+        yield from with_children(chunk, formatters, counts)
+
+
+def with_children(chunk, formatters, counts):
+    # Ordered by id, so the chunk's notes and events are one id range
+    first, last = chunk[0]['id'], chunk[-1]['id']
+    notes = children(ProcessNote, NOTE_FIELDS, first, last)
+    events = children(InterviewEvent, EVENT_FIELDS, first, last)
+    for position in chunk:
+        position_notes = notes.get(position['id'], [])
+        position_events = events.get(position['id'], [])
+        if counts is not None:
+            counts['positions'] += 1
+            counts['notes'] += len(position_notes)
+            counts['events'] += len(position_events)
+        yield format_row(position, formatters), position_notes, position_events
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def ndjson_lines(rows):
+    for position, notes, events in rows:
+        position['notes'] = notes
+        position['events'] = events
+        yield dumps(position) + b'\n'
+
+
+class Echo:
+    """File-like object for csv.writer that hands back each row instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    # Rows only carry known columns: 'ignore' skips a key check per row
+    writer = csv.DictWriter(Echo(), fieldnames=CSV_COLUMNS, restval='', extrasaction='ignore')
+    yield writer.writerow(dict(zip(CSV_COLUMNS, CSV_COLUMNS))).encode('utf-8')
+    for position, notes, events in rows:
+        yield writer.writerow({'record': 'position', 'position': position['id'], **position}).encode('utf-8')
+        for note in notes:
+            yield writer.writerow({'record': 'note', 'position': position['id'], **note}).encode('utf-8')
+        for event in events:
+            yield writer.writerow({'record': 'event', 'position': position['id'], **event}).encode('utf-8')
+
+
+def blocks(lines, size=BLOCK_SIZE):
+    """Join lines into blocks of about `size` bytes; the first line is sent alone"""
+    lines = iter(lines)
+    for line in lines:
+        yield line
+        break
+    block, length = [], 0
+    for line in lines:
+        block.append(line)
+        length += len(line)
+        if length >= size:
+            yield b''.join(block)
+            block, length = [], 0
+    if block:
+        yield b''.join(block)
+
+
+def stream(export_format, chunk_size=None, counts=None):
+    """The export as an iterator of byte blocks"""
+    if export_format not in FORMATS:
+        raise ValueError(f'Unknown export format: {export_format}')
+    lines = ndjson_lines if export_format == 'ndjson' else csv_lines
+    return blocks(lines(records(chunk_size, counts)))
+
+
+def gzip(blocks):
+    """gzip-compress a stream of byte blocks as it is read"""
+    return compress_sequence(blocks)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """Selects the NDJSON export (?format=ndjson); renders only error responses"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return dumps(data) + b'\n'
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """Selects the CSV export (?format=csv); renders only error responses"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        data = data if isinstance(data, dict) else {'detail': data}
+        writer = csv.writer(Echo())
+        return (writer.writerow(list(data)) + writer.writerow(list(data.values()))).encode('utf-8')
@@ -0,0 +1,354 @@
+"""
+Single-pass extraction engine.
+
+The original per-field helpers (extract_company_name, extract_salary, ...,
+now in bench/legacy.py) each walk the whole BeautifulSoup tree, some of them
+several times. This module walks the document once, records the first
+candidate for every selector those helpers use, and then resolves each field
+from the recorded candidates in the same priority order, so the results are
+identical.
+"""
+from bs4 import CData, NavigableString, Tag
+
+from .matchers import LOCATION_KEYWORD_MATCHER, SALARY_MATCHER
+
+
+# Elements removed before looking for the description, salary and location
+NOISE_TAGS = frozenset(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe'])
+
+DESC_CONTAINER_TAGS = frozenset(['div', 'section', 'article'])
+SALARY_TEXT_TAGS = frozenset(['span', 'div', 'p', 'li'])
+LOCATION_KEYWORD_TAGS = frozenset(['span', 'div', 'p'])
+
+# String types counted by Tag.get_text() on div/section/article elements
+# (comments, script and template strings are left out)
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+def attr_equals(attr, value):
+    return lambda tag, classes: tag.get(attr) == value
+
+
+def class_contains(*needles, case_sensitive=False):
+    if case_sensitive:
+        return lambda tag, classes: bool(classes) and any(needle in classes for needle in needles)
+    lowered = [needle.lower() for needle in needles]
+    return lambda tag, classes: bool(classes) and any(needle in classes.lower() for needle in lowered)
+
+
+def class_equals(value):
+    return lambda tag, classes: value in tag.get('class', ())
+
+
+def any_tag(tag, classes):
+    return True
+
+
+# (tag names, predicate) in the priority order used by utils.py.
+# Predicates receive the tag and its space-joined class string.
+COMPANY_RULES = [
+    (('meta',), attr_equals('property', 'og:site_name')),
+    (('meta',), attr_equals('name', 'author')),
+    (('h1',), class_contains('company')),
+    (('span',), class_contains('company')),
+    (('div',), class_contains('company')),
+]
+
+TITLE_RULES = [
+    (('meta',), attr_equals('property', 'og:title')),
+    (('h1',), any_tag),
+    (('h2',), class_contains('title', 'position', 'job')),
+    (('title',), any_tag),
+]
+
+DESC_RULES = [
+    # Wanted
+    (DESC_CONTAINER_TAGS, class_contains('JobDescription_JobDescription', case_sensitive=True)),
+    (DESC_CONTAINER_TAGS, attr_equals('data-cy', 'job-description')),
+    # Saramin
+    (DESC_CONTAINER_TAGS, class_equals('user_content')),
+    (DESC_CONTAINER_TAGS, class_equals('content')),
+    # Jobkorea
+    (DESC_CONTAINER_TAGS, class_equals('sumBx')),
+    (DESC_CONTAINER_TAGS, class_equals('jd-section')),
+    # LinkedIn
+    (DESC_CONTAINER_TAGS, class_equals('show-more-less-html__markup')),
+    # Indeed
+    (DESC_CONTAINER_TAGS, attr_equals('id', 'jobDescriptionText')),
+    # Generic patterns
+    (DESC_CONTAINER_TAGS, class_contains('job-description')),
+    (DESC_CONTAINER_TAGS, lambda tag, classes: 'job-description' in str(tag.get('id')).lower()),
+]
+
+LOCATION_RULES = [
+    (('meta',), attr_equals('property', 'og:location')),
+    (('span',), class_contains('location')),
+    (('div',), class_contains('location')),
+]
+
+
+def _index_rules(groups):
+    """Map tag name -> [(group, rule index, predicate)] for quick dispatch"""
+    index = {}
+    for group, rules in groups.items():
+        for position, (tag_names, predicate) in enumerate(rules):
+            for name in tag_names:
+                index.setdefault(name, []).append((group, position, predicate))
+    return index
+
+
+class SiteProfile:
+    """
+    Extraction rules for one job board (or the generic fallback).
+
+    Rule lists use the same (tag names, predicate) shape as the module level
+    rules and are indexed by tag name once, when the profile is created.
+    """
+
+    def __init__(self, name, hostnames=(), desc_rules=None, company_rules=None,
+                 title_rules=None, location_rules=None, fixture=None):
+        self.name = name
+        self.hostnames = tuple(hostnames)
+        self.desc_rules = DESC_RULES if desc_rules is None else desc_rules
+        self.company_rules = COMPANY_RULES if company_rules is None else company_rules
+        self.title_rules = TITLE_RULES if title_rules is None else title_rules
+        self.location_rules = LOCATION_RULES if location_rules is None else location_rules
+        self.fixture = fixture
+
+        # Rules evaluated on every element vs. only outside noise elements
+        self.rules_anywhere = _index_rules({'company': self.company_rules, 'title': self.title_rules})
+        self.rules_outside_noise = _index_rules({'desc': self.desc_rules, 'location': self.location_rules})
+
+    def __repr__(self):
+        return f'<SiteProfile {self.name}>'
+
+
+GENERIC_PROFILE = SiteProfile('generic')
+
+
+class DocumentScan:
+    """
+    Candidate elements for every extracted field, collected in one traversal.
+
+    Company and title candidates are recorded anywhere in the document;
+    everything else is only recorded outside noise elements, which are
+    removed before the remaining fields are resolved (like utils.py does).
+    """
+
+    def __init__(self, soup, profile=GENERIC_PROFILE):
+        self.soup = soup
+        self.profile = profile
+        self.first = {
+            'company': [None] * len(profile.company_rules),
+            'title': [None] * len(profile.title_rules),
+            'desc': [None] * len(profile.desc_rules),
+            'location': [None] * len(profile.location_rules),
+        }
+        self.noise = []
+        self.metas = []
+        self.containers = []
+        self.salary_blocks = []
+        self.location_keyword_elements = []
+        self._scan()
+
+    def _record(self, rules, tag, classes):
+        for group, position, predicate in rules.get(tag.name, ()):
+            slots = self.first[group]
+            if slots[position] is None and predicate(tag, classes):
+                slots[position] = tag
+
+    def _scan(self):
+        # Stack entries: (element, inside noise, inside a salary text block)
+        stack = [(child, False, False) for child in reversed(self.soup.contents) if isinstance(child, Tag)]
+        while stack:
+            tag, in_noise, in_salary_block = stack.pop()
+            name = tag.name
+            class_list = tag.get('class')
+            classes = ' '.join(class_list) if class_list else ''
+
+            self._record(self.profile.rules_anywhere, tag, classes)
+
+            if not in_noise:
+                if name in NOISE_TAGS:
+                    self.noise.append(tag)
+                    in_noise = True
+                else:
+                    self._record(self.profile.rules_outside_noise, tag, classes)
+                    if name == 'meta':
+                        self.metas.append(tag)
+                    elif name in DESC_CONTAINER_TAGS:
+                        self.containers.append(tag)
+                    # Only the outermost text block matters for the salary: a
+                    # nested block's text is a substring of its ancestor's,
+                    # so it can only match where the ancestor already does.
+                    if name in SALARY_TEXT_TAGS and not in_salary_block:
+                        self.salary_blocks.append(tag)
+                        in_salary_block = True
+                    if name in LOCATION_KEYWORD_TAGS and LOCATION_KEYWORD_MATCHER.search(classes):
+                        self.location_keyword_elements.append(tag)
+
+            children = [child for child in tag.contents if isinstance(child, Tag)]
+            for child in reversed(children):
+                stack.append((child, in_noise, in_salary_block))
+
+    def remove_noise(self):
+        for element in self.noise:
+            element.decompose()
+        self.noise = []
+
+    def company_name(self):
+        for tag in self.first['company']:
+            if tag is None:
+                continue
+            if tag.name == 'meta':
+                return tag.get('content', '').strip()
+            text = tag.get_text(strip=True)
+            if text:
+                return text
+        return None
+
+    def position_title(self):
+        for tag in self.first['title']:
+            if tag is None:
+                continue
+            if tag.name == 'meta':
+                return tag.get('content', '').strip()
+            text = tag.get_text(strip=True)
+            if text and len(text) < 200:
+                return text
+        return None
+
+    def job_desc_element(self, fallback_scoring='length'):
+        for tag in self.first['desc']:
+            if tag is not None:
+                return tag
+        return largest_text_block(self.soup, self.containers, fallback_scoring)
+
+    def salary(self):
+        for meta in self.metas:
+            content = meta.get('content', '')
+            match = SALARY_MATCHER.match(content)
+            if match:
+                return match
+
+        for element in self.salary_blocks:
+            match = SALARY_MATCHER.match(element.get_text(strip=True))
+            if match:
+                return match
+        return None
+
+    def location(self):
+        for tag in self.first['location']:
+            if tag is None:
+                continue
+            if tag.name == 'meta':
+                return tag.get('content', '').strip()
+            text = tag.get_text(strip=True)
+            if text:
+                return text
+
+        for element in self.location_keyword_elements:
+            text = element.get_text(strip=True)
+            if text and len(text) < 100:
+                return text
+        return None
+
+
+def measure_subtrees(root):
+    """
+    Measure every subtree of root in one bottom-up pass.
+
+    Returns {id(tag): (text length, link text length, descendant tag count)}
+    where text length equals len(tag.get_text(strip=True)). Each string is
+    visited once, instead of once per ancestor as repeated get_text() calls
+    on nested containers would.
+    """
+    measures = {}
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.contents if isinstance(child, Tag))
+            continue
+
+        text_length = link_length = tag_count = 0
+        for child in node.contents:
+            if isinstance(child, Tag):
+                child_text, child_links, child_tags = measures[id(child)]
+                text_length += child_text
+                link_length += child_links
+                tag_count += child_tags + 1
+            elif type(child) in TEXT_STRING_TYPES:
+                text_length += len(child.strip())
+        if node.name == 'a':
+            link_length = text_length
+        measures[id(node)] = (text_length, link_length, tag_count)
+    return measures
+
+
+def density_score(text_length, link_length, tag_count):
+    """
+    Text-density score of a block: its non-link text, discounted by the
+    share of text inside links and by how much markup surrounds the text.
+    Wrappers that also hold link lists or card grids score below the block
+    that holds only the posting body.
+    """
+    if not text_length:
+        return 0
+    own_text = text_length - link_length
+    link_density = link_length / text_length
+    chars_per_tag = text_length / (tag_count + 1)
+    return own_text * (1 - link_density) * chars_per_tag / (chars_per_tag + 10)
+
+
+def largest_text_block(root, elements, scoring='length'):
+    """
+    Return the element with the highest score (first one wins on ties):
+    its stripped text length ('length', same as comparing get_text()
+    lengths) or its density_score ('density').
+    """
+    measures = measure_subtrees(root)
+    best = None
+    best_score = 0
+    for element in elements:
+        text_length, link_length, tag_count = measures[id(element)]
+        if scoring == 'density':
+            score = density_score(text_length, link_length, tag_count)
+        else:
+            score = text_length
+        if score > best_score:
+            best_score = score
+            best = element
+    return best
+
+
+def extract_fields(soup, format_text, profile=GENERIC_PROFILE, fallback_scoring='length'):
+    """
+    Extract company, title, description, salary and location from a parsed
+    page using one traversal. format_text renders the description element;
+    fallback_scoring picks how the largest text block fallback ranks blocks.
+
+    Like the per-field helpers, this removes noise elements from the soup.
+    """
+    scan = DocumentScan(soup, profile)
+
+    # Company and title are read before noise removal, as in utils.py
+    company_name = scan.company_name()
+    position_title = scan.position_title()
+
+    scan.remove_noise()
+
+    job_desc_element = scan.job_desc_element(fallback_scoring)
+    if job_desc_element is None:
+        job_description = "Job description not found"
+    else:
+        job_description = format_text(job_desc_element)
+
+    return {
+        'company_name': company_name,
+        'position_title': position_title,
+        'job_description': job_description,
+        'salary_range': scan.salary(),
+        'location': scan.location(),
+    }
@@ -0,0 +1,224 @@
+"""
+Response cache for job page fetches.
+
+Pages are keyed by a normalized URL and kept together with their ETag /
+Last-Modified validators. Entries younger than the TTL are served without
+touching the network; older entries are revalidated with a conditional GET
+so an unchanged page only costs a 304.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'igshid'}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """
+    Normalize a URL for use as a cache key: lowercase scheme and host, drop
+    default ports, fragments and tracking parameters, and sort the query.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+@dataclass
+class CachedPage:
+    """A fetched page body plus the validators needed to revalidate it"""
+    content: bytes
+    etag: str = None
+    last_modified: str = None
+    headers: dict = field(default_factory=dict)
+    stored_at: float = field(default_factory=time.time)
+
+    def is_fresh(self, ttl):
+        return time.time() - self.stored_at < ttl
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class BaseFetchCache:
+    """
+    Common bookkeeping for fetch cache backends.
+
+    Subclasses implement get(), set() and clear(); hit/miss counters are
+    kept per process and exposed through stats().
+    """
+
+    def __init__(self, ttl=300, max_entries=256, **options):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._counter_lock = threading.Lock()
+        self._counters = dict.fromkeys(['hits', 'revalidated', 'misses', 'stores', 'evictions'], 0)
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, page):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def record(self, counter):
+        with self._counter_lock:
+            self._counters[counter] += 1
+
+    def stats(self):
+        with self._counter_lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        stats['backend'] = type(self).__name__
+        stats['ttl'] = self.ttl
+        stats['max_entries'] = self.max_entries
+        return stats
+
+
+class InMemoryFetchCache(BaseFetchCache):
+    """Per-process LRU cache bounded to max_entries pages"""
+
+    def __init__(self, ttl=300, max_entries=256, **options):
+        super().__init__(ttl=ttl, max_entries=max_entries, **options)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            page = self._entries.get(key)
+            if page is not None:
+                self._entries.move_to_end(key)
+            return page
+
+    def set(self, key, page):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        self.record('stores')
+        for _ in range(evicted):
+            self.record('evictions')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoFetchCache(BaseFetchCache):
+    """
+    Fetch cache stored in one of Django's CACHES, so it can be shared
+    between worker processes. Size bounds and eviction are delegated to the
+    cache backend (e.g. MAX_ENTRIES in its OPTIONS); a max_entries of its
+    own is rejected rather than silently ignored.
+
+    Entries outlive the freshness TTL by STALE_TTL seconds so they can still
+    be revalidated with a conditional request.
+
+    Keys carry a generation token kept in the same cache; clear() replaces
+    it, so every earlier entry stops matching and ages out, without
+    touching entries other code keeps in that cache.
+    """
+
+    def __init__(self, ttl=300, max_entries=None, cache_alias='default', stale_ttl=86400,
+                 key_prefix='jobfetch', **options):
+        if max_entries is not None:
+            raise ImproperlyConfigured(
+                "DjangoFetchCache is bounded by its cache's OPTIONS['MAX_ENTRIES'] in CACHES; "
+                "remove MAX_ENTRIES from JOB_FETCH_CACHE"
+            )
+        super().__init__(ttl=ttl, max_entries=max_entries, **options)
+        self.cache_alias = cache_alias
+        self.stale_ttl = stale_ttl
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def generation_key(self):
+        return f'{self.key_prefix}:generation'
+
+    def generation(self):
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            # add() so a concurrent process's token wins consistently
+            if not self.cache.add(self.generation_key, generation, timeout=None):
+                generation = self.cache.get(self.generation_key) or generation
+        return generation
+
+    def make_key(self, key):
+        return f'{self.key_prefix}:{self.generation()}:{key}'
+
+    def get(self, key):
+        return self.cache.get(self.make_key(key))
+
+    def set(self, key, page):
+        self.cache.set(self.make_key(key), page, timeout=self.ttl + self.stale_ttl)
+        self.record('stores')
+
+    def clear(self):
+        self.cache.set(self.generation_key, uuid.uuid4().hex, timeout=None)
+
+
+_fetch_cache = None
+_fetch_cache_lock = threading.Lock()
+
+
+def get_fetch_cache():
+    """
+    Return the configured fetch cache, or None when caching is disabled.
+
+    Configured through settings.JOB_FETCH_CACHE:
+        {'BACKEND': 'applications.fetch_cache.InMemoryFetchCache',
+         'TTL': 300, 'MAX_ENTRIES': 256, 'OPTIONS': {...}}
+    MAX_ENTRIES only applies to InMemoryFetchCache.
+    """
+    global _fetch_cache
+    config = getattr(settings, 'JOB_FETCH_CACHE', None)
+    if not config:
+        return None
+
+    if _fetch_cache is None:
+        with _fetch_cache_lock:
+            if _fetch_cache is None:
+                backend = import_string(config.get('BACKEND', 'applications.fetch_cache.InMemoryFetchCache'))
+                options = {key.lower(): value for key, value in config.get('OPTIONS', {}).items()}
+                if 'MAX_ENTRIES' in config:
+                    options['max_entries'] = config['MAX_ENTRIES']
+                _fetch_cache = backend(ttl=config.get('TTL', 300), **options)
+    return _fetch_cache
@@ -0,0 +1,135 @@
+"""
+Sparse fieldsets: ?fields=, ?omit= and ?expand= on the API serializers.
+
+- ?fields=a,b keeps only those fields,
+- ?omit=c drops fields,
+- ?expand=d adds a field from the serializer's Meta.expandable_fields
+  (nested relations that are left out, or sent as ids, by default).
+
+The serializer's remaining fields also decide what is read from the
+database: list and retrieve querysets get a matching only(), with
+select_related() / prefetch_related() for expanded relations, so large
+text columns are never loaded unless a client asks for them.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def split_param(params, name):
+    value = params.get(name)
+    if not value:
+        return []
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin: trims self.fields per the request's ?fields= / ?omit= /
+    ?expand= on reads. Writes always see every field.
+
+    Meta.expandable_fields maps a name to (serializer class, kwargs); when
+    expanded it is added, or replaces the plain field of the same name.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.method in SAFE_METHODS:
+            self.apply_fieldset(request.query_params)
+
+    def apply_fieldset(self, params):
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        fields = split_param(params, 'fields')
+        omit = split_param(params, 'omit')
+        # Naming an expandable field in ?fields= expands it too
+        expand = set(split_param(params, 'expand')) | {name for name in fields if name in expandable}
+
+        known = set(self.fields) | set(expandable)
+        unknown = [name for name in [*fields, *omit, *expand] if name not in known]
+        if unknown:
+            raise ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(set(unknown)))}"})
+
+        for name in expand:
+            if name in expandable:
+                serializer_class, options = expandable[name]
+                self.fields[name] = serializer_class(**options)
+
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+
+def fieldset_plan(model, fields, prefix='', extra=()):
+    """
+    (only, select_related, prefetch_related) arguments that load what
+    `fields` (a serializer's bound fields) read from `model`, plus the
+    `extra` columns, or None when a field's source cannot be mapped onto
+    the model.
+    """
+    only = {prefix + model._meta.pk.name, *extra}
+    # Pagination reads the ordering key of every row
+    only.update(prefix + name.lstrip('-') for name in model._meta.ordering)
+    select, prefetch = [], []
+
+    for field in fields.values():
+        if field.source == '*':
+            return None
+        name = field.source.split('.')[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+        nested = getattr(field, 'child', field)
+        if isinstance(nested, serializers.BaseSerializer) and model_field.is_relation:
+            related_model = model_field.related_model
+            if model_field.concrete:
+                # Forward foreign key: join it and load the nested fields
+                plan = fieldset_plan(related_model, nested.fields, prefix=f'{prefix}{name}__')
+                if plan is None:
+                    return None
+                only.add(prefix + name)
+                only.update(plan[0])
+                select.append(prefix + name)
+                select.extend(plan[1])
+                prefetch.extend(plan[2])
+            else:
+                # Reverse relation: prefetch it with its own only(), keeping
+                # the foreign key the rows are matched back on
+                queryset = optimize_queryset(
+                    related_model._default_manager.all(), nested, extra=[model_field.field.name]
+                )
+                prefetch.append(Prefetch(prefix + name, queryset=queryset))
+        elif model_field.concrete:
+            only.add(prefix + name)
+        else:
+            prefetch.append(prefix + name)
+
+    return only, select, prefetch
+
+
+def optimize_queryset(queryset, serializer, extra=()):
+    """Restrict queryset to what serializer will read (plus `extra` columns)"""
+    plan = fieldset_plan(queryset.model, serializer.fields, extra=extra)
+    if plan is None:
+        return queryset
+    only, select, prefetch = plan
+    queryset = queryset.only(*sorted(only))
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class SparseFieldsetViewMixin:
+    """Viewset mixin: list and retrieve querysets load only the serialized fields"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in ('list', 'retrieve'):
+            queryset = optimize_queryset(queryset, self.get_serializer())
+        return queryset
@@ -0,0 +1,117 @@
+"""
+Fingerprints for job descriptions and fetched pages.
+
+A description gets an exact hash of its normalized text and a 64-bit
+SimHash. Descriptions that differ only by a few words have SimHashes a
+small Hamming distance apart. The SimHash is split into SIMHASH_BANDS
+16-bit bands, which are stored as indexed columns. Two fingerprints within
+MAX_DISTANCE bits of each other have at least one band that differs in at
+most one bit (pigeonhole), so near-duplicate candidates come from an index
+lookup of each band and its one-bit neighbours (multi-probe) instead of
+comparing every pair. Wide bands keep chance matches rare: a random
+description shares a probed band value with about one position in a
+thousand.
+"""
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Bits a probed band value may differ from the band itself
+MAX_PROBE_DISTANCE = 1
+
+# Largest distance the band lookup is guaranteed to find
+MAX_DISTANCE = SIMHASH_BANDS * (MAX_PROBE_DISTANCE + 1) - 1
+
+NON_WORD = re.compile(r'[^\w]+')
+
+
+def page_hash(content):
+    """SHA-256 of raw page bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def normalize_text(text):
+    """Lowercase, NFKC-normalized words with bullets, punctuation and extra spaces removed"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return ' '.join(NON_WORD.sub(' ', text).split())
+
+
+def content_hash(text):
+    """Exact fingerprint of a description: SHA-256 of its normalized text ('' when empty)"""
+    normalized = normalize_text(text)
+    if not normalized:
+        return ''
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def simhash(text):
+    """
+    Unsigned 64-bit SimHash over the words of the normalized text (each
+    occurrence counts), or None when empty. Single words rather than
+    shingles keep short descriptions with a few edited words close.
+    """
+    words = normalize_text(text).split()
+    if not words:
+        return None
+
+    weights = [0] * SIMHASH_BITS
+    for word, count in Counter(words).items():
+        value = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def to_signed(value):
+    """Store an unsigned 64-bit value in a signed BigIntegerField"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def to_unsigned(value):
+    return value + (1 << SIMHASH_BITS) if value < 0 else value
+
+
+def bands(fingerprint):
+    """Split an unsigned SimHash into SIMHASH_BANDS integers, lowest bits first"""
+    return [(fingerprint >> (band * BAND_BITS)) & BAND_MASK for band in range(SIMHASH_BANDS)]
+
+
+def probe_distance(max_distance):
+    """Bits band probes must cover so no fingerprint within max_distance is missed"""
+    return min(max_distance // SIMHASH_BANDS, MAX_PROBE_DISTANCE)
+
+
+def band_probes(value, distance=MAX_PROBE_DISTANCE):
+    """A band value and, when distance is 1, every value one bit away from it"""
+    if distance < 1:
+        return [value]
+    return [value] + [value ^ (1 << bit) for bit in range(BAND_BITS)]
+
+
+def hamming_distance(a, b):
+    return bin(to_unsigned(a) ^ to_unsigned(b)).count('1')
+
+
+def fingerprint_fields(text):
+    """Position field values for a description's fingerprint"""
+    fingerprint = simhash(text)
+    if fingerprint is None:
+        fields = {'content_hash': '', 'simhash': None}
+        fields.update({f'simhash_band{band}': None for band in range(SIMHASH_BANDS)})
+        return fields
+
+    fields = {'content_hash': content_hash(text), 'simhash': to_signed(fingerprint)}
+    fields.update({f'simhash_band{band}': value for band, value in enumerate(bands(fingerprint))})
+    return fields
@@ -0,0 +1,343 @@
+"""
+Per-host politeness for job page fetches.
+
+Every fetch goes through the scheduler for its hostname, which
+- caps concurrent requests to the host (a semaphore),
+- spaces requests with a token bucket (rate per second plus a burst),
+- retries 429 / 5xx responses and connection errors with jittered
+  exponential backoff, honouring Retry-After and pausing the whole host
+  while it asks us to back off,
+- opens a circuit breaker after consecutive failures (5xx, timeouts,
+  connection errors; not 429s) so a host that keeps erroring fails fast
+  instead of costing a timeout per URL; after reset_timeout one trial
+  request decides whether it closes again.
+
+Limits come from settings.JOB_FETCH_SCHEDULER: 'DEFAULT' options plus
+per-host overrides in 'HOSTS' (matched on the host and its parent domains).
+The defaults are polite: 2 requests per second with a burst of 4 and at
+most 4 concurrent requests per host, below the fetch pool, so a batch
+import of one board does not hammer it. Raise them (or set 'RATE': None)
+for boards known to take more.
+"""
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+from .metrics import percentile
+
+
+DEFAULT_POLICY = {
+    'max_concurrency': 4,
+    # Requests per second, or None for no token bucket
+    'rate': 2.0,
+    'burst': 4,
+    'max_retries': 3,
+    'backoff_base': 0.5,
+    'backoff_max': 30.0,
+    'failure_threshold': 5,
+    'reset_timeout': 60.0,
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class HostUnavailable(Exception):
+    """Raised without a request while a host's circuit breaker is open"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; acquire() blocks until a token is available.
+    With rate None it only enforces pause().
+    """
+
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping as needed; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self.rate is None:
+                    return waited
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        """Hand out no tokens for the next `seconds` (e.g. after a Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+            self._tokens = 0
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may go out now (in half-open state, only one trial at a time)"""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        """Count a failure; returns True when this opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = self.clock()
+                return True
+            return False
+
+    def release(self):
+        """End a trial request that neither succeeded nor failed (e.g. a 404)"""
+        with self._lock:
+            self._trial_running = False
+
+
+class HostState:
+    """Limits, breaker and counters for one hostname"""
+
+    def __init__(self, host, policy, latency_window=500, clock=time.monotonic, sleep=time.sleep):
+        self.host = host
+        self.policy = policy
+        self.semaphore = threading.BoundedSemaphore(policy['max_concurrency'])
+        self.bucket = TokenBucket(policy['rate'], policy['burst'], clock, sleep)
+        self.breaker = CircuitBreaker(policy['failure_threshold'], policy['reset_timeout'], clock)
+        self.latencies = deque(maxlen=latency_window)
+        self.in_flight = 0
+        self.counters = dict.fromkeys(
+            ['requests', 'succeeded', 'failed', 'retries', 'rejected', 'circuit_opened'], 0
+        )
+        self.statuses = {}
+        self.throttled_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def count(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    def request_started(self, throttled):
+        with self._lock:
+            self.counters['requests'] += 1
+            self.throttled_seconds += throttled
+            self.in_flight += 1
+
+    def request_finished(self, seconds, status):
+        with self._lock:
+            self.in_flight -= 1
+            self.latencies.append(seconds)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def backed_off(self, seconds):
+        with self._lock:
+            self.counters['retries'] += 1
+            self.backoff_seconds += seconds
+
+    def metrics(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            return {
+                'circuit': self.breaker.state,
+                'consecutive_failures': self.breaker.failures,
+                'in_flight': self.in_flight,
+                **self.counters,
+                'statuses': dict(self.statuses),
+                'throttled_seconds': round(self.throttled_seconds, 3),
+                'backoff_seconds': round(self.backoff_seconds, 3),
+                'latency_p50': percentile(latencies, 0.5),
+                'latency_p95': percentile(latencies, 0.95),
+                'policy': self.policy,
+            }
+
+
+def retry_after_seconds(response):
+    """Seconds requested by a Retry-After header (delta or HTTP date), or None"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    """429 / 5xx responses, timeouts and connection errors are worth retrying"""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUSES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class FetchScheduler:
+    """
+    Per-host limits, retries and circuit breakers for every fetched URL.
+    clock and sleep stand in for time.monotonic and time.sleep (in tests).
+    """
+
+    def __init__(self, default=None, hosts=None, clock=time.monotonic, sleep=time.sleep):
+        self.default = {**DEFAULT_POLICY, **(default or {})}
+        self.overrides = {host.lower(): options for host, options in (hosts or {}).items()}
+        self.clock = clock
+        self.sleep = sleep
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def policy_for(self, host):
+        labels = host.split('.')
+        for start in range(len(labels)):
+            options = self.overrides.get('.'.join(labels[start:]))
+            if options is not None:
+                return {**self.default, **options}
+        return self.default
+
+    def host_state(self, host):
+        host = (host or '').lower()
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = HostState(host, self.policy_for(host), clock=self.clock, sleep=self.sleep)
+            return state
+
+    def call(self, url, func):
+        """
+        Run func() (one request to url) under its host's limits, retrying
+        retryable failures. Raises HostUnavailable while the circuit is open.
+        """
+        state = self.host_state(urlsplit(url).hostname)
+        policy = state.policy
+
+        attempt = 0
+        while True:
+            if not state.breaker.allow():
+                state.count('rejected')
+                raise HostUnavailable(f'{state.host} is failing; skipped until its circuit breaker resets')
+
+            with state.semaphore:
+                state.request_started(state.bucket.acquire())
+                start = self.clock()
+                try:
+                    result, error = func(), None
+                except Exception as e:
+                    result, error = None, e
+                response = getattr(error, 'response', None)
+                if error is None:
+                    status = 'ok'
+                else:
+                    status = str(response.status_code) if response is not None else type(error).__name__
+                state.request_finished(self.clock() - start, status)
+
+            if error is None:
+                state.breaker.record_success()
+                state.count('succeeded')
+                return result
+
+            if not is_retryable(error):
+                # The host answered; a 404 says nothing about its health
+                state.breaker.release()
+                state.count('failed')
+                raise error
+
+            if response is not None and response.status_code == 429:
+                # Rate limited: the host is healthy, we are just too fast
+                state.breaker.release()
+            elif state.breaker.record_failure():
+                state.count('circuit_opened')
+            if attempt >= policy['max_retries'] or state.breaker.state == OPEN:
+                state.count('failed')
+                raise error
+
+            delay = retry_after_seconds(response)
+            if delay is not None:
+                delay = min(delay, policy['backoff_max'])
+                # Everyone fetching from this host waits, not just this request
+                state.bucket.pause(delay)
+            else:
+                # Full jitter: spread retries of concurrent requests apart
+                delay = random.uniform(0, min(policy['backoff_max'], policy['backoff_base'] * 2 ** attempt))
+            state.backed_off(delay)
+            self.sleep(delay)
+            attempt += 1
+
+    def metrics(self):
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: state.metrics() for host, state in sorted(hosts.items())}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide fetch scheduler, or None when it is disabled"""
+    global _scheduler
+    config = getattr(settings, 'JOB_FETCH_SCHEDULER', None)
+    if not config:
+        return None
+
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = FetchScheduler(
+                    default={key.lower(): value for key, value in config.get('DEFAULT', {}).items()},
+                    hosts={
+                        host: {key.lower(): value for key, value in options.items()}
+                        for host, options in config.get('HOSTS', {}).items()
+                    },
+                )
+    return _scheduler
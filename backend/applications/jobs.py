@@ -0,0 +1,205 @@
+"""
+In-process asynchronous queue for job description extraction.
+
+fetch_jd requests in async mode are turned into jobs that run on a local
+thread pool, so a slow job site never holds a request worker. Clients poll
+the job's status until it has finished. While a job for a URL is queued or
+running, submitting the same URL returns that job instead of a new one.
+
+At most `max_depth` jobs wait for a worker; further submissions raise
+QueueFull (answered with 503 and Retry-After) instead of growing the queue
+without bound.
+
+Jobs live in the memory of the process that accepted them; with several
+server processes, status requests must reach the same process.
+"""
+import statistics
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections
+
+from .fetch_cache import normalize_url
+from .metrics import percentile
+from .utils import extract_job_description
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+@dataclass
+class ExtractionJob:
+    """One asynchronous extraction of a recruiting link"""
+    url: str
+    snapshot: bool = False
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    data: dict = None
+    error: str = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float = None
+    finished_at: float = None
+
+    @property
+    def finished(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+    def as_dict(self):
+        job = {
+            'job_id': self.id,
+            'url': self.url,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.status == SUCCEEDED:
+            job['data'] = self.data
+        elif self.status == FAILED:
+            job['error'] = self.error
+        return job
+
+
+class QueueFull(Exception):
+    """Raised by submit() while max_depth jobs are already waiting"""
+
+
+class ExtractionQueue:
+    """
+    Runs extraction jobs on a bounded thread pool.
+
+    Finished jobs are kept (oldest evicted first) up to `retention` so their
+    results can still be polled for a while.
+    """
+
+    def __init__(self, extract, max_workers=4, retention=1000, latency_window=1000, max_depth=1000):
+        self.extract = extract
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch-jd')
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._in_flight = {}
+        self._retention = retention
+        self._wait_times = deque(maxlen=latency_window)
+        self._run_times = deque(maxlen=latency_window)
+        self._queued = 0
+        self._counters = dict.fromkeys(['submitted', 'deduplicated', 'rejected', 'succeeded', 'failed'], 0)
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+
+    def submit(self, url, snapshot=False):
+        """Queue an extraction and return (job, created); raises QueueFull when the queue is full"""
+        key = (normalize_url(url), snapshot)
+        with self._lock:
+            job = self._in_flight.get(key)
+            if job is not None:
+                self._counters['deduplicated'] += 1
+                return job, False
+
+            if self._queued >= self.max_depth:
+                self._counters['rejected'] += 1
+                raise QueueFull(f'{self._queued} jobs are already waiting')
+
+            job = ExtractionJob(url=url, snapshot=snapshot)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+            self._queued += 1
+            self._counters['submitted'] += 1
+
+        self._executor.submit(self._run, job, key)
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, key):
+        with self._lock:
+            self._queued -= 1
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            data = self.extract(job.url, snapshot=job.snapshot)
+        except Exception as e:
+            job.error = str(e)
+            status = FAILED
+        else:
+            job.data = data
+            status = SUCCEEDED
+
+        with self._lock:
+            job.finished_at = time.time()
+            job.status = status
+            self._counters[status] += 1
+            self._wait_times.append(job.started_at - job.submitted_at)
+            self._run_times.append(job.finished_at - job.started_at)
+            if self._in_flight.get(key) is job:
+                del self._in_flight[key]
+            self._evict_finished()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self._retention)]:
+            del self._jobs[job_id]
+
+    def metrics(self):
+        with self._lock:
+            queued = sum(1 for job in self._in_flight.values() if job.status == QUEUED)
+            running = sum(1 for job in self._in_flight.values() if job.status == RUNNING)
+            wait_times = sorted(self._wait_times)
+            run_times = sorted(self._run_times)
+            counters = dict(self._counters)
+
+        def summary(ordered):
+            return {
+                'mean': statistics.fmean(ordered) if ordered else None,
+                'p50': percentile(ordered, 0.5),
+                'p95': percentile(ordered, 0.95),
+                'max': ordered[-1] if ordered else None,
+            }
+
+        return {
+            'workers': self.max_workers,
+            'max_depth': self.max_depth,
+            'queue_depth': queued,
+            'running': running,
+            **counters,
+            'wait_seconds': summary(wait_times),
+            'run_seconds': summary(run_times),
+        }
+
+
+def _extract_for_job(url, snapshot=False):
+    try:
+        job_info = extract_job_description(url, snapshot=snapshot)
+    finally:
+        # Queue threads would otherwise keep their own DB connections open
+        connections.close_all()
+    job_info['recruiting_link'] = url
+    return job_info
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """Return the process-wide extraction queue, creating it on first use"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ExtractionQueue(
+                    _extract_for_job,
+                    max_workers=getattr(settings, 'JOB_EXTRACTION_QUEUE_WORKERS', 4),
+                    retention=getattr(settings, 'JOB_EXTRACTION_QUEUE_RETENTION', 1000),
+                    max_depth=getattr(settings, 'JOB_EXTRACTION_QUEUE_MAX_DEPTH', 1000),
+                )
+    return _queue
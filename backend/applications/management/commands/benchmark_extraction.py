@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from applications.bench.legacy import legacy_parse_job_page
+from applications.bench.pages import generate_job_page
+from applications.bench.timing import summarize, time_call
+from applications.utils import parse_job_page
+
+
+class Command(BaseCommand):
+    help = 'Compare the single-pass extraction engine with the legacy per-field path on a synthetic page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1_500_000, help='Approximate page size in bytes')
+        parser.add_argument('--depth', type=int, default=40, help='Maximum nesting depth of content blocks')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation')
+
+    def handle(self, *args, **options):
+        page = generate_job_page(options['size'], options['depth'])
+        self.stdout.write(f"Synthetic page: {len(page):,} bytes, depth {options['depth']}")
+
+        legacy_result, legacy_times = time_call(legacy_parse_job_page, page, repeat=options['repeat'])
+        engine_result, engine_times = time_call(parse_job_page, page, repeat=options['repeat'])
+
+        for label, durations in (('legacy', legacy_times), ('single-pass', engine_times)):
+            stats = summarize(durations)
+            self.stdout.write(
+                f"{label:>12}: median {stats['median']:.1f} ms "
+                f"(min {stats['min']:.1f}, max {stats['max']:.1f})"
+            )
+
+        speedup = summarize(legacy_times)['median'] / summarize(engine_times)['median']
+        self.stdout.write(f'Speedup: {speedup:.1f}x')
+
+        if legacy_result != engine_result:
+            self.stderr.write(self.style.ERROR('Results differ between implementations'))
+            for field in legacy_result:
+                if legacy_result[field] != engine_result.get(field):
+                    self.stderr.write(f'  {field}: {legacy_result[field]!r} != {engine_result.get(field)!r}')
+        else:
+            self.stdout.write(self.style.SUCCESS('Results are identical'))
@@ -0,0 +1,37 @@
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from applications.bench.legacy import legacy_largest_text_block
+from applications.bench.pages import generate_nested_page
+from applications.bench.timing import summarize, time_call
+from applications.extraction import largest_text_block
+
+
+class Command(BaseCommand):
+    help = 'Show how the largest-text-block fallback scales with document depth'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--depths', type=int, nargs='+', default=[100, 200, 400, 800],
+            help='Nesting depths of the synthetic pages'
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'depth':>6} {'legacy ms':>11} {'bottom-up ms':>13} {'density ms':>11}")
+
+        for depth in options['depths']:
+            soup = BeautifulSoup(generate_nested_page(depth), 'html.parser')
+            containers = soup.find_all(['div', 'section', 'article'])
+
+            legacy, legacy_times = time_call(legacy_largest_text_block, containers, repeat=options['repeat'])
+            linear, linear_times = time_call(largest_text_block, soup, containers, 'length', repeat=options['repeat'])
+            _, density_times = time_call(largest_text_block, soup, containers, 'density', repeat=options['repeat'])
+
+            if legacy is not linear:
+                self.stderr.write(self.style.ERROR(f'depth {depth}: fallbacks picked different elements'))
+
+            self.stdout.write(
+                f"{depth:>6} {summarize(legacy_times)['median']:>11.1f} "
+                f"{summarize(linear_times)['median']:>13.1f} {summarize(density_times)['median']:>11.1f}"
+            )
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from applications import host_scheduler
+from applications.bench.server import StandInServer
+from applications.site_profiles import SARAMIN, load_fixture
+from applications.utils import extract_job_descriptions
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import against a local stand-in job board with and without the per-host fetch scheduler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ok', type=int, default=40, help='Healthy postings')
+        parser.add_argument('--flaky', type=int, default=10, help='Postings that answer 503 twice before succeeding')
+        parser.add_argument('--down', type=int, default=10, help='Postings on a second host that always answers 503')
+        parser.add_argument('--hang', type=int, default=0, help='Postings that answer slower than --timeout')
+        parser.add_argument('--rate-limit', type=int, default=8, help="Stand-in server's requests per second")
+        parser.add_argument('--workers', type=int, default=16, help='Fetch threads')
+        parser.add_argument('--timeout', type=float, default=1.0, help='Fetch timeout in seconds')
+
+    def handle(self, *args, **options):
+        _, page, _ = load_fixture(SARAMIN)
+        policy = {
+            'DEFAULT': {'BACKOFF_BASE': 0.2},
+            # Stay just under the stand-in's limit on the healthy host
+            'HOSTS': {'127.0.0.1': {'RATE': options['rate_limit'] * 0.9, 'BURST': 2, 'MAX_CONCURRENCY': 4}},
+        }
+
+        self.stdout.write(f"{'mode':<12} {'seconds':>8} {'imported':>9} {'pages/s':>8}  server responses")
+        for label, scheduler in [('unthrottled', None), ('scheduled', policy)]:
+            host_scheduler._scheduler = None
+            with StandInServer(page, rate_limit=options['rate_limit']) as server, override_settings(
+                JOB_FETCH_CACHE=None, JOB_FETCH_TIMEOUT=options['timeout'], JOB_FETCH_SCHEDULER=scheduler,
+            ):
+                urls = self.urls(server, options)
+                start = time.perf_counter()
+                results = extract_job_descriptions(urls, max_workers=options['workers'])
+                elapsed = time.perf_counter() - start
+
+                imported = sum(1 for result in results if result['success'])
+                statuses = ', '.join(f'{status}: {count}' for status, count in sorted(server.statuses.items()))
+                self.stdout.write(
+                    f'{label:<12} {elapsed:>8.2f} {imported:>4}/{len(urls):<4} {imported / elapsed:>8.1f}  {statuses}'
+                )
+
+                scheduler_instance = host_scheduler.get_scheduler()
+                if scheduler_instance is not None:
+                    for host, metrics in scheduler_instance.metrics().items():
+                        self.stdout.write(
+                            f"    {host}: {metrics['requests']} requests, {metrics['retries']} retries, "
+                            f"{metrics['rejected']} rejected by an open circuit ({metrics['circuit']}), "
+                            f"{metrics['throttled_seconds']:.1f}s throttled, {metrics['backoff_seconds']:.1f}s backing off"
+                        )
+        host_scheduler._scheduler = None
+
+    def urls(self, server, options):
+        urls = [server.url(f'/ok/{i}') for i in range(options['ok'])]
+        urls += [server.url(f'/flaky/{i}') for i in range(options['flaky'])]
+        urls += [server.url(f'/hang/{i}') for i in range(options['hang'])]
+        # A different hostname for the same server, so it gets its own limits and breaker
+        urls += [server.url(f'/down/{i}', host='localhost') for i in range(options['down'])]
+        return urls
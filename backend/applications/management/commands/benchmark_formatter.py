@@ -0,0 +1,60 @@
+import tracemalloc
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.bench.legacy import legacy_extract_text_with_formatting
+from applications.bench.pages import generate_job_page
+from applications.bench.timing import summarize, time_call
+from applications.site_profiles import get_registry, load_fixture
+from applications.utils import extract_text_with_formatting
+
+
+def peak_memory(func, *args):
+    """Peak bytes allocated by one call of func"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Command(BaseCommand):
+    help = 'Compare the streaming description formatter with the original one on fixture and synthetic pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1_000_000, help='Approximate size of the synthetic pages in bytes')
+        parser.add_argument('--repeat', type=int, default=3, help='Timing runs per page')
+
+    def corpus(self, size):
+        for profile in get_registry().profiles:
+            if profile.fixture:
+                _, html, _ = load_fixture(profile)
+                yield f'fixture:{profile.name}', html
+        for language in ('ko', 'en'):
+            yield f'synthetic:{language}', generate_job_page(size, depth=10, language=language)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'page':<20} {'legacy ms':>10} {'stream ms':>10} {'legacy peak KiB':>16} {'stream peak KiB':>16}"
+        )
+        mismatches = []
+
+        for name, html in self.corpus(options['size']):
+            element = BeautifulSoup(html, 'html.parser').body
+
+            legacy, legacy_times = time_call(legacy_extract_text_with_formatting, element, repeat=options['repeat'])
+            streamed, stream_times = time_call(extract_text_with_formatting, element, repeat=options['repeat'])
+            if legacy != streamed:
+                mismatches.append(name)
+
+            self.stdout.write(
+                f"{name:<20} {summarize(legacy_times)['median']:>10.1f} {summarize(stream_times)['median']:>10.1f} "
+                f"{peak_memory(legacy_extract_text_with_formatting, element) // 1024:>16,} "
+                f"{peak_memory(extract_text_with_formatting, element) // 1024:>16,}"
+            )
+
+        if mismatches:
+            raise CommandError(f"Output differs from the original formatter on: {', '.join(mismatches)}")
+        self.stdout.write(self.style.SUCCESS('Output is identical on every page'))
@@ -0,0 +1,56 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from applications import parse_pool
+from applications.bench.pages import generate_job_page
+
+
+class Command(BaseCommand):
+    help = 'Compare parsing concurrent pages on threads only vs. threads plus the process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=50, help='Pages parsed concurrently')
+        parser.add_argument('--size', type=int, default=300_000, help='Approximate page size in bytes')
+        parser.add_argument('--threads', type=int, default=16, help='Fetch threads handing pages to the parser')
+        parser.add_argument(
+            '--processes', type=int, nargs='+', default=[1, 2, 4],
+            help='Parse pool sizes to measure (threads-only is always measured)'
+        )
+
+    def handle(self, *args, **options):
+        pages = [
+            generate_job_page(options['size'], depth=20, seed=seed)
+            for seed in range(options['pages'])
+        ]
+        self.stdout.write(
+            f"{len(pages)} pages of ~{options['size'] // 1000} KB, "
+            f"{options['threads']} threads, {os.cpu_count()} CPUs"
+        )
+        self.stdout.write(f"{'mode':>14} {'seconds':>9} {'pages/s':>9}")
+
+        baseline = self.measure(pages, options['threads'], processes=0)
+        for processes in options['processes']:
+            self.measure(pages, options['threads'], processes, baseline)
+
+    def measure(self, pages, threads, processes, baseline=None):
+        with override_settings(JOB_EXTRACTION_PROCESSES=processes):
+            parse_pool.shutdown_pool()
+            parse_pool.get_pool()  # start and warm the workers outside the timing
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                results = list(executor.map(parse_pool.parse_in_pool, pages))
+            elapsed = time.perf_counter() - start
+
+            parse_pool.shutdown_pool()
+
+        if baseline is not None and results != baseline[1]:
+            self.stderr.write(self.style.ERROR(f'{processes} processes: results differ from in-process parsing'))
+
+        label = f'{processes} processes' if processes else 'threads only'
+        self.stdout.write(f'{label:>14} {elapsed:>9.2f} {len(pages) / elapsed:>9.1f}')
+        return elapsed, results
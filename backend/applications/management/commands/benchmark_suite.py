@@ -0,0 +1,179 @@
+import json
+import tracemalloc
+
+from bs4 import BeautifulSoup, FeatureNotFound
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from applications import utils
+from applications.bench.corpus import field_accuracy, load_corpus, serve_corpus
+from applications.bench.stages import FIELDS, STAGES, StageRecorder, run_stages
+from applications.metrics import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the extraction pipeline over the offline corpus and report per-stage latency, '
+        'memory and field accuracy; fails on accuracy or latency regressions'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', help='Corpus manifest (default: applications/bench_corpus/corpus.json)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per page')
+        parser.add_argument(
+            '--parsers', nargs='+', default=[getattr(settings, 'JOB_HTML_PARSER', 'html.parser')],
+            help='BeautifulSoup parser backends to compare'
+        )
+        parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+        parser.add_argument('--json', dest='json_path', help='Write the report to this file')
+        parser.add_argument('--baseline', help='Earlier --json report to compare stage latencies against')
+        parser.add_argument(
+            '--max-regression', type=float, default=0.25,
+            help='Allowed p50 slowdown per stage vs. the baseline (0.25 = 25%%)'
+        )
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=1.0,
+            help='Ignore p50 slowdowns smaller than this, to absorb timer noise'
+        )
+        parser.add_argument(
+            '--min-accuracy', type=float, default=1.0,
+            help='Fail when the share of correctly extracted fields is below this'
+        )
+
+    def handle(self, *args, **options):
+        pages = load_corpus(options['corpus'])
+        report = {}
+
+        # The fetch cache would turn every repeat after the first into a hit, and
+        # per-host throttling would time the rate limit rather than the fetch
+        with override_settings(JOB_FETCH_CACHE=None, JOB_FETCH_SCHEDULER=None), serve_corpus(pages):
+            for parser in options['parsers']:
+                try:
+                    BeautifulSoup('', parser)
+                except FeatureNotFound:
+                    self.stderr.write(self.style.WARNING(f'{parser}: parser not installed, skipped'))
+                    continue
+
+                with override_settings(JOB_HTML_PARSER=parser):
+                    report[parser] = self.run_parser(pages, parser, options)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+        failures = self.find_failures(report, options)
+        if failures:
+            raise CommandError('\n'.join(failures))
+
+    def run_parser(self, pages, parser, options):
+        samples = {stage: [] for stage in STAGES + ['total']}
+        memory = {}
+        page_reports = {}
+        matched = {field: [0, 0] for field in FIELDS}
+
+        for page in pages:
+            totals = []
+            for _ in range(options['repeat']):
+                recorder = StageRecorder()
+                result = run_stages(page['url'], recorder, parser)
+                for stage, seconds in recorder.timings.items():
+                    samples[stage].append(seconds)
+                totals.append(sum(recorder.timings.values()))
+            samples['total'].extend(totals)
+
+            if result != utils.extract_job_description(page['url']):
+                self.stderr.write(self.style.ERROR(f"{page['name']}: staged run differs from extract_job_description"))
+
+            if not options['no_memory']:
+                recorder = StageRecorder(trace_memory=True)
+                tracemalloc.start()
+                try:
+                    run_stages(page['url'], recorder, parser)
+                finally:
+                    tracemalloc.stop()
+                for stage, usage in recorder.memory.items():
+                    worst = memory.setdefault(stage, {'peak_kib': 0, 'net_blocks': 0})
+                    worst['peak_kib'] = max(worst['peak_kib'], usage['peak_kib'])
+                    worst['net_blocks'] = max(worst['net_blocks'], usage['net_blocks'])
+
+            accuracy = field_accuracy(result, page['expected'])
+            for field, ok in accuracy.items():
+                matched[field][0] += ok
+                matched[field][1] += 1
+
+            page_reports[page['name']] = {
+                'bytes': len(page['content']),
+                'p50_ms': percentile(sorted(totals), 0.5) * 1000,
+                'stages': sorted(recorder.timings, key=STAGES.index),
+                'failed_fields': [field for field, ok in accuracy.items() if not ok],
+            }
+
+        stage_reports = {}
+        for stage, durations in samples.items():
+            if not durations:
+                continue
+            ordered = sorted(durations)
+            stage_reports[stage] = {
+                'samples': len(ordered),
+                'p50_ms': percentile(ordered, 0.5) * 1000,
+                'p95_ms': percentile(ordered, 0.95) * 1000,
+                'max_ms': ordered[-1] * 1000,
+                **memory.get(stage, {}),
+            }
+
+        correct = sum(ok for ok, _ in matched.values())
+        checked = sum(total for _, total in matched.values())
+        parser_report = {
+            'pages': page_reports,
+            'stages': stage_reports,
+            'fields': {field: f'{ok}/{total}' for field, (ok, total) in matched.items() if total},
+            'accuracy': correct / checked if checked else 1.0,
+        }
+        self.write_report(parser, parser_report)
+        return parser_report
+
+    def write_report(self, parser, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Parser: {parser}'))
+        self.stdout.write(f"{'page':<18} {'KB':>7} {'p50 ms':>9}  stages / failed fields")
+        for name, page in report['pages'].items():
+            failed = ', '.join(page['failed_fields'])
+            line = f"{name:<18} {page['bytes'] / 1000:>7.0f} {page['p50_ms']:>9.2f}  {' > '.join(page['stages'])}"
+            self.stdout.write(line + (self.style.ERROR(f'  FAILED: {failed}') if failed else ''))
+
+        self.stdout.write(
+            f"\n{'stage':<12} {'samples':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'peak KiB':>10} {'blocks':>9}"
+        )
+        for stage, stats in report['stages'].items():
+            peak = f"{stats['peak_kib']:>10.0f}" if 'peak_kib' in stats else f"{'-':>10}"
+            blocks = f"{stats['net_blocks']:>9}" if 'net_blocks' in stats else f"{'-':>9}"
+            self.stdout.write(
+                f"{stage:<12} {stats['samples']:>8} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                f"{stats['max_ms']:>9.2f} {peak} {blocks}"
+            )
+
+        fields = ', '.join(f'{field} {score}' for field, score in report['fields'].items())
+        self.stdout.write(f"\naccuracy {report['accuracy']:.1%} ({fields})\n")
+
+    def find_failures(self, report, options):
+        failures = []
+        for parser, parser_report in report.items():
+            if parser_report['accuracy'] < options['min_accuracy']:
+                failures.append(
+                    f"{parser}: accuracy {parser_report['accuracy']:.1%} is below {options['min_accuracy']:.1%}"
+                )
+
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as f:
+                baseline = json.load(f)
+            for parser, parser_report in report.items():
+                for stage, stats in parser_report['stages'].items():
+                    previous = baseline.get(parser, {}).get('stages', {}).get(stage)
+                    if previous is None:
+                        continue
+                    limit = previous['p50_ms'] * (1 + options['max_regression'])
+                    if stats['p50_ms'] > limit and stats['p50_ms'] - previous['p50_ms'] > options['min_delta_ms']:
+                        failures.append(
+                            f"{parser}: {stage} p50 {stats['p50_ms']:.2f} ms vs. baseline {previous['p50_ms']:.2f} ms"
+                        )
+        return failures
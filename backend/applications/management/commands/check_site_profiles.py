@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.bench.timing import summarize, time_call
+from applications.site_profiles import get_registry, load_fixture
+from applications.utils import parse_job_page
+
+
+class Command(BaseCommand):
+    help = 'Check every site profile against its fixture page and time it against the generic rules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Timing runs per profile')
+
+    def handle(self, *args, **options):
+        registry = get_registry()
+        failures = 0
+
+        for profile in registry.profiles:
+            if not profile.fixture:
+                self.stdout.write(f'{profile.name:>10}: no fixture')
+                continue
+
+            url, html, expected = load_fixture(profile)
+            if registry.for_url(url) is not profile:
+                raise CommandError(f'Fixture URL {url} does not resolve to the {profile.name} profile')
+
+            result, profile_times = time_call(parse_job_page, html, url, repeat=options['repeat'])
+            _, generic_times = time_call(parse_job_page, html, None, repeat=options['repeat'])
+
+            mismatched = [field for field in expected if result.get(field) != expected[field]]
+            profile_ms = summarize(profile_times)['median']
+            generic_ms = summarize(generic_times)['median']
+            line = f'{profile.name:>10}: {profile_ms:.2f} ms (generic rules {generic_ms:.2f} ms)'
+
+            if mismatched:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'{line} FAILED'))
+                for field in mismatched:
+                    self.stdout.write(f'    {field}: expected {expected[field]!r}, got {result.get(field)!r}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{line} OK'))
+
+        if failures:
+            raise CommandError(f'{failures} site profile(s) failed their fixture check')
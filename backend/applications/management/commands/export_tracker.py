@@ -0,0 +1,61 @@
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from applications import export
+
+
+class Command(BaseCommand):
+    help = 'Export every position with its notes and events as NDJSON or CSV, streamed to a file or stdout'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=export.FORMATS, default='ndjson', help='Output format (default: ndjson)')
+        parser.add_argument(
+            '--output', '-o', default='-',
+            help="File to write, '-' for stdout (default); names ending in .gz are gzip-compressed"
+        )
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip')
+        parser.add_argument(
+            '--chunk-size', type=int, default=getattr(settings, 'EXPORT_CHUNK_SIZE', 2000),
+            help='Positions read per query'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        output = options['output']
+        counts = Counter()
+        content = export.stream(options['format'], chunk_size=options['chunk_size'], counts=counts)
+        if options['gzip'] or output.endswith('.gz'):
+            content = export.gzip(content)
+
+        start = time.perf_counter()
+        size = 0
+        if output == '-':
+            out = self.stdout.buffer
+        else:
+            try:
+                out = open(output, 'wb')
+            except OSError as exc:
+                raise CommandError(f'Cannot write {output}: {exc}')
+        try:
+            for block in content:
+                out.write(block)
+                size += len(block)
+        finally:
+            if output == '-':
+                out.flush()
+            else:
+                out.close()
+        elapsed = time.perf_counter() - start
+
+        # On stderr when the export itself goes to stdout
+        summary = self.stderr if output == '-' else self.stdout
+        summary.write(
+            f"Exported {counts['positions']} positions, {counts['notes']} notes and {counts['events']} events "
+            f"({size / 1024 / 1024:.1f} MB) in {elapsed:.2f}s",
+            style_func=self.style.SUCCESS,
+        )
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from applications.models import PostingSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Delete stored posting snapshots that no position uses (pages only previewed with fetch_jd)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-hours', type=float,
+            default=getattr(settings, 'POSTING_SNAPSHOT_RETENTION_HOURS', 24),
+            help='Keep unused snapshots fetched more recently than this, so previews can still be saved'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+
+    def handle(self, *args, **options):
+        if options['older_than_hours'] < 0:
+            raise CommandError('--older-than-hours must not be negative')
+
+        older_than = timezone.now() - timedelta(hours=options['older_than_hours'])
+        if options['dry_run']:
+            totals = PostingSnapshot.unreferenced(older_than).aggregate(
+                count=Count('id'), size=Sum('content_length')
+            )
+            self.stdout.write(
+                f"Would delete {totals['count']} snapshots ({(totals['size'] or 0) / 1024 / 1024:.1f} MB of pages)"
+            )
+            return
+
+        deleted = PostingSnapshot.prune(older_than)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} unused snapshots'))
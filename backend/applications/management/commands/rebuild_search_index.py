@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from applications import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over positions and notes from scratch'
+
+    def handle(self, *args, **options):
+        if not search.available():
+            raise CommandError('Full-text search needs SQLite with the FTS5 trigram tokenizer')
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            search.rebuild()
+        elapsed = time.perf_counter() - start
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT kind, COUNT(*) FROM {search.TABLE} GROUP BY kind')
+            counts = dict(cursor.fetchall())
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {counts.get(search.POSITION, 0)} positions and {counts.get(search.NOTE, 0)} notes "
+            f"in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,138 @@
+import os
+import zlib
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from applications.models import Position, PostingSnapshot
+from applications.parse_pool import create_pool
+from applications.signals import SEARCH_FIELDS, bulk_saved
+
+
+FIELDS = ['company_name', 'position_title', 'job_description', 'salary_range', 'location']
+
+NOT_FOUND = "Job description not found"
+
+
+def reparse(compressed, url):
+    """Decompress and parse one snapshot; returns (job_info, error)"""
+    from applications.utils import parse_job_page
+
+    try:
+        return parse_job_page(zlib.decompress(compressed), url), None
+    except Exception as e:
+        return None, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Re-run the extractors over stored posting snapshots and update their positions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int,
+            default=getattr(settings, 'JOB_EXTRACTION_PROCESSES', 0) or os.cpu_count(),
+            help='Parser processes (0 parses in this process)'
+        )
+        parser.add_argument('--batch-size', type=int, default=200, help='Snapshots parsed and saved per batch')
+        parser.add_argument(
+            '--fields', nargs='+', choices=FIELDS, default=FIELDS,
+            help='Position fields to update from the new extraction'
+        )
+        parser.add_argument('--positions', type=int, nargs='+', help='Only re-parse these positions')
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without saving them')
+
+    def handle(self, *args, **options):
+        positions = Position.objects.filter(snapshot__isnull=False)
+        if options['positions']:
+            positions = positions.filter(id__in=options['positions'])
+
+        snapshots = (
+            PostingSnapshot.objects
+            .filter(id__in=positions.values('snapshot_id'))
+            .values_list('id', 'url', 'content')
+            .iterator(chunk_size=options['batch_size'])
+        )
+
+        pool = create_pool(options['workers']) if options['workers'] > 0 else None
+        totals = {'snapshots': 0, 'failed': 0, 'positions': 0, 'updated': 0}
+        try:
+            while True:
+                batch = list(islice(snapshots, options['batch_size']))
+                if not batch:
+                    break
+                self.process_batch(batch, positions, pool, options, totals)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        verb = 'would update' if options['dry_run'] else 'updated'
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-parsed {totals['snapshots']} snapshots ({totals['failed']} failed); "
+            f"{verb} {totals['updated']} of {totals['positions']} positions"
+        ))
+
+    def process_batch(self, batch, positions, pool, options, totals):
+        ids = [snapshot_id for snapshot_id, _, _ in batch]
+        contents = [bytes(content) for _, _, content in batch]
+        urls = [url for _, url, _ in batch]
+
+        if pool is None:
+            results = map(reparse, contents, urls)
+        else:
+            results = pool.map(reparse, contents, urls)
+
+        extracted = {}
+        for snapshot_id, url, (job_info, error) in zip(ids, urls, results):
+            totals['snapshots'] += 1
+            if error is not None:
+                totals['failed'] += 1
+                self.stderr.write(self.style.WARNING(f'Snapshot {snapshot_id} ({url}): {error}'))
+            else:
+                extracted[snapshot_id] = job_info
+
+        fields = options['fields']
+        update_fields = fields + Position.FINGERPRINT_FIELDS if 'job_description' in fields else fields
+        # The search document is rebuilt from all of its fields
+        loaded = [*update_fields, *SEARCH_FIELDS] if SEARCH_FIELDS & set(fields) else update_fields
+        changed = []
+        for position in positions.filter(snapshot_id__in=extracted).only('id', 'snapshot_id', *loaded):
+            totals['positions'] += 1
+            if self.apply(position, extracted[position.snapshot_id], fields):
+                changed.append(position)
+
+        totals['updated'] += len(changed)
+        if changed and not options['dry_run']:
+            # bulk_update neither sets auto_now nor sends signals: bump
+            # updated_at so ETags change, and send bulk_saved like the bulk
+            # API does to re-index search and drop cached responses and stats
+            now = timezone.now()
+            for position in changed:
+                position.updated_at = now
+            update_fields = [*update_fields, 'updated_at']
+            with transaction.atomic():
+                Position.objects.bulk_update(changed, update_fields, batch_size=options['batch_size'])
+                bulk_saved.send(
+                    sender=Position, created=[], updated=changed, update_fields=update_fields, previous={},
+                )
+
+    def apply(self, position, job_info, fields):
+        """Copy non-empty extracted values onto position; returns whether anything changed"""
+        changed = False
+        for field in fields:
+            value = job_info.get(field)
+            if not value or value == NOT_FOUND:
+                # Keep what the position has rather than blanking it
+                continue
+            max_length = Position._meta.get_field(field).max_length
+            if max_length:
+                value = value[:max_length]
+            if getattr(position, field) != value:
+                setattr(position, field, value)
+                changed = True
+        if changed and 'job_description' in fields:
+            # bulk_update skips save(), which keeps the fingerprint current
+            position.update_fingerprint()
+        return changed
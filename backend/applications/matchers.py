@@ -0,0 +1,70 @@
+"""
+Precompiled keyword and pattern matchers for the salary and location fields.
+
+Each keyword set is compiled into a single alternation, so a text is scanned
+once for all of its keywords instead of once per keyword. Salary patterns
+only run on texts where a salary keyword was found.
+"""
+import re
+
+
+SALARY_KEYWORDS = ['salary', 'compensation', '연봉', '급여', '임금']
+
+# Patterns: $50k-70k, 5000만원, etc. Tried in order; the first that matches wins.
+SALARY_PATTERNS = [
+    r'\$[\d,]+k?\s*-?\s*\$?[\d,]+k?',
+    r'[\d,]+만원\s*~?\s*[\d,]+만원',
+    r'[\d,]+원\s*~?\s*[\d,]+원',
+]
+
+LOCATION_KEYWORDS = ['location', '위치', '근무지', '지역']
+
+
+class KeywordMatcher:
+    """
+    Finds any of a set of keywords in one pass over a text.
+
+    Matching runs on the lowercased text, exactly like the
+    `keyword in text.lower()` checks it replaces.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keyword.lower() for keyword in keywords)
+        # Longest first, so overlapping keywords report the longest one
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(keyword) for keyword in ordered))
+
+    def search(self, text):
+        """Return the first keyword found in text, or None"""
+        if not text:
+            return None
+        match = self.pattern.search(text.lower())
+        return match.group(0) if match else None
+
+    def find_all(self, text):
+        """Return every (non-overlapping) keyword occurrence in text"""
+        if not text:
+            return []
+        return self.pattern.findall(text.lower())
+
+
+class SalaryMatcher:
+    """Salary range finder: keyword check first, then the compiled patterns"""
+
+    def __init__(self, keywords=SALARY_KEYWORDS, patterns=SALARY_PATTERNS):
+        self.keywords = KeywordMatcher(keywords)
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+
+    def match(self, text):
+        """Return the salary range in text, or None when it has no salary keyword"""
+        if not self.keywords.search(text):
+            return None
+        for pattern in self.patterns:
+            match = pattern.search(text)
+            if match:
+                return match.group(0)
+        return None
+
+
+SALARY_MATCHER = SalaryMatcher()
+LOCATION_KEYWORD_MATCHER = KeywordMatcher(LOCATION_KEYWORDS)
@@ -0,0 +1,11 @@
+"""
+Small statistics helpers shared by the runtime metrics endpoints (the
+extraction queue, the fetch scheduler) and the benchmark commands.
+"""
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list (None when empty)"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_remove_interviewevent_end_datetime_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('url', models.URLField(max_length=2048)),
+                ('content', models.BinaryField()),
+                ('content_length', models.PositiveIntegerField()),
+                ('headers', models.JSONField(blank=True, default=dict)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-fetched_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='processnote',
+            name='process_type',
+            field=models.CharField(choices=[('coding_test', 'Coding Test'), ('technical_interview', 'Technical Interview'), ('cultural_fit', 'Cultural Fit Interview'), ('final_interview', 'Final Interview'), ('general', 'General Notes')], default='general', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='positions', to='applications.postingsnapshot'),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:24
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import migrations, models
+
+
+# A frozen copy of applications.fingerprints as of this migration, which
+# stored eight 8-bit bands (0011 splits the SimHash into wider ones)
+BANDS = 8
+BAND_BITS = 64 // BANDS
+NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return ' '.join(NON_WORD.sub(' ', text).split())
+
+
+def simhash(words):
+    weights = [0] * 64
+    for word, count in Counter(words).items():
+        value = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += count if value >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def fingerprint_fields(text):
+    normalized = normalize_text(text)
+    if not normalized:
+        fields = {'content_hash': '', 'simhash': None}
+        fields.update({f'simhash_band{band}': None for band in range(BANDS)})
+        return fields
+
+    fingerprint = simhash(normalized.split())
+    fields = {
+        'content_hash': hashlib.sha256(normalized.encode('utf-8')).hexdigest(),
+        # Signed, to fit a BigIntegerField
+        'simhash': fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint,
+    }
+    fields.update({
+        f'simhash_band{band}': fingerprint >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1) for band in range(BANDS)
+    })
+    return fields
+
+
+def backfill_fingerprints(apps, schema_editor):
+    Position = apps.get_model('applications', 'Position')
+    fields = list(fingerprint_fields('').keys())
+    positions = []
+    for position in Position.objects.only('id', 'job_description').iterator(chunk_size=500):
+        for field, value in fingerprint_fields(position.job_description).items():
+            setattr(position, field, value)
+        positions.append(position)
+    Position.objects.bulk_update(positions, fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_postingsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='position',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band0',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band1',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band2',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band3',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band4',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band5',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band6',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='simhash_band7',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_position_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='interviewevent',
+            options={'ordering': ['start_datetime', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='position',
+            options={'ordering': ['-updated_at', '-id']},
+        ),
+        migrations.AlterModelOptions(
+            name='processnote',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='interviewevent',
+            index=models.Index(fields=['start_datetime', 'id'], name='event_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewevent',
+            index=models.Index(fields=['position', 'start_datetime', 'id'], name='event_position_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['-updated_at', '-id'], name='position_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processnote',
+            index=models.Index(fields=['-created_at', '-id'], name='note_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processnote',
+            index=models.Index(fields=['position', '-created_at', '-id'], name='note_position_created_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:05
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_end_datetime(apps, schema_editor):
+    InterviewEvent = apps.get_model('applications', 'InterviewEvent')
+    events = []
+    for event in InterviewEvent.objects.only('id', 'start_datetime', 'duration').iterator(chunk_size=500):
+        event.end_datetime = event.start_datetime + timedelta(minutes=event.duration)
+        events.append(event)
+    InterviewEvent.objects.bulk_update(events, ['end_datetime'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewevent',
+            name='end_datetime',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_end_datetime, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interviewevent',
+            name='end_datetime',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='interviewevent',
+            index=models.Index(fields=['start_datetime', 'end_datetime'], name='event_window_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewevent',
+            index=models.Index(fields=['duration'], name='event_duration_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_interviewevent_end_datetime'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='position',
+            name='current_status',
+            field=models.CharField(choices=[('applied', 'Applied'), ('screening', 'Resume Screening'), ('coding_test', 'Coding Test'), ('technical_interview', 'Technical Interview'), ('cultural_fit', 'Cultural Fit Interview'), ('final_interview', 'Final Interview'), ('offer', 'Offer Received'), ('rejected', 'Rejected'), ('accepted', 'Accepted'), ('declined', 'Declined')], db_index=True, default='applied', max_length=50),
+        ),
+    ]
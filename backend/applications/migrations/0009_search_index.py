@@ -0,0 +1,76 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:40
+
+from django.db import DatabaseError, migrations, transaction
+
+
+# A frozen copy of applications.search's table and populate statements as
+# of this migration, so later changes to the module cannot alter it
+TABLE = 'applications_search'
+
+CREATE_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    position_id UNINDEXED,
+    title,
+    body,
+    tokenize = 'trigram'
+)
+"""
+
+POPULATE_SQL = [
+    f"""
+    INSERT INTO {TABLE}(rowid, kind, object_id, position_id, title, body)
+    SELECT 2 * id, 'position', id, id,
+           company_name || ' ' || position_title, COALESCE(job_description, '')
+    FROM applications_position
+    """,
+    f"""
+    INSERT INTO {TABLE}(rowid, kind, object_id, position_id, title, body)
+    SELECT 2 * id + 1, 'note', id, position_id, title, content
+    FROM applications_processnote
+    """,
+]
+
+PROBE_SQL = f"CREATE VIRTUAL TABLE temp.{TABLE}_probe USING fts5(body, tokenize = 'trigram')"
+
+
+def supports_trigram(conn):
+    if conn.vendor != 'sqlite':
+        return False
+    try:
+        with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+            cursor.execute(PROBE_SQL)
+            cursor.execute(f'DROP TABLE temp.{TABLE}_probe')
+    except DatabaseError:
+        return False
+    return True
+
+
+def create_search_index(apps, schema_editor):
+    # Creates the FTS5 table and indexes existing rows; skipped where there
+    # is no FTS5 trigram support
+    conn = schema_editor.connection
+    if not supports_trigram(conn):
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        for sql in POPULATE_SQL:
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_position_status_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
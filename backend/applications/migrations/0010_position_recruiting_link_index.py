@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0009_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='position',
+            name='recruiting_link',
+            field=models.URLField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:12
+
+from django.db import migrations
+
+
+def split_bands(apps, count):
+    """Store each position's SimHash as `count` bands of 64 / count bits"""
+    Position = apps.get_model('applications', 'Position')
+    width = 64 // count
+    mask = (1 << width) - 1
+    fields = [f'simhash_band{band}' for band in range(count)]
+    positions = []
+    for position in Position.objects.exclude(simhash=None).only('id', 'simhash').iterator(chunk_size=500):
+        fingerprint = position.simhash % (1 << 64)
+        for band, field in enumerate(fields):
+            setattr(position, field, fingerprint >> (band * width) & mask)
+        positions.append(position)
+    Position.objects.bulk_update(positions, fields, batch_size=500)
+
+
+def split_wide_bands(apps, schema_editor):
+    split_bands(apps, 4)
+
+
+def split_narrow_bands(apps, schema_editor):
+    split_bands(apps, 8)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0010_position_recruiting_link_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_wide_bands, split_narrow_bands),
+        migrations.RemoveField(
+            model_name='position',
+            name='simhash_band4',
+        ),
+        migrations.RemoveField(
+            model_name='position',
+            name='simhash_band5',
+        ),
+        migrations.RemoveField(
+            model_name='position',
+            name='simhash_band6',
+        ),
+        migrations.RemoveField(
+            model_name='position',
+            name='simhash_band7',
+        ),
+    ]
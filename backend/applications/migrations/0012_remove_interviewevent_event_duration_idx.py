@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0011_position_wide_simhash_bands'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='interviewevent',
+            name='event_duration_idx',
+        ),
+    ]
@@ -1,6 +1,74 @@
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from .fingerprints import (
+    MAX_DISTANCE, SIMHASH_BANDS, band_probes, fingerprint_fields, hamming_distance, page_hash, probe_distance,
+)
+
+
+class PostingSnapshot(models.Model):
+    """
+    Raw job posting page as fetched, so positions can be re-parsed offline.
+
+    Pages are stored zlib-compressed and keyed by the SHA-256 of the raw
+    bytes; positions whose links served the same page share one snapshot.
+
+    fetch_jd stores a snapshot when sent snapshot=true (the position form
+    does), before and whether or not a position is saved with it; prune()
+    deletes the ones no position took up within the retention period.
+    """
+    content_hash = models.CharField(max_length=64, unique=True)
+    url = models.URLField(max_length=2048)
+    content = models.BinaryField()
+    content_length = models.PositiveIntegerField()
+    headers = models.JSONField(default=dict, blank=True)
+    fetched_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-fetched_at']
+
+    def __str__(self):
+        return f"{self.url} ({self.content_hash[:12]})"
+
+    @classmethod
+    def store(cls, url, content, headers=None):
+        """Return the snapshot for these page bytes, creating it if it is new"""
+        snapshot, created = cls.objects.get_or_create(
+            content_hash=page_hash(content),
+            defaults={
+                'url': url,
+                'content': zlib.compress(content, 6),
+                'content_length': len(content),
+                'headers': headers or {},
+            },
+        )
+        if not created:
+            # Fetched again: restart its retention period so prune() does
+            # not delete it before the position being previewed is saved
+            snapshot.fetched_at = timezone.now()
+            cls.objects.filter(pk=snapshot.pk).update(fetched_at=snapshot.fetched_at)
+        return snapshot
+
+    @classmethod
+    def unreferenced(cls, older_than):
+        """Snapshots no position uses that were last fetched before older_than"""
+        return cls.objects.filter(positions__isnull=True, fetched_at__lt=older_than)
+
+    @classmethod
+    def prune(cls, older_than):
+        """Delete unreferenced snapshots last fetched before older_than; returns how many"""
+        deleted, _ = cls.unreferenced(older_than).delete()
+        return deleted
+
+    @property
+    def raw_content(self):
+        """The page bytes as fetched"""
+        return zlib.decompress(self.content)
+
 
 class Position(models.Model):
     """Model for job positions/applications"""
@@ -20,26 +88,121 @@ class Position(models.Model):
     company_name = models.CharField(max_length=255)
     position_title = models.CharField(max_length=255)
     job_description = models.TextField(blank=True, null=True)
-    recruiting_link = models.URLField(blank=True, null=True)
+    # Bulk writes upsert on it (applications.bulk)
+    recruiting_link = models.URLField(blank=True, null=True, db_index=True)
     current_status = models.CharField(
         max_length=50,
         choices=PROCESS_STATUS_CHOICES,
-        default='applied'
+        default='applied',
+        # Dashboard counts group by it (applications.stats)
+        db_index=True,
     )
     salary_range = models.CharField(max_length=100, blank=True, null=True)
     location = models.CharField(max_length=255, blank=True, null=True)
     application_date = models.DateField(auto_now_add=True)
+    snapshot = models.ForeignKey(
+        PostingSnapshot,
+        on_delete=models.SET_NULL,
+        related_name='positions',
+        blank=True,
+        null=True
+    )
+    # Fingerprints of job_description (see fingerprints.py), kept up to date by save()
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    simhash = models.BigIntegerField(blank=True, null=True)
+    simhash_band0 = models.IntegerField(blank=True, null=True, db_index=True)
+    simhash_band1 = models.IntegerField(blank=True, null=True, db_index=True)
+    simhash_band2 = models.IntegerField(blank=True, null=True, db_index=True)
+    simhash_band3 = models.IntegerField(blank=True, null=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    FINGERPRINT_FIELDS = ['content_hash', 'simhash'] + [f'simhash_band{band}' for band in range(SIMHASH_BANDS)]
+
     class Meta:
-        ordering = ['-updated_at']
+        ordering = ['-updated_at', '-id']
+        indexes = [
+            # Keyset pagination of the position list
+            models.Index(fields=['-updated_at', '-id'], name='position_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.company_name} - {self.position_title}"
 
+    def update_fingerprint(self):
+        """Recompute the description fingerprint; returns whether it changed"""
+        changed = False
+        for field, value in fingerprint_fields(self.job_description).items():
+            if getattr(self, field) != value:
+                setattr(self, field, value)
+                changed = True
+        return changed
+
+    def update_derived_fields(self, update_fields=None):
+        """Recompute what depends on update_fields (all fields when None); returns the fields it sets"""
+        if update_fields is None or 'job_description' in update_fields:
+            self.update_fingerprint()
+            return self.FINGERPRINT_FIELDS
+        return []
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        derived = self.update_derived_fields(update_fields)
+        if update_fields is not None and derived:
+            kwargs['update_fields'] = set(update_fields) | set(derived)
+        super().save(*args, **kwargs)
 
-class ProcessNote(models.Model):
+    def possible_duplicates(self, max_distance=None, fields=None):
+        """
+        Other positions whose descriptions are identical or near-identical,
+        as (position, distance) pairs, closest first. Candidates come from
+        the exact hash and SimHash band indexes and are compared on their
+        fingerprints alone; only the duplicates are loaded, with just
+        `fields` (all fields when None).
+        """
+        if max_distance is None or max_distance > MAX_DISTANCE:
+            max_distance = MAX_DISTANCE
+        if self.simhash is None:
+            return []
+
+        probe = probe_distance(max_distance)
+        lookup = models.Q(content_hash=self.content_hash)
+        for field in self.FINGERPRINT_FIELDS[2:]:
+            lookup |= models.Q(**{f'{field}__in': band_probes(getattr(self, field), probe)})
+
+        distances = {}
+        candidates = Position.objects.filter(lookup).exclude(pk=self.pk)
+        for pk, simhash, candidate_hash in candidates.values_list('pk', 'simhash', 'content_hash'):
+            if candidate_hash == self.content_hash:
+                distances[pk] = 0
+            else:
+                distances[pk] = hamming_distance(self.simhash, simhash)
+        distances = {pk: distance for pk, distance in distances.items() if distance <= max_distance}
+
+        positions = Position.objects.all()
+        if fields is not None:
+            positions = positions.only('id', *fields)
+        duplicates = [(position, distances[pk]) for pk, position in positions.in_bulk(distances).items()]
+        duplicates.sort(key=lambda pair: (pair[1], -pair[0].pk))
+        return duplicates
+
+
+class TracksLoadedPosition:
+    """
+    Remembers the position_id a row had when it was loaded, so a save that
+    moves it to another position can invalidate both (applications.signals)
+    without reading the row again.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Absent when the query deferred it
+        instance._loaded_position_id = instance.__dict__.get('position_id')
+        return instance
+
+
+class ProcessNote(TracksLoadedPosition, models.Model):
     """Notes for each stage of the recruitment process"""
     PROCESS_TYPE_CHOICES = [
         ('coding_test', 'Coding Test'),
@@ -61,13 +224,45 @@ class ProcessNote(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='note_created_idx'),
+            # ?position_id= filter in the same order
+            models.Index(fields=['position', '-created_at', '-id'], name='note_position_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.position.company_name} - {self.title}"
 
 
-class InterviewEvent(models.Model):
+def max_event_duration():
+    """Longest InterviewEvent.duration in minutes (enforced by InterviewEventSerializer)"""
+    return getattr(settings, 'INTERVIEW_EVENT_MAX_DURATION', 24 * 60)
+
+
+class InterviewEventQuerySet(models.QuerySet):
+    def overlapping(self, start=None, end=None):
+        """
+        Events that overlap the window [start, end); either bound may be None.
+
+        end_datetime > start alone cannot use the start index, so the lower
+        start bound comes from the longest duration an event may have
+        (settings.INTERVIEW_EVENT_MAX_DURATION): an event ending after
+        `start` must have started after start - that duration. Both bounds
+        together make the window a range scan on start_datetime.
+        """
+        queryset = self
+        if end is not None:
+            queryset = queryset.filter(start_datetime__lt=end)
+        if start is not None:
+            queryset = queryset.filter(
+                start_datetime__gt=start - timedelta(minutes=max_event_duration()),
+                end_datetime__gt=start,
+            )
+        return queryset
+
+
+class InterviewEvent(TracksLoadedPosition, models.Model):
     """Calendar events for interviews and other recruitment-related activities"""
     EVENT_TYPE_CHOICES = [
         ('coding_test', 'Coding Test'),
@@ -93,6 +288,8 @@ class InterviewEvent(models.Model):
     description = models.TextField(blank=True, null=True)
     start_datetime = models.DateTimeField()
     duration = models.IntegerField(default=60)
+    # start_datetime + duration, kept in sync by save() so window queries can filter on it
+    end_datetime = models.DateTimeField(editable=False)
     meeting_type = models.CharField(max_length=20, choices=MEETING_TYPE, default='on-site')
     location = models.CharField(max_length=255, blank=True, null=True)
     meeting_link = models.URLField(blank=True, null=True)
@@ -100,7 +297,33 @@ class InterviewEvent(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ['start_datetime']
+        ordering = ['start_datetime', 'id']
+        indexes = [
+            models.Index(fields=['start_datetime', 'id'], name='event_start_idx'),
+            # ?position_id= filter in the same order
+            models.Index(fields=['position', 'start_datetime', 'id'], name='event_position_start_idx'),
+            # ?start_date=&end_date= overlap window
+            models.Index(fields=['start_datetime', 'end_datetime'], name='event_window_idx'),
+        ]
+
+    objects = InterviewEventQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.position.company_name} - {self.title}"
+
+    def update_end_datetime(self):
+        self.end_datetime = self.start_datetime + timedelta(minutes=self.duration)
+
+    def update_derived_fields(self, update_fields=None):
+        """Recompute what depends on update_fields (all fields when None); returns the fields it sets"""
+        if update_fields is None or {'start_datetime', 'duration'} & set(update_fields):
+            self.update_end_datetime()
+            return ['end_datetime']
+        return []
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        derived = self.update_derived_fields(update_fields)
+        if update_fields is not None and derived:
+            kwargs['update_fields'] = set(update_fields) | set(derived)
+        super().save(*args, **kwargs)
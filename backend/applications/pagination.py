@@ -0,0 +1,165 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are selected with a WHERE clause on the ordering key instead of an
+OFFSET, so page N costs the same as page 1 as long as an index matches the
+ordering. The ordering is the view's `keyset_ordering` (or the queryset /
+model ordering) with the primary key appended as a tie-breaker. Cursors
+are opaque tokens holding the key of the row at the edge of the current
+page.
+
+No COUNT(*) is run unless the client asks for it with ?count=1.
+"""
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, queryset, view):
+        ordering = (
+            getattr(view, 'keyset_ordering', None)
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+        )
+        ordering = [field for field in ordering if isinstance(field, str)]
+        pk_name = queryset.model._meta.pk.name
+        if not any(field.lstrip('-') in (pk_name, 'pk') for field in ordering):
+            # Tie-break on the primary key, in the direction of the last field
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append(f'-{pk_name}' if descending else pk_name)
+        return ordering
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 50
+        requested = request.query_params.get(self.page_size_query_param)
+        if requested:
+            try:
+                page_size = int(requested)
+            except ValueError:
+                pass
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request, model, ordering):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            values = payload['k']
+            if len(values) != len(ordering):
+                raise ValueError
+            key = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(ordering, values)
+            ]
+            return key, bool(payload.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, ordering, reverse):
+        values = []
+        for field in ordering:
+            value = getattr(instance, field.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = {'k': values}
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    @staticmethod
+    def after(ordering, key, reverse):
+        """
+        Rows strictly after `key` in `ordering` (before it when reverse):
+        (a > x) OR (a = x AND b > y) OR ... with > flipped for descending fields.
+        The redundant a >= x bound lets the database use an index range scan.
+        """
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            term = Q(**{f'{name}__{"lt" if descending else "gt"}': key[index]})
+            for previous, value in zip(ordering[:index], key[:index]):
+                term &= Q(**{previous.lstrip('-'): value})
+            condition |= term
+
+        first = ordering[0]
+        descending = first.startswith('-') != reverse
+        return Q(**{f'{first.lstrip("-")}__{"lte" if descending else "gte"}': key[0]}) & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = ordering = self.get_ordering(queryset, view)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ('1', 'true'):
+            self.count = queryset.count()
+
+        key, reverse = self.decode_cursor(request, queryset.model, ordering)
+        if reverse:
+            # Walk backwards with the ordering flipped, then restore the order
+            query_ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        else:
+            query_ordering = ordering
+
+        queryset = queryset.order_by(*query_ordering)
+        if key is not None:
+            queryset = queryset.filter(self.after(ordering, key, reverse))
+
+        # One extra row tells whether there is anything beyond this page
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else key is not None
+        self.has_previous = key is not None if not reverse else has_more
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], self.ordering, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], self.ordering, reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            response = {'count': self.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,96 @@
+"""
+Process pool for CPU-bound page parsing.
+
+BeautifulSoup parsing and the extraction heuristics are pure Python, so
+concurrent extractions in one process serialize on the GIL even when their
+downloads overlap. With settings.JOB_EXTRACTION_PROCESSES > 0, fetching
+stays on the calling thread while parse_job_page() runs in a warm pool of
+worker processes: only the raw page bytes and URL go in, and only the small
+result dict comes back.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+
+def _init_worker(settings_module):
+    """Configure Django in a freshly started worker process"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _warm_up():
+    """Import the parsing stack and run it once so the first real page is not slower"""
+    from .utils import parse_job_page
+
+    parse_job_page(b'<html><body><div class="job-description"><p>warm</p></div></body></html>')
+    return os.getpid()
+
+
+def _parse(content, url):
+    from .utils import parse_job_page
+
+    return parse_job_page(content, url)
+
+
+def create_pool(processes):
+    """Start a parse pool of `processes` Django-configured, warmed-up workers"""
+    context = multiprocessing.get_context(getattr(settings, 'JOB_EXTRACTION_START_METHOD', 'spawn'))
+    pool = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'recruit_tracker.settings'),),
+    )
+    # Start every worker now rather than on the first requests
+    for future in [pool.submit(_warm_up) for _ in range(processes)]:
+        future.result()
+    return pool
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the warm parse pool, or None when parsing runs in-process"""
+    global _pool
+    processes = getattr(settings, 'JOB_EXTRACTION_PROCESSES', 0)
+    if not processes:
+        return None
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = create_pool(processes)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def parse_in_pool(content, url=None):
+    """
+    Parse a fetched page in the process pool (or inline when it is disabled).
+    A pool broken by a crashed worker is discarded, so the next page starts a
+    fresh one, and this page is parsed inline instead.
+    """
+    pool = get_pool()
+    if pool is None:
+        return _parse(content, url)
+
+    try:
+        return pool.submit(_parse, content, url).result()
+    except BrokenProcessPool:
+        shutdown_pool()
+        return _parse(content, url)
@@ -0,0 +1,180 @@
+"""
+Server-side cache of rendered API responses.
+
+Entries are keyed by the full request URL, the negotiated media type and
+the current version of every scope the response depends on:
+- 'position:<id>': one position's detail (nested notes and events included),
+- 'notes:<position id>' / 'events:<position id>': lists filtered to a position,
+- 'note:<id>' / 'event:<id>': one note or event,
+- 'positions' / 'notes' / 'events': anything over a whole table.
+
+Writes never delete entries; they replace the versions of the scopes they
+touch (applications.signals), so every key built from the old versions
+stops matching and ages out with the TTL. Editing a note therefore only
+misses the note, its position's detail, that position's notes list and
+the unfiltered notes list.
+
+Versions are random tokens rather than counters, so a version evicted from
+the cache comes back as a fresh token instead of re-matching old entries.
+Entries and versions live in the Django cache named by
+settings.API_RESPONSE_CACHE['ALIAS']: locmem, file or Redis, via CACHES.
+"""
+import hashlib
+import threading
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+
+# Response headers replayed from a cached entry
+CACHED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Vary', 'Allow']
+
+
+class ResponseCache:
+    """Versioned response entries in one Django cache, with per-process hit/miss counters"""
+
+    def __init__(self, alias='default', ttl=300, key_prefix='api'):
+        self.alias = alias
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self._counter_lock = threading.Lock()
+        self._counters = dict.fromkeys(['hits', 'not_modified', 'misses', 'stores', 'invalidations'], 0)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def record(self, counter, amount=1):
+        with self._counter_lock:
+            self._counters[counter] += amount
+
+    def version_key(self, scope):
+        return f'{self.key_prefix}:version:{scope}'
+
+    def versions(self, scopes):
+        """Current version token of each scope, creating missing ones"""
+        keys = {scope: self.version_key(scope) for scope in scopes}
+        found = self.cache.get_many(keys.values())
+        versions = {}
+        for scope, key in keys.items():
+            version = found.get(key)
+            if version is None:
+                version = uuid.uuid4().hex
+                # add() so a concurrent request's token wins consistently
+                if not self.cache.add(key, version, timeout=None):
+                    version = self.cache.get(key) or version
+            versions[scope] = version
+        return versions
+
+    def invalidate(self, scopes):
+        scopes = set(scopes)
+        self.cache.set_many({self.version_key(scope): uuid.uuid4().hex for scope in scopes}, timeout=None)
+        self.record('invalidations', len(scopes))
+
+    def make_key(self, url, media_type, scopes):
+        versions = self.versions(scopes)
+        parts = repr((url, media_type, sorted(versions.items())))
+        return f'{self.key_prefix}:response:{hashlib.blake2b(parts.encode(), digest_size=16).hexdigest()}'
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, response):
+        entry = {
+            'content': response.content,
+            'headers': {name: response[name] for name in CACHED_HEADERS if response.has_header(name)},
+        }
+        self.cache.set(key, entry, timeout=self.ttl)
+        self.record('stores')
+
+    def stats(self):
+        with self._counter_lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['not_modified'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['not_modified']) / lookups if lookups else 0.0
+        stats['backend'] = self.cache.__class__.__name__
+        stats['ttl'] = self.ttl
+        return stats
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Return the response cache, or None when it is disabled.
+
+    Configured through settings.API_RESPONSE_CACHE:
+        {'ALIAS': 'api', 'TTL': 300}
+    """
+    global _response_cache
+    config = getattr(settings, 'API_RESPONSE_CACHE', None)
+    if not config:
+        return None
+
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(alias=config.get('ALIAS', 'default'), ttl=config.get('TTL', 300))
+    return _response_cache
+
+
+def invalidate(*scopes):
+    cache = get_response_cache()
+    if cache is not None and scopes:
+        cache.invalidate(scopes)
+
+
+def replay(request, entry):
+    """An HttpResponse for a cached entry, or a 304 when the client already has it"""
+    headers = entry['headers']
+    last_modified = parse_http_date_safe(headers['Last-Modified']) if 'Last-Modified' in headers else None
+    response = get_conditional_response(request, etag=headers.get('ETag'), last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(entry['content'])
+    for name, value in headers.items():
+        if name != 'Content-Type' or response.status_code == 200:
+            response[name] = value
+    return response
+
+
+class ResponseCacheMixin:
+    """
+    Viewset mixin: serve list and retrieve (and actions wrapped in
+    cached_response()) from the response cache. Views name the scopes a
+    response depends on in response_cache_scopes().
+    """
+
+    def response_cache_scopes(self):
+        raise NotImplementedError
+
+    def cached_response(self, request, render):
+        cache = get_response_cache()
+        if cache is None:
+            return render()
+
+        key = cache.make_key(request.build_absolute_uri(), request.accepted_media_type, self.response_cache_scopes())
+        entry = cache.get(key)
+        if entry is not None:
+            response = replay(request._request, entry)
+            cache.record('hits' if response.status_code == 200 else 'not_modified')
+            return response
+
+        cache.record('misses')
+        response = render()
+        if response.status_code == 200:
+            # Stored once the renderer has produced the body
+            response.add_post_render_callback(lambda rendered: cache.set(key, rendered))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, partial(super().retrieve, request, *args, **kwargs))
@@ -0,0 +1,239 @@
+"""
+Full-text search over positions and notes with SQLite FTS5.
+
+One FTS5 table, applications_search, holds a document per position
+(company name and title, job description) and per note (title, content).
+It uses the trigram tokenizer, which needs no word segmentation, so Korean
+and English text match on any substring of three or more characters.
+
+Documents are keyed by rowid: 2 * id for a position and 2 * id + 1 for a
+note, so a save or delete updates its document with a rowid lookup. The
+index is written in the same transaction as the row (applications.signals);
+`manage.py rebuild_search_index` repopulates it from scratch.
+
+On databases other than SQLite, and on SQLite builds without FTS5 or its
+trigram tokenizer (added in SQLite 3.34), the index is skipped and search
+is unavailable. Support is probed once per database by creating a
+temporary trigram table.
+"""
+import html
+
+from django.db import DatabaseError, connection, transaction
+
+
+TABLE = 'applications_search'
+
+# Kind -> rowid offset
+POSITION = 'position'
+NOTE = 'note'
+KINDS = {POSITION: 0, NOTE: 1}
+
+# bm25() column weights: a match in the title counts more than in the body
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+# Placeholders for snippet() highlights, swapped for <mark> after escaping
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+MIN_TERM_LENGTH = 3
+
+CREATE_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    position_id UNINDEXED,
+    title,
+    body,
+    tokenize = 'trigram'
+)
+"""
+
+POPULATE_SQL = [
+    f"""
+    INSERT INTO {TABLE}(rowid, kind, object_id, position_id, title, body)
+    SELECT 2 * id, '{POSITION}', id, id,
+           company_name || ' ' || position_title, COALESCE(job_description, '')
+    FROM applications_position
+    """,
+    f"""
+    INSERT INTO {TABLE}(rowid, kind, object_id, position_id, title, body)
+    SELECT 2 * id + 1, '{NOTE}', id, position_id, title, content
+    FROM applications_processnote
+    """,
+]
+
+
+PROBE_SQL = f"CREATE VIRTUAL TABLE temp.{TABLE}_probe USING fts5(body, tokenize = 'trigram')"
+
+# Database alias -> whether it supports the index
+_support = {}
+
+
+def supports_trigram(conn):
+    """Whether conn can create an FTS5 table with the trigram tokenizer"""
+    try:
+        # In a savepoint, so a failed probe leaves an open transaction usable
+        with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+            cursor.execute(PROBE_SQL)
+            cursor.execute(f'DROP TABLE temp.{TABLE}_probe')
+    except DatabaseError:
+        return False
+    return True
+
+
+def available(conn=None):
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return False
+    if conn.alias not in _support:
+        _support[conn.alias] = supports_trigram(conn)
+    return _support[conn.alias]
+
+
+def rowid(kind, object_id):
+    return 2 * object_id + KINDS[kind]
+
+
+def position_document(position):
+    return (
+        rowid(POSITION, position.pk), POSITION, position.pk, position.pk,
+        f'{position.company_name} {position.position_title}', position.job_description or '',
+    )
+
+
+def note_document(note):
+    return (rowid(NOTE, note.pk), NOTE, note.pk, note.position_id, note.title, note.content)
+
+
+def index_documents(documents):
+    """Insert or replace documents (tuples from position_document / note_document)"""
+    if not available() or not documents:
+        return
+    with connection.cursor() as cursor:
+        # FTS5 has no upsert; REPLACE deletes the old row with the same rowid
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {TABLE}(rowid, kind, object_id, position_id, title, body) '
+            f'VALUES (%s, %s, %s, %s, %s, %s)',
+            documents,
+        )
+
+
+def index_positions(positions):
+    index_documents([position_document(position) for position in positions])
+
+
+def index_notes(notes):
+    index_documents([note_document(note) for note in notes])
+
+
+def remove(kind, object_ids):
+    if not available() or not object_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(rowid(kind, pk),) for pk in object_ids])
+
+
+def rebuild(conn=None):
+    """Drop every document and re-index all positions and notes"""
+    conn = conn or connection
+    if not available(conn):
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        cursor.execute(f'DELETE FROM {TABLE}')
+        for sql in POPULATE_SQL:
+            cursor.execute(sql)
+        # Merge the index b-trees written by the bulk insert
+        cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+
+
+def split_terms(query):
+    """(terms the trigram index can match, shorter terms) of a query"""
+    terms = query.split()
+    return (
+        [term for term in terms if len(term) >= MIN_TERM_LENGTH],
+        [term for term in terms if len(term) < MIN_TERM_LENGTH],
+    )
+
+
+def match_expression(terms):
+    # Quoted strings are literals: operators and punctuation are not parsed
+    return ' '.join('"%s"' % term.replace('"', '""') for term in terms)
+
+
+def like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def highlight(snippet):
+    return html.escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def search(query, current_status=None, kind=None, limit=20, offset=0, snippet_tokens=64):
+    """
+    Ranked matches for `query`, best first, as dicts with the matching
+    document, its position and an HTML-escaped snippet with <mark>ed hits
+    (trigram tokens are single characters, so snippet_tokens counts characters).
+
+    Every term must appear. Terms of three or more characters go through
+    the trigram index. Shorter ones (common in Korean, e.g. 결제) are
+    checked with LIKE on the documents the index found, or with a scan
+    when the query has no longer term.
+    """
+    long_terms, short_terms = split_terms(query)
+    if not long_terms and not short_terms:
+        return []
+
+    conditions, params = [], []
+    if long_terms:
+        # FTS5 needs the table's own name (not an alias) in MATCH and its functions
+        conditions.append(f'{TABLE} MATCH %s')
+        params.append(match_expression(long_terms))
+    for term in short_terms:
+        conditions.append(f"({TABLE}.title LIKE %s ESCAPE '\\' OR {TABLE}.body LIKE %s ESCAPE '\\')")
+        params += [like_pattern(term)] * 2
+    if kind is not None:
+        conditions.append(f'{TABLE}.kind = %s')
+        params.append(kind)
+    if current_status is not None:
+        conditions.append('p.current_status = %s')
+        params.append(current_status)
+
+    if long_terms:
+        columns = f"snippet({TABLE}, 4, %s, %s, '…', %s), bm25({TABLE}, 0, 0, 0, %s, %s) AS score"
+        column_params = [MARK_START, MARK_END, snippet_tokens, TITLE_WEIGHT, BODY_WEIGHT]
+        order_by = 'score'
+    else:
+        # Without MATCH there is no rank or snippet: newest first (a rowid
+        # scan that stops at the page), with the leading text
+        columns = f'substr({TABLE}.body, 1, %s), NULL'
+        column_params = [snippet_tokens]
+        order_by = f'{TABLE}.rowid DESC'
+
+    sql = f"""
+        SELECT {TABLE}.kind, {TABLE}.object_id, {TABLE}.position_id,
+               p.company_name, p.position_title, p.current_status, {TABLE}.title,
+               {columns}
+        FROM {TABLE}
+        JOIN applications_position AS p ON p.id = {TABLE}.position_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*column_params, *params, limit, offset])
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'kind': kind, 'id': object_id, 'position': position_id,
+            'company_name': company_name, 'position_title': position_title,
+            'current_status': current_status, 'title': title,
+            'snippet': highlight(snippet),
+            # bm25() is lower for better matches
+            'score': round(-score, 4) if long_terms else None,
+        }
+        for kind, object_id, position_id, company_name, position_title, current_status, title, snippet, score in rows
+    ]
@@ -1,26 +1,46 @@
 from rest_framework import serializers
-from .models import Position, ProcessNote, InterviewEvent
+from .fieldsets import SparseFieldsetMixin
+from .models import Position, ProcessNote, InterviewEvent, max_event_duration
 
 
-class ProcessNoteSerializer(serializers.ModelSerializer):
+class PositionSummarySerializer(serializers.ModelSerializer):
+    """Position header for ?expand=position on notes and events"""
+    class Meta:
+        model = Position
+        fields = ['id', 'company_name', 'position_title', 'current_status']
+
+
+class ProcessNoteSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ProcessNote
         fields = ['id', 'position', 'process_type', 'title', 'content', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
+        expandable_fields = {
+            'position': (PositionSummarySerializer, {'read_only': True}),
+        }
 
 
-class InterviewEventSerializer(serializers.ModelSerializer):
+class InterviewEventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = InterviewEvent
         fields = [
             'id', 'position', 'event_type', 'title', 'description',
-            'start_datetime', 'duration', 'meeting_type', 'location',
+            'start_datetime', 'duration', 'end_datetime', 'meeting_type', 'location',
             'meeting_link', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['end_datetime', 'created_at', 'updated_at']
+        expandable_fields = {
+            'position': (PositionSummarySerializer, {'read_only': True}),
+        }
+
+    def validate_duration(self, value):
+        # Calendar window queries only look this far back for events in progress
+        if value > max_event_duration():
+            raise serializers.ValidationError(f'Ensure this value is at most {max_event_duration()} minutes.')
+        return value
 
 
-class PositionSerializer(serializers.ModelSerializer):
+class PositionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     notes = ProcessNoteSerializer(many=True, read_only=True)
     events = InterviewEventSerializer(many=True, read_only=True)
 
@@ -29,12 +49,12 @@ class PositionSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'company_name', 'position_title', 'job_description',
             'recruiting_link', 'current_status', 'salary_range', 'location',
-            'application_date', 'created_at', 'updated_at', 'notes', 'events'
+            'application_date', 'snapshot', 'created_at', 'updated_at', 'notes', 'events'
         ]
         read_only_fields = ['created_at', 'updated_at']
 
 
-class PositionListSerializer(serializers.ModelSerializer):
+class PositionListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lighter serializer for list views"""
     class Meta:
         model = Position
@@ -42,3 +62,7 @@ class PositionListSerializer(serializers.ModelSerializer):
             'id', 'company_name', 'position_title', 'current_status',
             'location', 'application_date', 'updated_at'
         ]
+        expandable_fields = {
+            'notes': (ProcessNoteSerializer, {'many': True, 'read_only': True}),
+            'events': (InterviewEventSerializer, {'many': True, 'read_only': True}),
+        }
@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .models import InterviewEvent, Position, ProcessNote
+from . import search
+from .response_cache import invalidate
+from .stats import invalidate_stats
+
+
+# Sent once per chunk by bulk writes (applications.bulk), which skip save()
+# and its signals, with the created rows, the updated rows, the fields
+# written to them and, by pk, each updated row's state before the write.
+bulk_saved = Signal()
+
+
+@receiver([post_save, post_delete, bulk_saved], sender=Position)
+@receiver([post_save, post_delete, bulk_saved], sender=InterviewEvent)
+def invalidate_dashboard_stats(sender, **kwargs):
+    # After commit, so a concurrent request cannot cache the old rows again
+    transaction.on_commit(invalidate_stats)
+
+
+@receiver([post_save, post_delete], sender=Position)
+def invalidate_position_responses(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate(f'position:{instance.pk}', 'positions'))
+
+
+@receiver(bulk_saved, sender=Position)
+def invalidate_bulk_position_responses(sender, created, updated, **kwargs):
+    scopes = ['positions'] + [f'position:{position.pk}' for position in [*created, *updated]]
+    transaction.on_commit(lambda: invalidate(*scopes))
+
+
+# Response cache scopes of a position's children: (table scope, row scope)
+CHILD_SCOPES = {ProcessNote: ('notes', 'note'), InterviewEvent: ('events', 'event')}
+
+
+@receiver(pre_save, sender=ProcessNote)
+@receiver(pre_save, sender=InterviewEvent)
+def remember_previous_position(sender, instance, **kwargs):
+    # A note or event moved to another position leaves the old one stale
+    # too. Rows loaded from the database know their position already
+    # (TracksLoadedPosition); only others are looked up.
+    if instance.pk is None:
+        instance._loaded_position_id = None
+    elif getattr(instance, '_loaded_position_id', None) is None:
+        instance._loaded_position_id = (
+            sender.objects.filter(pk=instance.pk).values_list('position_id', flat=True).first()
+        )
+
+
+@receiver([post_save, post_delete], sender=ProcessNote)
+@receiver([post_save, post_delete], sender=InterviewEvent)
+def invalidate_child_responses(sender, instance, **kwargs):
+    table, item = CHILD_SCOPES[sender]
+    scopes = [table, f'{item}:{instance.pk}']
+    for position_id in {instance.position_id, getattr(instance, '_loaded_position_id', None)} - {None}:
+        # The position's detail nests its notes and events
+        scopes += [f'{table}:{position_id}', f'position:{position_id}']
+    # The next save moves it from where it is now
+    instance._loaded_position_id = instance.position_id
+    transaction.on_commit(lambda: invalidate(*scopes))
+
+
+@receiver(bulk_saved, sender=ProcessNote)
+@receiver(bulk_saved, sender=InterviewEvent)
+def invalidate_bulk_child_responses(sender, created, updated, previous, **kwargs):
+    table, item = CHILD_SCOPES[sender]
+    scopes = {table}
+    for instance in [*created, *updated]:
+        scopes.add(f'{item}:{instance.pk}')
+        previous_position_id = previous[instance.pk].position_id if instance.pk in previous else None
+        for position_id in {instance.position_id, previous_position_id} - {None}:
+            scopes.update([f'{table}:{position_id}', f'position:{position_id}'])
+    transaction.on_commit(lambda: invalidate(*scopes))
+
+
+# Position fields that make up its search document
+SEARCH_FIELDS = {'company_name', 'position_title', 'job_description'}
+
+
+@receiver(post_save, sender=Position)
+def index_position(sender, instance, update_fields=None, **kwargs):
+    # In the same transaction as the row, so the index cannot drift from it
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        search.index_positions([instance])
+
+
+@receiver(post_save, sender=ProcessNote)
+def index_note(sender, instance, **kwargs):
+    search.index_notes([instance])
+
+
+@receiver(bulk_saved, sender=Position)
+def index_bulk_positions(sender, created, updated, update_fields, **kwargs):
+    search.index_positions([*created, *updated] if SEARCH_FIELDS & set(update_fields) else created)
+
+
+@receiver(bulk_saved, sender=ProcessNote)
+def index_bulk_notes(sender, created, updated, **kwargs):
+    search.index_notes([*created, *updated])
+
+
+@receiver(post_delete, sender=Position)
+def unindex_position(sender, instance, **kwargs):
+    search.remove(search.POSITION, [instance.pk])
+
+
+@receiver(post_delete, sender=ProcessNote)
+def unindex_note(sender, instance, **kwargs):
+    search.remove(search.NOTE, [instance.pk])
@@ -0,0 +1,150 @@
+"""
+Registry of per-site extraction profiles, keyed by hostname.
+
+A URL on a known job board is extracted with only that board's selectors;
+unknown hosts get the generic profile, which tries every selector. Extra
+profiles can be registered from settings.JOB_EXTRACTOR_PROFILES, a list of
+dotted paths to SiteProfile instances (a profile for an already registered
+hostname replaces the built-in one).
+"""
+import json
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .extraction import (
+    COMPANY_RULES, DESC_CONTAINER_TAGS, GENERIC_PROFILE, LOCATION_RULES, TITLE_RULES,
+    SiteProfile, attr_equals, class_contains, class_equals,
+)
+
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'site_fixtures'
+
+
+WANTED = SiteProfile(
+    'wanted',
+    hostnames=['wanted.co.kr'],
+    desc_rules=[
+        (DESC_CONTAINER_TAGS, class_contains('JobDescription_JobDescription', case_sensitive=True)),
+        (DESC_CONTAINER_TAGS, attr_equals('data-cy', 'job-description')),
+    ],
+    fixture='wanted',
+)
+
+SARAMIN = SiteProfile(
+    'saramin',
+    hostnames=['saramin.co.kr'],
+    desc_rules=[
+        (DESC_CONTAINER_TAGS, class_equals('user_content')),
+        (DESC_CONTAINER_TAGS, class_equals('content')),
+    ],
+    company_rules=[(('a',), class_equals('company'))] + COMPANY_RULES,
+    title_rules=[(('h1',), class_equals('tit_job'))] + TITLE_RULES,
+    location_rules=[(('dd',), class_equals('work_place'))] + LOCATION_RULES,
+    fixture='saramin',
+)
+
+JOBKOREA = SiteProfile(
+    'jobkorea',
+    hostnames=['jobkorea.co.kr'],
+    desc_rules=[
+        (DESC_CONTAINER_TAGS, class_equals('sumBx')),
+        (DESC_CONTAINER_TAGS, class_equals('jd-section')),
+    ],
+    company_rules=[(('span',), class_equals('coName'))] + COMPANY_RULES,
+    location_rules=[(('dd',), class_equals('tbAddr'))] + LOCATION_RULES,
+    fixture='jobkorea',
+)
+
+LINKEDIN = SiteProfile(
+    'linkedin',
+    hostnames=['linkedin.com'],
+    desc_rules=[
+        (DESC_CONTAINER_TAGS, class_equals('show-more-less-html__markup')),
+    ],
+    # The first top-card flavor is the company, the bulleted one the location
+    company_rules=[(('span', 'a'), class_equals('topcard__flavor'))] + COMPANY_RULES,
+    title_rules=[(('h1',), class_equals('top-card-layout__title'))] + TITLE_RULES,
+    location_rules=[(('span',), class_equals('topcard__flavor--bullet'))] + LOCATION_RULES,
+    fixture='linkedin',
+)
+
+INDEED = SiteProfile(
+    'indeed',
+    hostnames=['indeed.com'],
+    desc_rules=[
+        (DESC_CONTAINER_TAGS, attr_equals('id', 'jobDescriptionText')),
+    ],
+    location_rules=[(('div',), class_equals('jobsearch-JobInfoHeader-location'))] + LOCATION_RULES,
+    fixture='indeed',
+)
+
+BUILTIN_PROFILES = [WANTED, SARAMIN, JOBKOREA, LINKEDIN, INDEED]
+
+
+class SiteRegistry:
+    """Hostname -> SiteProfile lookup that also matches subdomains"""
+
+    def __init__(self, profiles=(), default=GENERIC_PROFILE):
+        self.default = default
+        self._by_host = {}
+        for profile in profiles:
+            self.register(profile)
+
+    def register(self, profile):
+        for hostname in profile.hostnames:
+            self._by_host[hostname.lower()] = profile
+
+    @property
+    def profiles(self):
+        unique = []
+        for profile in self._by_host.values():
+            if profile not in unique:
+                unique.append(profile)
+        return unique
+
+    def for_host(self, host):
+        labels = (host or '').lower().rstrip('.').split('.')
+        # www.saramin.co.kr -> saramin.co.kr -> co.kr -> kr
+        for start in range(len(labels)):
+            profile = self._by_host.get('.'.join(labels[start:]))
+            if profile is not None:
+                return profile
+        return self.default
+
+    def for_url(self, url):
+        if not url:
+            return self.default
+        return self.for_host(urlsplit(url).hostname)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide registry with built-in and configured profiles"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = SiteRegistry(BUILTIN_PROFILES)
+                for path in getattr(settings, 'JOB_EXTRACTOR_PROFILES', []):
+                    registry.register(import_string(path))
+                _registry = registry
+    return _registry
+
+
+def get_profile(url):
+    """Return the extraction profile for a URL (the generic one for unknown hosts)"""
+    return get_registry().for_url(url)
+
+
+def load_fixture(profile):
+    """Return (url, html bytes, expected fields) for a profile's fixture page"""
+    html = (FIXTURE_DIR / f'{profile.fixture}.html').read_bytes()
+    spec = json.loads((FIXTURE_DIR / f'{profile.fixture}.json').read_text(encoding='utf-8'))
+    return spec['url'], html, spec['expected']
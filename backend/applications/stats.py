@@ -0,0 +1,66 @@
+"""
+Dashboard aggregates, computed on the server and cached.
+
+Status counts come from one grouped query over Position.current_status and
+the upcoming event count from one window query over InterviewEvent. The
+result is kept in Django's default cache until a Position or
+InterviewEvent is saved or deleted (see applications.signals), the
+earliest upcoming event ends, or DASHBOARD_STATS_TTL runs out.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import InterviewEvent, Position
+from .serializers import InterviewEventSerializer, PositionListSerializer
+
+
+CACHE_KEY = 'applications:dashboard_stats'
+
+INTERVIEWING_STATUSES = ['coding_test', 'technical_interview', 'cultural_fit', 'final_interview']
+
+# Rows listed alongside the counts, so the dashboard needs a single request
+RECENT_POSITIONS = 5
+NEXT_EVENTS = 5
+
+
+def compute_stats(now=None):
+    """Counts per status, the interviewing total and upcoming events; returns (stats, valid_until)"""
+    now = now or timezone.now()
+
+    by_status = dict.fromkeys((status for status, _ in Position.PROCESS_STATUS_CHOICES), 0)
+    for row in Position.objects.order_by().values('current_status').annotate(count=Count('id')):
+        by_status[row['current_status']] = row['count']
+
+    # Not yet finished, so interviews in progress still show up
+    upcoming = InterviewEvent.objects.overlapping(now)
+    events = upcoming.order_by().aggregate(count=Count('id'), first_end=Min('end_datetime'))
+
+    stats = {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'interviewing': sum(by_status[status] for status in INTERVIEWING_STATUSES),
+        'upcoming_events': events['count'],
+        'recent_positions': PositionListSerializer(Position.objects.all()[:RECENT_POSITIONS], many=True).data,
+        'next_events': InterviewEventSerializer(upcoming[:NEXT_EVENTS], many=True).data,
+        'generated_at': now,
+    }
+    return stats, events['first_end']
+
+
+def get_stats():
+    stats = cache.get(CACHE_KEY)
+    if stats is None:
+        now = timezone.now()
+        stats, valid_until = compute_stats(now)
+        ttl = getattr(settings, 'DASHBOARD_STATS_TTL', 300)
+        if valid_until is not None:
+            # The upcoming count drops when the earliest event ends
+            ttl = min(ttl, max(1, int((valid_until - now).total_seconds()) + 1))
+        cache.set(CACHE_KEY, stats, timeout=ttl)
+    return stats
+
+
+def invalidate_stats():
+    cache.delete(CACHE_KEY)
@@ -0,0 +1,130 @@
+"""
+Streaming, size-capped download of job pages.
+
+The body is read in chunks up to a byte budget. Each chunk is decoded with
+an incremental decoder and fed to a small tag scanner that notices when the
+__NEXT_DATA__ script has been fully received. When that payload holds the
+whole posting the rest of the page is never read: extraction then ignores
+the DOM, so the result is the same as with the full body. Pages without it
+are read to the end, since salary, location and company often follow the
+description.
+"""
+import codecs
+import re
+
+from requests.utils import get_encoding_from_headers
+
+
+CHUNK_SIZE = 64 * 1024
+
+META_CHARSET = re.compile(rb'''<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_\-]+)''', re.IGNORECASE)
+
+TAG = re.compile(r'<(/?)([A-Za-z][A-Za-z0-9]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+RAW_TEXT_END = {name: re.compile(f'</{name}', re.IGNORECASE) for name in ('script', 'style')}
+NEXT_DATA_ID = re.compile(r'''\bid\s*=\s*["']?__NEXT_DATA__\b''', re.IGNORECASE)
+
+
+def sniff_encoding(headers, first_chunk):
+    """Charset from the Content-Type header, else a <meta charset>, else UTF-8"""
+    content_type = headers.get('Content-Type', '')
+    if 'charset' in content_type.lower():
+        encoding = get_encoding_from_headers(headers)
+    else:
+        match = META_CHARSET.search(first_chunk[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    return encoding
+
+
+class CompletionWatcher:
+    """
+    Incremental tag scanner fed with decoded text chunks.
+
+    done becomes True once the __NEXT_DATA__ script has been closed.
+    """
+
+    def __init__(self):
+        self.done = False
+        self._pending = ''
+        self._raw_text_end = None
+        self._raw_text_is_next_data = False
+
+    def feed(self, text):
+        if self.done:
+            return True
+
+        buffer = self._pending + text
+        position = 0
+        while not self.done:
+            if self._raw_text_end is not None:
+                end = self._raw_text_end.search(buffer, position)
+                if end is None:
+                    # Keep enough of the tail to spot a split closing tag
+                    position = max(position, len(buffer) - len(self._raw_text_end.pattern))
+                    break
+                position = end.end()
+                self._raw_text_end = None
+                if self._raw_text_is_next_data:
+                    self.done = True
+                continue
+
+            match = TAG.search(buffer, position)
+            if not match:
+                start = buffer.find('<', position)
+                position = len(buffer) if start == -1 else start
+                break
+            position = match.end()
+            name = match.group(2).lower()
+            if match.group(1) != '/' and name in RAW_TEXT_END:
+                # Skip script and style bodies, which may contain '<'
+                self._raw_text_end = RAW_TEXT_END[name]
+                self._raw_text_is_next_data = name == 'script' and bool(NEXT_DATA_ID.search(match.group(3)))
+
+        self._pending = buffer[position:] if not self.done else ''
+        return self.done
+
+
+def read_body(response, max_bytes, early_stop=True, is_complete=None):
+    """
+    Read a streamed requests response into bytes.
+
+    Stops after max_bytes, or (with early_stop) once the __NEXT_DATA__
+    script has been received and is_complete(content so far), when given,
+    is true; otherwise the rest of the page is read. Returns
+    (content, truncated).
+    """
+    chunks = []
+    received = 0
+    truncated = False
+    decoder = None
+    watcher = CompletionWatcher() if early_stop else None
+
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if not chunk:
+            continue
+
+        if received + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - received]
+            truncated = True
+
+        chunks.append(chunk)
+        received += len(chunk)
+
+        if watcher is not None:
+            if decoder is None:
+                encoding = sniff_encoding(response.headers, chunk)
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            if watcher.feed(decoder.decode(chunk)):
+                if is_complete is None or is_complete(b''.join(chunks)):
+                    truncated = True
+                    break
+                # The payload is not the posting: the DOM is needed after all
+                watcher = None
+
+        if received >= max_bytes:
+            break
+
+    return b''.join(chunks), truncated
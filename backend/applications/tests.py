@@ -1,3 +1,1541 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from bs4 import BeautifulSoup
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from . import export, fetch_cache, host_scheduler, parse_pool, search, utils
+from .bench.corpus import field_accuracy, load_corpus, serve_corpus
+from .bench.legacy import legacy_extract_text_with_formatting, legacy_largest_text_block, legacy_parse_job_page
+from .bench.pages import ENGLISH_LINES, KOREAN_LINES, generate_job_page, generate_nested_page
+from .bench.server import StandInServer
+from .bench.stages import FIELDS, StageRecorder, run_stages
+from .extraction import largest_text_block
+from .fieldsets import optimize_queryset
+from .fingerprints import MAX_DISTANCE, bands, fingerprint_fields, hamming_distance, page_hash, simhash, to_signed
+from .fetch_cache import CachedPage, DjangoFetchCache, InMemoryFetchCache
+from .jobs import ExtractionQueue, QueueFull
+from .models import InterviewEvent, Position, PostingSnapshot, ProcessNote
+from .response_cache import get_response_cache
+from .serializers import PositionListSerializer
+from .site_profiles import SARAMIN, get_registry, load_fixture
+from .streaming import CHUNK_SIZE, read_body
+from .utils import extract_text_with_formatting, next_data_complete, parse_job_page
+
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'api': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-api'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FetchCacheTests(SimpleTestCase):
+    def test_in_memory_clear(self):
+        cache = InMemoryFetchCache(max_entries=2)
+        cache.set('a', CachedPage(b'a'))
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+
+    def test_django_clear_drops_only_fetch_entries(self):
+        cache = DjangoFetchCache()
+        cache.set('https://example.com/', CachedPage(b'page', etag='"1"'))
+        self.assertEqual(cache.get('https://example.com/').etag, '"1"')
+        cache.cache.set('unrelated', 'kept')
+
+        cache.clear()
+        self.assertIsNone(cache.get('https://example.com/'))
+        self.assertEqual(cache.cache.get('unrelated'), 'kept')
+
+        cache.set('https://example.com/', CachedPage(b'page again'))
+        self.assertEqual(cache.get('https://example.com/').content, b'page again')
+
+
+class FakeStreamedResponse:
+    """Just enough of a streamed requests response for read_body() and _download_once()"""
+
+    def __init__(self, content, headers=None, chunk_size=None, status_code=200):
+        self.content = content
+        self.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8', **(headers or {})})
+        self.chunk_size = chunk_size
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error', response=self)
+
+    def iter_content(self, chunk_size):
+        chunk_size = self.chunk_size or chunk_size
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+def read_page(content, early_stop=True, chunk_size=None):
+    return read_body(FakeStreamedResponse(content, chunk_size=chunk_size), 5 * 1024 * 1024,
+                     early_stop=early_stop, is_complete=next_data_complete)
+
+
+@override_settings(
+    JOB_FETCH_CACHE={'BACKEND': 'applications.fetch_cache.InMemoryFetchCache', 'TTL': 60, 'MAX_ENTRIES': 2},
+    JOB_FETCH_SCHEDULER=None,
+)
+class FetchPostingCacheTests(SimpleTestCase):
+    URL = 'https://www.saramin.co.kr/job/1'
+    VALIDATORS = {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+
+    def setUp(self):
+        fetch_cache._fetch_cache = None
+        self.addCleanup(setattr, fetch_cache, '_fetch_cache', None)
+        self.session = mock.Mock()
+        patcher = mock.patch('applications.utils.get_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def respond(self, *responses):
+        self.session.get.side_effect = list(responses)
+
+    def sent_headers(self):
+        return self.session.get.call_args.kwargs['headers'] or {}
+
+    def test_fresh_entries_skip_the_network(self):
+        self.respond(FakeStreamedResponse(b'<html>v1</html>', self.VALIDATORS))
+        self.assertEqual(utils.fetch_page(self.URL), b'<html>v1</html>')
+        # Tracking parameters do not make a new entry
+        self.assertEqual(utils.fetch_page(self.URL + '?utm_source=mail'), b'<html>v1</html>')
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual(fetch_cache.get_fetch_cache().stats()['hits'], 1)
+
+    def test_stale_entries_are_revalidated(self):
+        self.respond(
+            FakeStreamedResponse(b'<html>v1</html>', self.VALIDATORS),
+            FakeStreamedResponse(b'', status_code=304),
+        )
+        utils.fetch_page(self.URL)
+        cache = fetch_cache.get_fetch_cache()
+        cache.get(fetch_cache.normalize_url(self.URL)).stored_at -= 61
+
+        self.assertEqual(utils.fetch_page(self.URL), b'<html>v1</html>')
+        self.assertEqual(self.sent_headers(), {
+            'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT',
+        })
+        self.assertEqual(cache.stats()['revalidated'], 1)
+        # The 304 restarts the entry's freshness
+        self.assertTrue(cache.get(fetch_cache.normalize_url(self.URL)).is_fresh(cache.ttl))
+
+    def test_changed_pages_replace_the_entry(self):
+        self.respond(
+            FakeStreamedResponse(b'<html>v1</html>', self.VALIDATORS),
+            FakeStreamedResponse(b'<html>v2</html>', {'ETag': '"v2"'}),
+        )
+        utils.fetch_page(self.URL)
+        cache = fetch_cache.get_fetch_cache()
+        cache.get(fetch_cache.normalize_url(self.URL)).stored_at -= 61
+        self.assertEqual(utils.fetch_page(self.URL), b'<html>v2</html>')
+        self.assertEqual(cache.get(fetch_cache.normalize_url(self.URL)).etag, '"v2"')
+
+    def test_unchanged_checks_revalidate_fresh_entries(self):
+        v1, v2 = (b'<html><body><div class="job-description"><p>%s</p></div></body></html>' % v for v in (b'v1', b'v2'))
+        self.respond(
+            FakeStreamedResponse(v1, self.VALIDATORS),
+            FakeStreamedResponse(b'', status_code=304),
+            FakeStreamedResponse(v2, {'ETag': '"v2"'}),
+        )
+        utils.fetch_page(self.URL)
+
+        # Still fresh, but the check asks the site rather than the cache
+        self.assertEqual(utils.extract_job_description(self.URL, unchanged_hash=page_hash(v1)), {'unchanged': True})
+        self.assertEqual(self.sent_headers()['If-None-Match'], '"v1"')
+        result = utils.extract_job_description(self.URL, unchanged_hash=page_hash(v1))
+        self.assertEqual(result['job_description'], 'v2')
+        self.assertEqual(self.session.get.call_count, 3)
+
+    def test_no_store_and_no_cache_are_not_kept(self):
+        for cache_control in ('no-store', 'private, no-cache'):
+            with self.subTest(cache_control=cache_control):
+                self.respond(
+                    FakeStreamedResponse(b'<html>a</html>', {'Cache-Control': cache_control}),
+                    FakeStreamedResponse(b'<html>b</html>', {'Cache-Control': cache_control}),
+                )
+                self.assertEqual(utils.fetch_page(self.URL), b'<html>a</html>')
+                self.assertEqual(utils.fetch_page(self.URL), b'<html>b</html>')
+                self.assertEqual(self.sent_headers(), {})
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = InMemoryFetchCache(max_entries=2)
+        cache.set('a', CachedPage(b'a'))
+        cache.set('b', CachedPage(b'b'))
+        cache.get('a')
+        cache.set('c', CachedPage(b'c'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual([cache.get(key).content for key in ('a', 'c')], [b'a', b'c'])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_django_cache_rejects_max_entries(self):
+        with self.assertRaises(ImproperlyConfigured):
+            DjangoFetchCache(max_entries=256)
+        config = {'BACKEND': 'applications.fetch_cache.DjangoFetchCache', 'TTL': 60}
+        with override_settings(JOB_FETCH_CACHE=config):
+            self.assertIsNone(fetch_cache.get_fetch_cache().stats()['max_entries'])
+
+
+class StreamingDownloadTests(SimpleTestCase):
+    def test_fields_after_the_description_are_kept(self):
+        # Description first, then more than a chunk of markup, then the
+        # location and salary the extractors still need
+        html = (
+            '<html><head><title>Backend Engineer</title></head><body>'
+            '<div data-cy="job-description"><p>Python 백엔드 개발자를 찾습니다. Django REST API 설계 경험.</p></div>'
+            + '<div class="filler">' + 'x' * (CHUNK_SIZE + 1000) + '</div>'
+            + '<span class="location">서울 강남구</span><p>연봉 5000만원 ~ 7000만원</p>'
+            '</body></html>'
+        ).encode()
+
+        content, truncated = read_page(html)
+        self.assertEqual(content, html)
+        self.assertFalse(truncated)
+        job_info = parse_job_page(content, 'https://www.wanted.co.kr/wd/1')
+        self.assertEqual(job_info, parse_job_page(html, 'https://www.wanted.co.kr/wd/1'))
+        self.assertIn('서울', job_info['location'])
+        self.assertIn('5000', job_info['salary_range'])
+
+    def test_stops_after_a_complete_next_data_payload(self):
+        next_data = {'props': {'pageProps': {'initialData': {
+            'company': {'company_name': 'Tech Corp'}, 'position': 'Backend Engineer',
+            'intro': 'Python 백엔드 개발자', 'main_tasks': 'API 설계',
+        }}}}
+        html = (
+            '<html><body><script id="__NEXT_DATA__" type="application/json">'
+            + json.dumps(next_data, ensure_ascii=False)
+            + '</script>' + '<div>' + 'x' * (3 * CHUNK_SIZE) + '</div></body></html>'
+        ).encode()
+
+        content, truncated = read_page(html)
+        self.assertTrue(truncated)
+        self.assertLess(len(content), len(html))
+        self.assertEqual(parse_job_page(content), parse_job_page(html))
+
+    def test_reads_on_when_next_data_is_not_a_posting(self):
+        html = (
+            '<html><body><script id="__NEXT_DATA__" type="application/json">{"props": {}}</script>'
+            + '<div>' + 'x' * (2 * CHUNK_SIZE) + '</div>'
+            '<div data-cy="job-description"><p>Python 백엔드 개발자를 찾습니다. Django REST API 설계 경험.</p></div>'
+            '</body></html>'
+        ).encode()
+
+        content, truncated = read_page(html)
+        self.assertEqual(content, html)
+        self.assertFalse(truncated)
+
+
+class SiteProfileFixtureTests(SimpleTestCase):
+    """Every built-in site profile against its page in site_fixtures/"""
+
+    def fixtures(self):
+        profiles = [profile for profile in get_registry().profiles if profile.fixture]
+        self.assertTrue(profiles)
+        for profile in profiles:
+            yield (profile, *load_fixture(profile))
+
+    def assertFields(self, job_info, expected):
+        for field, value in expected.items():
+            self.assertEqual(job_info.get(field), value, field)
+
+    def test_fixture_urls_resolve_to_their_profile(self):
+        for profile, url, _, _ in self.fixtures():
+            with self.subTest(profile=profile.name):
+                self.assertIs(get_registry().for_url(url), profile)
+
+    def test_fixtures_extract_expected_fields(self):
+        for profile, url, html, expected in self.fixtures():
+            with self.subTest(profile=profile.name):
+                self.assertFields(parse_job_page(html, url), expected)
+
+    def test_streamed_download_keeps_every_field(self):
+        # Small chunks, so a download ending at the description would lose
+        # the fields that follow it
+        for profile, url, html, expected in self.fixtures():
+            with self.subTest(profile=profile.name):
+                content, _ = read_page(html, chunk_size=256)
+                self.assertFields(parse_job_page(content, url), expected)
+
+    def test_fields_after_each_boards_description_are_kept(self):
+        # Each board's description container first, then its location
+        # element and a salary line, as many real postings are laid out
+        layouts = {
+            'wanted': ('<div data-cy="job-description">', '<span class="location">서울 송파구</span>'),
+            'saramin': ('<div class="user_content">', '<dl><dd class="work_place">서울 송파구</dd></dl>'),
+            'jobkorea': ('<div class="sumBx">', '<dl><dd class="tbAddr">서울 송파구</dd></dl>'),
+            'linkedin': ('<div class="show-more-less-html__markup">',
+                         '<span class="topcard__flavor--bullet">서울 송파구</span>'),
+            'indeed': ('<div id="jobDescriptionText">',
+                       '<div class="jobsearch-JobInfoHeader-location">서울 송파구</div>'),
+        }
+        for profile, url, _, _ in self.fixtures():
+            with self.subTest(profile=profile.name):
+                container, location = layouts[profile.name]
+                html = (
+                    f'<html><head><title>Backend Engineer</title></head><body>{container}'
+                    '<p>Python 백엔드 개발자를 찾습니다. Django REST API 설계와 운영 경험이 있는 분.</p></div>'
+                    f'{location}<p>연봉 5,000만원 ~ 7,000만원</p></body></html>'
+                ).encode()
+                content, _ = read_page(html, chunk_size=256)
+                job_info = parse_job_page(content, url)
+                self.assertEqual(job_info['location'], '서울 송파구')
+                self.assertEqual(job_info['salary_range'], '5,000만원 ~ 7,000만원')
+
+
+class ExtractionQueueTests(SimpleTestCase):
+    def test_submissions_beyond_max_depth_are_refused(self):
+        started, release = threading.Event(), threading.Event()
+
+        def extract(url, snapshot=False):
+            started.set()
+            release.wait(5)
+            return {'url': url}
+
+        queue = ExtractionQueue(extract, max_workers=1, max_depth=1)
+        try:
+            running, _ = queue.submit('https://example.com/1')
+            self.assertTrue(started.wait(5))
+            waiting, created = queue.submit('https://example.com/2')
+            self.assertTrue(created)
+
+            with self.assertRaises(QueueFull):
+                queue.submit('https://example.com/3')
+            # A URL already in flight still returns its job
+            self.assertEqual(queue.submit('https://example.com/2'), (waiting, False))
+            self.assertEqual(queue.metrics()['rejected'], 1)
+        finally:
+            release.set()
+            queue._executor.shutdown(wait=True)
+        self.assertEqual(queue.metrics()['succeeded'], 2)
+
+
+class FetchJobDescriptionAsyncTests(TestCase):
+    extracted = {'company_name': 'Tech Corp', 'job_description': 'Python'}
+
+    def fetch_jd(self, data, **kwargs):
+        return self.client.post('/api/positions/fetch_jd/', data, **kwargs)
+
+    def test_false_values_run_synchronously(self):
+        with mock.patch('applications.views.extract_job_description', return_value=dict(self.extracted)), \
+                mock.patch('applications.views.get_queue') as get_queue:
+            for value in ('false', '0', 'off', False):
+                with self.subTest(value=value):
+                    response = self.fetch_jd(
+                        json.dumps({'url': 'https://example.com/1', 'async': value}), content_type='application/json'
+                    )
+                    self.assertEqual(response.status_code, 200)
+            # Form data sends every value as a string
+            response = self.fetch_jd({'url': 'https://example.com/1', 'async': 'false'})
+            self.assertEqual(response.status_code, 200)
+            get_queue.assert_not_called()
+
+    def test_true_values_queue_the_job(self):
+        queue = ExtractionQueue(lambda url, snapshot=False: dict(self.extracted), max_workers=1)
+        with mock.patch('applications.views.get_queue', return_value=queue):
+            response = self.fetch_jd({'url': 'https://example.com/1', 'async': 'true'})
+        queue._executor.shutdown(wait=True)
+        self.assertEqual(response.status_code, 202)
+
+    def test_invalid_flag_is_rejected(self):
+        response = self.fetch_jd({'url': 'https://example.com/1', 'async': 'maybe'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('async', response.json())
+
+    def test_full_queue_answers_503(self):
+        queue = mock.Mock()
+        queue.submit.side_effect = QueueFull('1000 jobs are already waiting')
+        with mock.patch('applications.views.get_queue', return_value=queue):
+            response = self.fetch_jd({'url': 'https://example.com/1', 'async': True},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
+
+
+class FetchJobDescriptionBatchTests(TestCase):
+    def fetch_jd_batch(self, urls):
+        return self.client.post('/api/positions/fetch_jd_batch/', {'urls': urls}, content_type='application/json')
+
+    def test_one_result_per_url_in_input_order(self):
+        started = threading.Barrier(3, timeout=5)
+
+        def extract(url, snapshot=False):
+            # Every fetch runs at once; later URLs finish first
+            started.wait()
+            time.sleep(0.01 * (3 - int(url[-1])))
+            if url.endswith('2'):
+                raise ValueError('Failed to fetch URL: 404 Client Error')
+            return {'company_name': f'Company {url[-1]}'}
+
+        urls = ['https://example.com/jobs/0', 'https://example.com/jobs/1', 'https://example.com/jobs/2']
+        with mock.patch('applications.utils.extract_job_description', side_effect=extract):
+            response = self.fetch_jd_batch(urls)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertFalse(body['success'])
+        self.assertEqual(body['message'], 'Extracted 2 of 3 job postings')
+        self.assertEqual([result['url'] for result in body['results']], urls)
+        self.assertEqual(body['results'][0]['data'], {'company_name': 'Company 0', 'recruiting_link': urls[0]})
+        self.assertEqual(body['results'][2], {
+            'url': urls[2], 'success': False, 'error': 'Failed to fetch URL: 404 Client Error',
+        })
+
+    @override_settings(JOB_FETCH_BATCH_LIMIT=2)
+    def test_invalid_batches_are_rejected(self):
+        for urls in (None, [], ['https://example.com/1', ''], ['https://example.com/1'] * 3):
+            with self.subTest(urls=urls):
+                self.assertEqual(self.fetch_jd_batch(urls).status_code, 400)
+
+
+@override_settings(JOB_FETCH_CACHE=None, JOB_FETCH_SCHEDULER=None)
+class SnapshotStorageTests(TestCase):
+    """fetch_jd keeps the fetched page only when asked to"""
+
+    def setUp(self):
+        self.url, self.page, _ = load_fixture(SARAMIN)
+        patcher = mock.patch('applications.utils.fetch_posting', return_value=(self.page, {}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, path, data):
+        return self.client.post(path, data, content_type='application/json')
+
+    def test_previews_store_no_snapshot(self):
+        self.assertEqual(self.post('/api/positions/fetch_jd/', {'url': self.url}).status_code, 200)
+        self.assertFalse(PostingSnapshot.objects.exists())
+
+    def test_snapshot_flag_stores_the_page(self):
+        response = self.post('/api/positions/fetch_jd/', {'url': self.url, 'snapshot': True})
+        snapshot = PostingSnapshot.objects.get()
+        self.assertEqual(response.json()['data']['snapshot'], snapshot.pk)
+        self.assertEqual(snapshot.raw_content, self.page)
+
+    def test_batch_passes_the_flag_on(self):
+        # Batch fetches run on other threads, outside this test's transaction
+        with mock.patch('applications.utils.extract_job_description', return_value={}) as extract:
+            self.post('/api/positions/fetch_jd_batch/', {'urls': [self.url]})
+            self.post('/api/positions/fetch_jd_batch/', {'urls': [self.url], 'snapshot': True})
+        self.assertEqual(extract.call_args_list, [
+            mock.call(self.url, snapshot=False), mock.call(self.url, snapshot=True),
+        ])
+
+    def test_async_jobs_pass_the_flag_on(self):
+        queue = mock.Mock()
+        queue.submit.return_value = (mock.Mock(id='1', status='queued'), True)
+        with mock.patch('applications.views.get_queue', return_value=queue):
+            self.post('/api/positions/fetch_jd/', {'url': self.url, 'async': True})
+            self.post('/api/positions/fetch_jd/', {'url': self.url, 'async': True, 'snapshot': True})
+        self.assertEqual(queue.submit.call_args_list, [
+            mock.call(self.url, snapshot=False), mock.call(self.url, snapshot=True),
+        ])
+
+
+@override_settings(JOB_FETCH_CACHE=None, JOB_FETCH_SCHEDULER=None)
+class ExtractionCorpusTests(SimpleTestCase):
+    """The offline corpus of benchmark_suite, as a pass/fail accuracy check"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The generated pages keep their structure at a fraction of the size
+        cls.pages = load_corpus(max_page_bytes=100_000)
+
+    def test_every_expected_field_is_extracted(self):
+        with serve_corpus(self.pages):
+            for page in self.pages:
+                with self.subTest(page=page['name']):
+                    result = utils.extract_job_description(page['url'])
+                    failed = [field for field, ok in field_accuracy(result, page['expected']).items() if not ok]
+                    self.assertEqual(failed, [], {field: result.get(field) for field in failed})
+
+    def test_staged_run_matches_the_pipeline(self):
+        # benchmark_suite times run_stages(), so it must extract the same thing
+        with serve_corpus(self.pages):
+            for page in self.pages:
+                with self.subTest(page=page['name']):
+                    result = run_stages(page['url'], StageRecorder())
+                    self.assertEqual(result, utils.extract_job_description(page['url']))
+
+
+class ExtractionEquivalenceTests(SimpleTestCase):
+    """The optimized extraction paths against the originals kept in bench.legacy"""
+
+    def pages(self):
+        for profile in get_registry().profiles:
+            if profile.fixture:
+                yield f'fixture:{profile.name}', load_fixture(profile)[1]
+        for language in ('ko', 'en', 'mixed'):
+            yield f'synthetic:{language}', generate_job_page(200_000, depth=10, language=language)
+
+    def test_streaming_formatter_matches_the_original(self):
+        for name, html in self.pages():
+            with self.subTest(page=name):
+                element = BeautifulSoup(html, 'html.parser').body
+                self.assertEqual(extract_text_with_formatting(element), legacy_extract_text_with_formatting(element))
+
+    def test_single_pass_extraction_matches_the_per_field_path(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                page = generate_job_page(300_000, depth=40, seed=seed)
+                engine = parse_job_page(page)
+                self.assertEqual({field: engine[field] for field in FIELDS}, legacy_parse_job_page(page))
+
+    def test_bottom_up_fallback_picks_the_same_block(self):
+        for depth in (50, 200):
+            with self.subTest(depth=depth):
+                soup = BeautifulSoup(generate_nested_page(depth), 'html.parser')
+                containers = soup.find_all(['div', 'section', 'article'])
+                self.assertIs(largest_text_block(soup, containers, 'length'), legacy_largest_text_block(containers))
+
+
+class ParsePoolTests(SimpleTestCase):
+    def setUp(self):
+        parse_pool.shutdown_pool()
+        self.addCleanup(parse_pool.shutdown_pool)
+        self.url, self.page, _ = load_fixture(next(p for p in get_registry().profiles if p.fixture))
+
+    @override_settings(JOB_EXTRACTION_PROCESSES=0)
+    def test_disabled_pool_parses_inline(self):
+        with mock.patch.object(parse_pool, 'create_pool') as create_pool:
+            self.assertEqual(parse_pool.parse_in_pool(self.page), parse_job_page(self.page))
+        create_pool.assert_not_called()
+
+    @override_settings(JOB_EXTRACTION_PROCESSES=1)
+    def test_pool_results_match_in_process_parsing(self):
+        for url in (None, self.url):
+            with self.subTest(url=url):
+                self.assertEqual(parse_pool.parse_in_pool(self.page, url), parse_job_page(self.page, url))
+
+    @override_settings(JOB_EXTRACTION_PROCESSES=1)
+    def test_broken_pool_falls_back_and_is_replaced(self):
+        broken = mock.Mock()
+        broken.submit.return_value.result.side_effect = BrokenProcessPool('worker died')
+        with mock.patch.object(parse_pool, 'create_pool', return_value=broken):
+            self.assertEqual(parse_pool.parse_in_pool(self.page), parse_job_page(self.page))
+        broken.shutdown.assert_called_once()
+        self.assertIsNone(parse_pool._pool)
+
+
+class SnapshotPruningTests(TestCase):
+    def snapshot(self, page, hours_ago):
+        snapshot = PostingSnapshot.store('https://example.com/job', page)
+        PostingSnapshot.objects.filter(pk=snapshot.pk).update(fetched_at=timezone.now() - timedelta(hours=hours_ago))
+        return snapshot
+
+    def test_only_old_unused_snapshots_are_deleted(self):
+        previewed = self.snapshot(b'<html>previewed</html>', hours_ago=48)
+        recent = self.snapshot(b'<html>recent</html>', hours_ago=1)
+        saved = self.snapshot(b'<html>saved</html>', hours_ago=48)
+        Position.objects.create(company_name='Tech Corp', position_title='Backend', snapshot=saved)
+
+        out = io.StringIO()
+        call_command('prune_snapshots', '--dry-run', stdout=out)
+        self.assertIn('Would delete 1 snapshots', out.getvalue())
+        self.assertEqual(PostingSnapshot.objects.count(), 3)
+
+        call_command('prune_snapshots', stdout=io.StringIO())
+        self.assertEqual(set(PostingSnapshot.objects.values_list('pk', flat=True)), {recent.pk, saved.pk})
+        self.assertFalse(PostingSnapshot.objects.filter(pk=previewed.pk).exists())
+
+    def test_fetching_a_page_again_restarts_its_retention(self):
+        old = self.snapshot(b'<html>page</html>', hours_ago=48)
+        again = PostingSnapshot.store('https://example.com/job', b'<html>page</html>')
+        self.assertEqual(again.pk, old.pk)
+        self.assertEqual(PostingSnapshot.prune(timezone.now() - timedelta(hours=24)), 0)
+
+
+class ReparseSnapshotsTests(TestCase):
+    def setUp(self):
+        caches['api'].clear()
+        url, page, self.expected = load_fixture(SARAMIN)
+        self.position = Position.objects.create(
+            company_name='Stale Corp', position_title='Backend', recruiting_link=url,
+            job_description='Legacy COBOL mainframe upkeep', snapshot=PostingSnapshot.store(url, page),
+        )
+
+    def reparse(self, *args):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('reparse_snapshots', '--workers', '0', *args, stdout=io.StringIO(), stderr=io.StringIO())
+        self.position.refresh_from_db()
+
+    def search(self, q):
+        return [result['id'] for result in self.client.get('/api/search/', {'q': q}).json()['results']]
+
+    def test_positions_take_the_new_extraction(self):
+        before = Position.objects.get(pk=self.position.pk)
+        self.reparse()
+        for field in ('company_name', 'job_description', 'location'):
+            self.assertEqual(getattr(self.position, field), self.expected[field])
+        self.assertGreater(self.position.updated_at, before.updated_at)
+        self.assertNotEqual(self.position.content_hash, before.content_hash)
+
+    def test_search_and_cached_responses_follow(self):
+        detail = f'/api/positions/{self.position.pk}/'
+        self.assertEqual(self.client.get(detail).json()['company_name'], 'Stale Corp')
+        self.assertEqual(self.search('COBOL'), [self.position.pk])
+
+        self.reparse()
+        self.assertEqual(self.client.get(detail).json()['company_name'], self.expected['company_name'])
+        self.assertEqual(self.search('COBOL'), [])
+        self.assertEqual(self.search('Spring Boot'), [self.position.pk])
+
+    def test_dry_run_changes_nothing(self):
+        self.reparse('--dry-run')
+        self.assertEqual(self.position.company_name, 'Stale Corp')
+
+
+class FakeClock:
+    """time.monotonic and time.sleep for the fetch scheduler: sleeping moves the clock on"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    return requests.HTTPError(f'{status} Error', response=response)
+
+
+class FetchSchedulerTests(SimpleTestCase):
+    URL = 'https://www.saramin.co.kr/job/1'
+
+    def setUp(self):
+        host_scheduler._scheduler = None
+        self.addCleanup(setattr, host_scheduler, '_scheduler', None)
+        self.clock = FakeClock()
+
+    def scheduler(self, **default):
+        return host_scheduler.FetchScheduler(default, clock=self.clock.monotonic, sleep=self.clock.sleep)
+
+    def call(self, scheduler, *outcomes):
+        """scheduler.call() with a request that raises or returns each outcome in turn"""
+        outcomes = iter(outcomes)
+
+        def request():
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        return scheduler.call(self.URL, request)
+
+    def test_defaults_stay_below_the_fetch_pool(self):
+        policy = host_scheduler.get_scheduler().policy_for('www.saramin.co.kr')
+        self.assertEqual(policy['rate'], 2.0)
+        self.assertLess(policy['max_concurrency'], settings.JOB_FETCH_MAX_WORKERS)
+
+        host_scheduler._scheduler = None
+        with override_settings(JOB_FETCH_SCHEDULER={'DEFAULT': {}, 'HOSTS': {'saramin.co.kr': {'RATE': None}}}):
+            scheduler = host_scheduler.get_scheduler()
+            self.assertIsNone(scheduler.policy_for('www.saramin.co.kr')['rate'])
+            self.assertEqual(scheduler.policy_for('example.com')['rate'], 2.0)
+        host_scheduler._scheduler = None
+        with override_settings(JOB_FETCH_SCHEDULER=None):
+            self.assertIsNone(host_scheduler.get_scheduler())
+
+    def test_rate_spaces_requests_after_the_burst(self):
+        scheduler = self.scheduler(rate=2.0, burst=4)
+        for i in range(8):
+            self.call(scheduler, i)
+        self.assertEqual(self.clock.now, 2.0)
+        self.assertEqual(scheduler.metrics()['www.saramin.co.kr']['throttled_seconds'], 2.0)
+
+    def test_retry_after_pauses_the_host(self):
+        scheduler = self.scheduler(rate=None)
+        self.assertEqual(self.call(scheduler, http_error(429, {'Retry-After': '3'}), 'page'), 'page')
+        self.assertEqual(self.clock.sleeps, [3.0])
+
+        metrics = scheduler.metrics()['www.saramin.co.kr']
+        self.assertEqual((metrics['retries'], metrics['statuses']), (1, {'429': 1, 'ok': 1}))
+        # Being rate limited says nothing about the host's health
+        self.assertEqual((metrics['circuit'], metrics['consecutive_failures']), ('closed', 0))
+
+    def test_retry_after_is_capped(self):
+        scheduler = self.scheduler(rate=None, backoff_max=5.0)
+        self.call(scheduler, http_error(429, {'Retry-After': '3600'}), 'page')
+        self.assertEqual(self.clock.sleeps, [5.0])
+
+    def test_failures_back_off_exponentially(self):
+        scheduler = self.scheduler(rate=None, backoff_base=0.5, max_retries=3)
+        with mock.patch('applications.host_scheduler.random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual(self.call(scheduler, http_error(503), requests.ConnectionError(), 'page'), 'page')
+            self.assertEqual(self.clock.sleeps, [0.5, 1.0])
+
+            with self.assertRaises(requests.HTTPError):
+                self.call(scheduler, *[http_error(503)] * 4)
+        self.assertEqual(self.clock.sleeps[2:], [0.5, 1.0, 2.0])
+
+    def test_client_errors_are_not_retried(self):
+        scheduler = self.scheduler(rate=None)
+        with self.assertRaises(requests.HTTPError):
+            self.call(scheduler, http_error(404), 'page')
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_circuit_breaker_opens_and_recovers(self):
+        scheduler = self.scheduler(rate=None, max_retries=0, failure_threshold=2, reset_timeout=60.0)
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                self.call(scheduler, requests.ConnectionError())
+        # Open: fails fast without a request
+        with self.assertRaises(host_scheduler.HostUnavailable):
+            self.call(scheduler)
+
+        # After reset_timeout a failed trial opens it again, a successful one closes it
+        self.clock.now += 60
+        with self.assertRaises(requests.ConnectionError):
+            self.call(scheduler, requests.ConnectionError())
+        with self.assertRaises(host_scheduler.HostUnavailable):
+            self.call(scheduler)
+        self.clock.now += 60
+        self.assertEqual(self.call(scheduler, 'page'), 'page')
+
+        metrics = scheduler.metrics()['www.saramin.co.kr']
+        self.assertEqual(
+            (metrics['circuit'], metrics['circuit_opened'], metrics['rejected']), ('closed', 2, 2),
+        )
+
+
+@override_settings(JOB_FETCH_CACHE=None, JOB_FETCH_TIMEOUT=5)
+class FetchSchedulerStandInTests(SimpleTestCase):
+    """The scheduler against a local stand-in job board; backoff runs on a fake clock"""
+
+    PAGE = b'<html><body><div class="job-description"><p>Backend</p></div></body></html>'
+
+    def use_scheduler(self, **default):
+        self.clock = FakeClock()
+        host_scheduler._scheduler = host_scheduler.FetchScheduler(
+            {'rate': None, **default}, clock=self.clock.monotonic, sleep=self.clock.sleep,
+        )
+        self.addCleanup(setattr, host_scheduler, '_scheduler', None)
+        return host_scheduler._scheduler
+
+    def test_flaky_pages_are_retried(self):
+        self.use_scheduler(max_retries=3)
+        with StandInServer(self.PAGE, flaky_failures=2) as server:
+            self.assertEqual(utils.fetch_page(server.url('/flaky/1')), self.PAGE)
+        self.assertEqual(server.statuses, {503: 2, 200: 1})
+        self.assertEqual(len(self.clock.sleeps), 2)
+
+    def test_failing_host_opens_the_circuit(self):
+        scheduler = self.use_scheduler(max_retries=3, failure_threshold=2)
+        with StandInServer(self.PAGE) as server:
+            with self.assertRaises(requests.HTTPError):
+                utils.fetch_page(server.url('/down/1'))
+            with self.assertRaises(host_scheduler.HostUnavailable):
+                utils.fetch_page(server.url('/ok/1'))
+        # No retries once the circuit opened, no request while it is open
+        self.assertEqual(server.statuses, {503: 2})
+        self.assertEqual(scheduler.metrics()['127.0.0.1']['circuit'], 'open')
+
+    def test_rate_limited_requests_wait_for_retry_after(self):
+        scheduler = self.use_scheduler(max_retries=1)
+        with StandInServer(self.PAGE, rate_limit=1) as server:
+            self.assertEqual(utils.fetch_page(server.url('/ok/1')), self.PAGE)
+            # The fake clock does not wait out the server's window, so the retry is limited too
+            with self.assertRaises(requests.HTTPError):
+                utils.fetch_page(server.url('/ok/2'))
+        self.assertEqual(server.statuses, {200: 1, 429: 2})
+        self.assertEqual(self.clock.sleeps, [1.0])
+        self.assertEqual(scheduler.metrics()['127.0.0.1']['circuit'], 'closed')
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(7):
+            Position.objects.create(company_name=f'Company {i}', position_title='Backend')
+        # Ties on updated_at are broken by id
+        Position.objects.filter(pk__in=Position.objects.order_by('pk').values('pk')[:4]).update(
+            updated_at=timezone.now()
+        )
+        cls.expected = list(Position.objects.values_list('pk', flat=True))
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([position['id'] for position in response.json()['results']])
+            url = response.json()[link]
+        return pages
+
+    def test_next_links_visit_every_row_once_in_order(self):
+        pages = self.walk('/api/positions/?page_size=3', 'next')
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_previous_links_walk_back(self):
+        last = self.client.get('/api/positions/?page_size=3').json()['next']
+        last = self.client.get(last).json()['next']
+        pages = self.walk(self.client.get(last).json()['previous'], 'previous')
+        self.assertEqual(pages, [self.expected[3:6], self.expected[0:3]])
+
+    def test_count_only_on_request(self):
+        self.assertNotIn('count', self.client.get('/api/positions/').json())
+        self.assertEqual(self.client.get('/api/positions/?count=1').json()['count'], 7)
+
+    def test_invalid_cursor_is_404(self):
+        self.assertEqual(self.client.get('/api/positions/?cursor=bm90LWpzb24').status_code, 404)
+
+
+@override_settings(API_RESPONSE_CACHE=None)
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.position = Position.objects.create(
+            company_name='Acme', position_title='Backend', job_description='A long description',
+        )
+        ProcessNote.objects.create(position=cls.position, process_type='other', title='Call', content='Went well')
+        InterviewEvent.objects.create(
+            position=cls.position, event_type='other', title='Coffee chat',
+            start_datetime=timezone.now(), duration=30,
+        )
+        cls.url = f'/api/positions/{cls.position.pk}/'
+
+    def row_queries(self, context, table):
+        # The rows themselves, not the conditional GET validators
+        return [query['sql'] for query in context.captured_queries if query['sql'].startswith(f'SELECT "{table}"."id"')]
+
+    def test_fields_and_omit(self):
+        self.assertEqual(list(self.client.get(self.url, {'fields': 'id,company_name'}).json()), ['id', 'company_name'])
+        body = self.client.get(self.url, {'omit': 'job_description,notes,events'}).json()
+        self.assertNotIn('job_description', body)
+        self.assertNotIn('notes', body)
+        self.assertIn('company_name', body)
+
+    def test_expand_adds_nested_rows(self):
+        [row] = self.client.get('/api/positions/').json()['results']
+        self.assertNotIn('notes', row)
+        [row] = self.client.get('/api/positions/', {'expand': 'notes'}).json()['results']
+        self.assertEqual([note['title'] for note in row['notes']], ['Call'])
+        self.assertNotIn('events', row)
+
+        note = self.client.get('/api/notes/', {'expand': 'position'}).json()['results'][0]
+        self.assertEqual(note['position'], {
+            'id': self.position.pk, 'company_name': 'Acme', 'position_title': 'Backend',
+            'current_status': self.position.current_status,
+        })
+
+    def test_unknown_fields_are_rejected(self):
+        for params in ({'fields': 'id,salary'}, {'omit': 'salary'}, {'expand': 'salary'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('salary', response.json()['fields'])
+
+    def test_writes_ignore_the_fieldset(self):
+        response = self.client.patch(
+            f'{self.url}?fields=id', {'position_title': 'Platform'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['position_title'], 'Platform')
+        self.assertIn('job_description', response.json())
+
+    def test_select_reads_only_the_serialized_columns(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, {'omit': 'job_description,notes,events'})
+        [sql] = self.row_queries(context, 'applications_position')
+        self.assertNotIn('"job_description"', sql)
+        self.assertIn('"company_name"', sql)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/positions/')
+        [sql] = self.row_queries(context, 'applications_position')
+        self.assertNotIn('"job_description"', sql)
+
+    def test_expanded_relations_are_narrowed_too(self):
+        # ?expand=position joins only the summary columns
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/notes/', {'expand': 'position'})
+        [sql] = self.row_queries(context, 'applications_processnote')
+        self.assertIn('INNER JOIN "applications_position"', sql)
+        self.assertNotIn('"job_description"', sql)
+
+        # Prefetched notes read only the nested serializer's columns, plus
+        # the foreign key they are matched back on
+        serializer = PositionListSerializer()
+        serializer.apply_fieldset({'fields': 'id,notes'})
+        serializer.fields['notes'].child.apply_fieldset({'fields': 'title'})
+        with CaptureQueriesContext(connection) as context:
+            [position] = optimize_queryset(Position.objects.all(), serializer)
+            self.assertEqual([note.title for note in position.notes.all()], ['Call'])
+        [position_sql, notes_sql] = [query['sql'] for query in context.captured_queries]
+        self.assertNotIn('"job_description"', position_sql)
+        self.assertIn('"position_id"', notes_sql)
+        self.assertNotIn('"content"', notes_sql)
+
+    def test_omitting_nested_relations_skips_their_queries(self):
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as trimmed:
+            self.client.get(self.url, {'omit': 'notes,events'})
+        for table in ('applications_processnote', 'applications_interviewevent'):
+            with self.subTest(table=table):
+                self.assertEqual(len(self.row_queries(full, table)), 1)
+                self.assertFalse([query for query in trimmed.captured_queries if table in query['sql']])
+
+
+# Without the response cache, which only sees writes once they commit
+@override_settings(API_RESPONSE_CACHE=None)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(company_name='Tech Corp', position_title='Backend')
+        self.other = Position.objects.create(company_name='Other Corp', position_title='Frontend')
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_list_is_304(self):
+        response = self.client.get('/api/positions/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        revalidated = self.revalidate('/api/positions/', response)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+
+    def test_list_changes_on_update_and_delete(self):
+        response = self.client.get('/api/positions/')
+        self.position.current_status = 'interviewing'
+        self.position.save()
+        updated = self.revalidate('/api/positions/', response)
+        self.assertEqual(updated.status_code, 200)
+
+        self.other.delete()
+        deleted = self.revalidate('/api/positions/', updated)
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual(len(deleted.json()['results']), 1)
+
+    def test_detail_changes_with_its_nested_notes(self):
+        url = f'/api/positions/{self.position.pk}/'
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+        ProcessNote.objects.create(position=self.position, process_type='general', content='Called')
+        changed = self.revalidate(url, response)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.json()['notes']), 1)
+
+    def test_lone_row_answers_if_modified_since(self):
+        note = ProcessNote.objects.create(position=self.position, process_type='general', content='Called')
+        url = f'/api/notes/{note.pk}/'
+        response = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+    def test_missing_row_is_still_404(self):
+        self.assertEqual(self.client.get('/api/positions/999999/').status_code, 404)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ResponseCacheInvalidationTests(TestCase):
+    def setUp(self):
+        caches['api'].clear()
+        self.position = Position.objects.create(company_name='Tech Corp', position_title='Backend')
+        self.other = Position.objects.create(company_name='Other Corp', position_title='Frontend')
+
+    def hits(self, url):
+        """Whether a GET of url is answered from the response cache"""
+        before = get_response_cache().stats()['hits']
+        self.assertEqual(self.client.get(url).status_code, 200)
+        return get_response_cache().stats()['hits'] > before
+
+    def write(self, method, url, data):
+        # Invalidation runs on commit, which TestCase's transaction never reaches
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(url, data, content_type='application/json')
+
+    def test_repeated_reads_are_hits(self):
+        url = f'/api/positions/{self.position.pk}/'
+        self.assertFalse(self.hits(url))
+        self.assertTrue(self.hits(url))
+
+    def test_a_note_invalidates_only_its_position(self):
+        detail, other_detail = f'/api/positions/{self.position.pk}/', f'/api/positions/{self.other.pk}/'
+        for url in (detail, other_detail):
+            self.client.get(url)
+
+        note = {'position': self.position.pk, 'process_type': 'general', 'title': 'Recruiter', 'content': 'Called'}
+        self.assertEqual(self.write('post', '/api/notes/', note).status_code, 201)
+        self.assertFalse(self.hits(detail))
+        self.assertEqual(len(self.client.get(detail).json()['notes']), 1)
+        self.assertTrue(self.hits(other_detail))
+
+    def test_moving_a_note_invalidates_both_positions(self):
+        note = ProcessNote.objects.create(position=self.position, process_type='general', content='Called')
+        detail, other_detail = f'/api/positions/{self.position.pk}/', f'/api/positions/{self.other.pk}/'
+        for url in (detail, other_detail):
+            self.client.get(url)
+
+        self.assertEqual(self.write('patch', f'/api/notes/{note.pk}/', {'position': self.other.pk}).status_code, 200)
+        self.assertEqual(self.client.get(detail).json()['notes'], [])
+        self.assertEqual(len(self.client.get(other_detail).json()['notes']), 1)
+
+    def test_moves_are_tracked_without_rereading_the_row(self):
+        note = ProcessNote.objects.create(position=self.position, process_type='general', content='Called')
+        detail, other_detail = f'/api/positions/{self.position.pk}/', f'/api/positions/{self.other.pk}/'
+
+        loaded = ProcessNote.objects.get(pk=note.pk)
+        for position in (self.other, self.position):
+            for url in (detail, other_detail):
+                self.client.get(url)
+            loaded.position = position
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                loaded.save()
+            self.assertFalse([query for query in queries if query['sql'].startswith('SELECT')])
+            self.assertFalse(self.hits(detail))
+            self.assertFalse(self.hits(other_detail))
+
+        # A row built by hand, not loaded, is looked up once
+        unloaded = ProcessNote(
+            pk=note.pk, position=self.other, process_type='general', content='Called', created_at=note.created_at,
+        )
+        self.client.get(detail)
+        with self.captureOnCommitCallbacks(execute=True):
+            unloaded.save()
+        self.assertFalse(self.hits(detail))
+
+    def test_bulk_writes_invalidate_lists_and_details(self):
+        detail = f'/api/positions/{self.position.pk}/'
+        self.client.get(detail)
+        self.client.get('/api/positions/')
+
+        response = self.write('post', '/api/positions/bulk/', [{'id': self.position.pk, 'current_status': 'offer'}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(detail).json()['current_status'], 'offer')
+        self.assertEqual(self.client.get('/api/positions/').json()['results'][0]['current_status'], 'offer')
+
+
+class DashboardStatsTests(TestCase):
+    URL = '/api/positions/stats/'
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.positions = [
+            Position.objects.create(company_name=f'Company {i}', position_title='Backend', current_status=status)
+            for i, status in enumerate(
+                ['applied', 'applied', 'coding_test', 'technical_interview', 'final_interview', 'offer', 'rejected']
+            )
+        ]
+        self.events = [
+            InterviewEvent.objects.create(
+                position=self.positions[2], event_type='other', title=title, start_datetime=now + offset, duration=60,
+            )
+            for title, offset in [
+                ('past', -timedelta(days=1)), ('in_progress', -timedelta(minutes=30)),
+                ('tomorrow', timedelta(days=1)), ('next_week', timedelta(days=7)),
+            ]
+        ]
+
+    def stats(self):
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def write(self, func, *args, **kwargs):
+        # Stats are invalidated on commit, which TestCase's transaction never reaches
+        with self.captureOnCommitCallbacks(execute=True):
+            return func(*args, **kwargs)
+
+    def test_counts_match_the_data(self):
+        stats = self.stats()
+        self.assertEqual(stats['total'], 7)
+        self.assertEqual(stats['by_status'], {
+            **dict.fromkeys((status for status, _ in Position.PROCESS_STATUS_CHOICES), 0),
+            'applied': 2, 'coding_test': 1, 'technical_interview': 1, 'final_interview': 1, 'offer': 1, 'rejected': 1,
+        })
+        self.assertEqual(stats['interviewing'], 3)
+        self.assertEqual(stats['upcoming_events'], 3)
+        self.assertEqual(
+            [position['id'] for position in stats['recent_positions']],
+            list(Position.objects.values_list('id', flat=True)[:5]),
+        )
+        self.assertEqual([event['title'] for event in stats['next_events']], ['in_progress', 'tomorrow', 'next_week'])
+
+    def test_repeated_requests_are_served_from_the_cache(self):
+        self.stats()
+        with self.assertNumQueries(0):
+            self.stats()
+
+    def test_position_saves_and_deletes_invalidate(self):
+        self.stats()
+        position = self.positions[0]
+        position.current_status = 'screening'
+        self.write(position.save)
+        self.assertEqual(self.stats()['by_status']['screening'], 1)
+
+        self.write(self.positions[-1].delete)
+        stats = self.stats()
+        self.assertEqual((stats['total'], stats['by_status']['rejected']), (6, 0))
+
+    def test_event_saves_and_deletes_invalidate(self):
+        self.assertEqual(self.stats()['upcoming_events'], 3)
+        self.write(
+            InterviewEvent.objects.create, position=self.positions[0], event_type='other', title='later',
+            start_datetime=timezone.now() + timedelta(days=2), duration=60,
+        )
+        self.assertEqual(self.stats()['upcoming_events'], 4)
+        self.write(self.events[2].delete)
+        self.assertEqual(self.stats()['upcoming_events'], 3)
+
+    def test_bulk_writes_invalidate(self):
+        self.stats()
+        response = self.write(
+            self.client.post, '/api/positions/bulk/', [{'id': self.positions[0].pk, 'current_status': 'offer'}],
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stats()['by_status']['offer'], 2)
+
+
+class InterviewEventWindowTests(TestCase):
+    """InterviewEventQuerySet.overlapping() and the ?start_date=&end_date= filter"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.position = Position.objects.create(company_name='Tech Corp', position_title='Backend')
+        start = timezone.make_aware(datetime(2026, 3, 2, 10))
+        cls.window = (start, start + timedelta(hours=1))
+        cls.events = {
+            name: cls.event(name, start + timedelta(minutes=offset), duration)
+            for name, offset, duration in [
+                ('ends_at_start', -60, 60),
+                ('starts_at_end', 60, 30),
+                ('in_progress', -30, 60),
+                ('inside', 15, 30),
+                ('spanning', -120, 300),
+                ('last_minute', 59, 60),
+                ('all_day', -23 * 60, 24 * 60),
+            ]
+        }
+
+    @classmethod
+    def event(cls, title, start, duration):
+        return InterviewEvent.objects.create(
+            position=cls.position, event_type='other', title=title, start_datetime=start, duration=duration,
+        )
+
+    def overlapping(self, start, end):
+        return {event.title for event in InterviewEvent.objects.overlapping(start, end)}
+
+    def listed(self, start_date, end_date):
+        response = self.client.get('/api/events/', {'start_date': start_date, 'end_date': end_date})
+        self.assertEqual(response.status_code, 200)
+        return {event['title'] for event in response.json()['results']}
+
+    def test_touching_edges_do_not_overlap(self):
+        self.assertEqual(
+            self.overlapping(*self.window), {'in_progress', 'inside', 'spanning', 'last_minute', 'all_day'},
+        )
+
+    def test_open_ended_windows(self):
+        start, end = self.window
+        self.assertEqual(self.overlapping(end, None), {'starts_at_end', 'spanning', 'last_minute'})
+        self.assertEqual(self.overlapping(None, start), {'ends_at_start', 'in_progress', 'spanning', 'all_day'})
+
+    def test_window_is_a_single_query(self):
+        # The lookback comes from settings, not from an aggregate over the table
+        with self.assertNumQueries(1):
+            list(InterviewEvent.objects.overlapping(*self.window))
+
+    def test_naive_and_aware_bounds(self):
+        expected = self.overlapping(*self.window)
+        self.assertEqual(self.listed('2026-03-02T10:00:00', '2026-03-02T11:00:00'), expected)
+        self.assertEqual(self.listed('2026-03-02T19:00:00+09:00', '2026-03-02T20:00:00+09:00'), expected)
+        # A date is its midnight
+        self.assertEqual(
+            self.listed('2026-03-02', '2026-03-02T10:00:00'), {'ends_at_start', 'in_progress', 'spanning', 'all_day'},
+        )
+
+    def test_invalid_bounds_are_rejected(self):
+        for params in ({'start_date': 'yesterday'}, {'end_date': '2026-13-01'}, {'start_date': '2026-03-02T25:00'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/events/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.json())
+
+    def test_save_keeps_end_datetime_in_sync(self):
+        event = self.events['inside']
+        event.duration = 90
+        event.save(update_fields=['duration'])
+        event.refresh_from_db()
+        self.assertEqual(event.end_datetime, event.start_datetime + timedelta(minutes=90))
+
+        event.start_datetime += timedelta(hours=1)
+        event.save()
+        event.refresh_from_db()
+        self.assertEqual(event.end_datetime, event.start_datetime + timedelta(minutes=90))
+
+        self.client.patch(f'/api/events/{event.pk}/', {'duration': 15}, content_type='application/json')
+        event.refresh_from_db()
+        self.assertEqual(event.end_datetime, event.start_datetime + timedelta(minutes=15))
+
+    def test_durations_beyond_the_lookback_are_rejected(self):
+        url = f'/api/events/{self.events["inside"].pk}/'
+        response = self.client.patch(url, {'duration': 24 * 60 + 1}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('duration', response.json())
+        with override_settings(INTERVIEW_EVENT_MAX_DURATION=7 * 24 * 60):
+            response = self.client.patch(url, {'duration': 24 * 60 + 1}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(API_RESPONSE_CACHE=None)
+class CalendarFeedTests(TestCase):
+    URL = '/api/events/calendar/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.start = timezone.make_aware(datetime(2026, 3, 1))
+        cls.positions = [
+            Position.objects.create(company_name=f'Company {i}', position_title=f'Role {i}') for i in range(3)
+        ]
+        for day in range(6):
+            InterviewEvent.objects.create(
+                position=cls.positions[day % 3], event_type='technical_interview', title=f'Interview {day}',
+                start_datetime=cls.start + timedelta(days=day, hours=10), duration=60, location='Seoul',
+            )
+
+    def calendar(self, **params):
+        return self.client.get(self.URL, {'start_date': '2026-03-01', 'end_date': '2026-04-01', **params})
+
+    def test_window_is_required_and_bounded(self):
+        for params in (
+            {'start_date': ''}, {'end_date': ''},
+            {'end_date': '2026-05-03'},  # 63 days
+            {'end_date': '2026-03-01'}, {'end_date': '2026-02-28'},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.calendar(**params).status_code, 400)
+        self.assertEqual(self.calendar(end_date='2026-05-02').status_code, 200)  # 62 days
+        self.assertEqual(self.calendar(end_date='next month').status_code, 400)
+
+    def test_rows_carry_their_position(self):
+        events = self.calendar().json()['events']
+        self.assertEqual(len(events), 6)
+        self.assertEqual(events[1], {
+            'id': events[1]['id'], 'title': 'Interview 1', 'event_type': 'technical_interview',
+            'start': '2026-03-02T10:00:00Z', 'end': '2026-03-02T11:00:00Z', 'location': 'Seoul',
+            'meeting_link': None, 'description': None, 'position': self.positions[1].pk,
+            'company_name': 'Company 1', 'position_title': 'Role 1',
+        })
+
+    def test_query_count_does_not_grow_with_events(self):
+        with CaptureQueriesContext(connection) as few:
+            self.calendar()
+        for day in range(6, 30):
+            position = Position.objects.create(company_name=f'Company {day}', position_title='Backend')
+            InterviewEvent.objects.create(
+                position=position, event_type='other', title=f'Event {day}',
+                start_datetime=self.start + timedelta(days=day), duration=30,
+            )
+        with self.assertNumQueries(len(few)):
+            self.assertEqual(self.calendar().json()['count'], 30)
+
+    def test_columnar_layout_matches_rows(self):
+        rows = self.calendar().json()
+        columns = self.calendar(layout='columnar').json()
+        self.assertEqual(columns['count'], rows['count'])
+        self.assertEqual(list(columns['events']), list(rows['events'][0]))
+        self.assertEqual(
+            [dict(zip(columns['events'], values)) for values in zip(*columns['events'].values())], rows['events'],
+        )
+
+    def test_position_filter(self):
+        events = self.calendar(position_id=self.positions[0].pk).json()['events']
+        self.assertEqual([event['title'] for event in events], ['Interview 0', 'Interview 3'])
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.payments = Position.objects.create(
+            company_name='Toss', position_title='Backend Engineer', current_status='technical_interview',
+            job_description='결제 시스템과 Kafka 기반 정산 파이프라인을 개발합니다.',
+        )
+        cls.ads = Position.objects.create(
+            company_name='Naver', position_title='Data Engineer', current_status='applied',
+            job_description='광고 로그를 Kafka로 수집하고 분석합니다.',
+        )
+        cls.note = ProcessNote.objects.create(
+            position=cls.ads, process_type='general', title='1차 면접', content='Kafka 파티셔닝 질문',
+        )
+
+    def search(self, **params):
+        response = self.client.get('/api/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(result['kind'], result['id']) for result in response.json()['results']]
+
+    def test_matches_korean_substrings_and_short_terms(self):
+        self.assertEqual(self.search(q='시스템'), [('position', self.payments.pk)])
+        self.assertEqual(self.search(q='결제'), [('position', self.payments.pk)])
+
+    def test_current_status_and_kind_filter(self):
+        self.assertEqual(
+            set(self.search(q='Kafka')),
+            {('position', self.payments.pk), ('position', self.ads.pk), ('note', self.note.pk)},
+        )
+        self.assertEqual(self.search(q='Kafka', current_status='applied', kind='note'), [('note', self.note.pk)])
+        self.assertEqual(self.client.get('/api/search/', {'q': 'Kafka', 'current_status': 'nope'}).status_code, 400)
+
+    def test_probe_detects_a_missing_tokenizer(self):
+        self.assertTrue(search.supports_trigram(connection))
+        with mock.patch.object(search, 'PROBE_SQL', search.PROBE_SQL.replace('trigram', 'missing')):
+            self.assertFalse(search.supports_trigram(connection))
+        # The failed probe left the test transaction usable
+        self.assertEqual(Position.objects.count(), 2)
+
+    def indexed(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {search.TABLE}')
+            return cursor.fetchone()[0]
+
+    def test_unavailable_search_is_skipped(self):
+        with mock.patch.dict(search._support, {connection.alias: False}):
+            self.assertEqual(self.client.get('/api/search/', {'q': 'Kafka'}).status_code, 501)
+            Position.objects.create(company_name='Kakao', position_title='Backend', job_description='Kafka')
+            search.rebuild()
+            with self.assertRaises(CommandError):
+                call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self.indexed(), 3)
+
+
+class SimHashTests(SimpleTestCase):
+    def test_stored_fingerprints_stay_valid(self):
+        # Positions keep their SimHash: changing the algorithm needs a backfill
+        self.assertEqual(simhash('\n'.join(KOREAN_LINES + ENGLISH_LINES)), 0x4d79281f9f624821)
+        self.assertEqual(simhash('Backend Engineer: Python, Django'), 0xb8761c42162140a8)
+
+    def test_word_order_case_and_punctuation_are_ignored(self):
+        self.assertEqual(simhash('A, b!'), simhash('b a'))
+        self.assertIsNone(simhash('  -  '))
+
+    def test_an_edited_word_stays_within_reach(self):
+        words = '\n'.join(KOREAN_LINES + ENGLISH_LINES).split()
+        edited = words[:3] + ['Kotlin'] + words[4:]
+        self.assertLessEqual(hamming_distance(simhash(' '.join(words)), simhash(' '.join(edited))), MAX_DISTANCE)
+
+
+class DuplicateLookupTests(TestCase):
+    BASE = 0x0123_4567_89AB_CDEF
+
+    def position(self, fingerprint, content_hash=None):
+        position = Position.objects.create(company_name='Tech Corp', position_title='Backend')
+        fields = {f'simhash_band{band}': value for band, value in enumerate(bands(fingerprint))}
+        Position.objects.filter(pk=position.pk).update(
+            simhash=to_signed(fingerprint), content_hash=content_hash or f'{fingerprint:064x}', **fields
+        )
+        return Position.objects.get(pk=position.pk)
+
+    def flipped(self, bits):
+        fingerprint = self.BASE
+        for bit in bits:
+            fingerprint ^= 1 << bit
+        return fingerprint
+
+    def test_every_fingerprint_within_max_distance_is_found(self):
+        base = self.position(self.BASE)
+        # Two bits in three bands and one in the last: no band matches exactly
+        near = self.position(self.flipped([0, 1, 16, 17, 32, 33, 48]))
+        far = self.position(self.flipped([0, 1, 16, 17, 32, 33, 48, 49]))
+        exact = self.position(self.flipped(range(0, 64, 2)), content_hash=base.content_hash)
+
+        duplicates = base.possible_duplicates()
+        self.assertEqual(MAX_DISTANCE, 7)
+        self.assertEqual([(position.pk, distance) for position, distance in duplicates], [(exact.pk, 0), (near.pk, 7)])
+        self.assertNotIn(far.pk, [position.pk for position, _ in duplicates])
+
+    def test_max_distance_limits_results(self):
+        base = self.position(self.BASE)
+        one_bit = self.position(self.flipped([5]))
+        self.position(self.flipped([5, 20, 40, 60]))
+        self.assertEqual([(position.pk, distance) for position, distance in base.possible_duplicates(3)], [(one_bit.pk, 1)])
+
+    def test_only_duplicates_are_loaded_with_the_requested_fields(self):
+        base = self.position(self.BASE)
+        self.position(self.flipped([0]))
+        self.position(self.flipped([0, 1, 16, 17, 32, 33, 48, 49]))
+        with self.assertNumQueries(2):
+            duplicates = base.possible_duplicates(fields=['company_name'])
+        self.assertEqual(len(duplicates), 1)
+        self.assertIn('job_description', duplicates[0][0].get_deferred_fields())
+
+    def test_endpoint_lists_duplicates(self):
+        base = self.position(self.BASE)
+        near = self.position(self.flipped([3, 30]))
+        response = self.client.get(f'/api/positions/{base.pk}/duplicates/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['results'][0]['id'], near.pk)
+        self.assertEqual(response.json()['results'][0]['distance'], 2)
+
+
+class BulkWriteTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(
+            company_name='Tech Corp', position_title='Backend', recruiting_link='https://careers.techcorp.com/1',
+        )
+
+    def bulk(self, url, items):
+        return self.client.post(url, items, content_type='application/json')
+
+    def test_every_item_gets_its_outcome(self):
+        response = self.bulk('/api/positions/bulk/', [
+            {'company_name': 'Startup', 'position_title': 'Data', 'job_description': 'Kafka 기반 데이터 파이프라인'},
+            {'id': self.position.pk, 'current_status': 'offer'},
+            {'id': self.position.pk, 'company_name': 'Tech Corp'},
+            {'company_name': 'No title'},
+            {'id': 999999, 'current_status': 'offer'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(
+            {outcome: body[outcome] for outcome in ('created', 'updated', 'unchanged', 'failed')},
+            {'created': 1, 'updated': 1, 'unchanged': 1, 'failed': 2},
+        )
+        self.assertEqual([result['status'] for result in body['results']],
+                         ['created', 'updated', 'unchanged', 'failed', 'failed'])
+        self.assertIn('position_title', body['results'][3]['errors'])
+
+        self.position.refresh_from_db()
+        self.assertEqual(self.position.current_status, 'offer')
+        created = Position.objects.get(pk=body['results'][0]['id'])
+        expected = fingerprint_fields(created.job_description)
+        self.assertEqual({field: getattr(created, field) for field in expected}, expected)
+        self.assertEqual(search.search('파이프라인')[0]['id'], created.pk)
+
+    def test_upsert_matches_on_recruiting_link(self):
+        response = self.bulk('/api/positions/bulk/?upsert=recruiting_link', [
+            {'company_name': 'Tech Corp', 'position_title': 'Backend', 'current_status': 'screening',
+             'recruiting_link': 'https://careers.techcorp.com/1'},
+            {'company_name': 'Startup', 'position_title': 'Data', 'recruiting_link': 'https://startup.io/jobs/7'},
+        ])
+        self.assertEqual([result['status'] for result in response.json()['results']], ['updated', 'created'])
+        self.assertEqual(Position.objects.count(), 2)
+        self.assertEqual(self.bulk('/api/positions/bulk/?upsert=company_name', [{}]).status_code, 400)
+
+    @override_settings(BULK_WRITE_CHUNK_SIZE=2)
+    def test_children_across_chunks(self):
+        start = timezone.now().replace(microsecond=0)
+        items = [
+            {'position': self.position.pk, 'event_type': 'technical_interview', 'title': f'Round {i}',
+             'start_datetime': (start + timedelta(days=i)).isoformat(), 'duration': 30 * (i + 1)}
+            for i in range(4)
+        ]
+        items.insert(2, {'position': 999999, 'event_type': 'technical_interview', 'title': 'Orphan',
+                         'start_datetime': start.isoformat()})
+        body = self.bulk('/api/events/bulk/', items).json()
+        self.assertEqual([result['status'] for result in body['results']],
+                         ['created', 'created', 'failed', 'created', 'created'])
+        self.assertIn('position', body['results'][2]['errors'])
+        for event in InterviewEvent.objects.all():
+            self.assertEqual(event.end_datetime, event.start_datetime + timedelta(minutes=event.duration))
+
+    def test_all_failed_or_too_many_is_400(self):
+        orphan = {'position': 999999, 'title': 'Orphan', 'content': 'No position'}
+        self.assertEqual(self.bulk('/api/notes/bulk/', [orphan]).status_code, 400)
+        self.assertEqual(self.bulk('/api/notes/bulk/', {'position': self.position.pk}).status_code, 400)
+        with override_settings(BULK_WRITE_MAX_ITEMS=1):
+            self.assertEqual(self.bulk('/api/notes/bulk/', [{}, {}]).status_code, 400)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.positions = [
+            Position.objects.create(company_name=f'Company {i}', position_title='Backend', job_description='결제')
+            for i in range(3)
+        ]
+        ProcessNote.objects.create(position=cls.positions[0], title='Recruiter', content='Called')
+        InterviewEvent.objects.create(
+            position=cls.positions[2], event_type='technical_interview', title='Round 1',
+            start_datetime=timezone.now().replace(microsecond=0), duration=45,
+        )
+
+    def export(self, **extra):
+        response = self.client.get('/api/export/', extra.pop('params', {}), **extra)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson_lines_match_the_position_detail(self):
+        response, content = self.export()
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        self.assertIn('.ndjson', response['Content-Disposition'])
+        lines = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([line['id'] for line in lines], [position.pk for position in self.positions])
+        for line in lines:
+            detail = self.client.get(f"/api/positions/{line['id']}/").json()
+            for child in detail['notes'] + detail['events']:
+                del child['position']
+            self.assertEqual(line, detail)
+
+    def test_csv_rows(self):
+        response, content = self.export(params={'format': 'csv'})
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(content.decode('utf-8'))))
+        self.assertEqual(list(rows[0]), export.CSV_COLUMNS)
+        self.assertEqual([row['record'] for row in rows], ['position', 'note', 'position', 'position', 'event'])
+        self.assertEqual(rows[1]['position'], str(self.positions[0].pk))
+        self.assertEqual(rows[4]['duration'], '45')
+
+    def test_gzip_when_accepted(self):
+        _, plain = self.export()
+        response, compressed = self.export(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    def test_unknown_format_is_404(self):
+        self.assertEqual(self.client.get('/api/export/', {'format': 'xml'}).status_code, 404)
+
+    def test_small_chunks_keep_every_child(self):
+        counts = Counter()
+        lines = b''.join(export.stream('ndjson', chunk_size=1, counts=counts)).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(counts, Counter(positions=3, notes=1, events=1))
+
+    def test_command_writes_a_gzip_file(self):
+        _, plain = self.export(params={'format': 'csv'})
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/export.csv.gz'
+            out = io.StringIO()
+            call_command('export_tracker', '--format', 'csv', '-o', path, stdout=out)
+            with gzip.open(path, 'rb') as exported:
+                self.assertEqual(exported.read(), plain)
+        self.assertIn('Exported 3 positions, 1 notes and 1 events', out.getvalue())
@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PositionViewSet, ProcessNoteViewSet, InterviewEventViewSet
+from .views import PositionViewSet, ProcessNoteViewSet, InterviewEventViewSet, SearchViewSet, ExportViewSet
 
 router = DefaultRouter()
 router.register(r'positions', PositionViewSet, basename='position')
 router.register(r'notes', ProcessNoteViewSet, basename='processnote')
 router.register(r'events', InterviewEventViewSet, basename='interviewevent')
+router.register(r'search', SearchViewSet, basename='search')
+router.register(r'export', ExportViewSet, basename='export')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,41 +1,190 @@
 import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from bs4 import BeautifulSoup
+from django.conf import settings
+from django.db import connections
+from requests.adapters import HTTPAdapter
+
+from .extraction import extract_fields
+from .fetch_cache import CachedPage, get_fetch_cache, normalize_url
+from .fingerprints import page_hash
+from .host_scheduler import get_scheduler
+from .parse_pool import parse_in_pool
+from .site_profiles import get_profile
+from .streaming import read_body
+
+try:
+    import orjson
+except ImportError:  # optional, speeds up the __NEXT_DATA__ fast path
+    orjson = None
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Response headers stored with posting snapshots
+SNAPSHOT_HEADERS = ['Content-Type', 'Content-Language', 'Date', 'ETag', 'Last-Modified', 'Cache-Control']
+
+NEXT_DATA_TAG = r'''<script\b[^>]*\bid\s*=\s*["']?__NEXT_DATA__["']?[^>]*>'''
+NEXT_DATA_TAG_BYTES = re.compile(NEXT_DATA_TAG.encode(), re.IGNORECASE)
+NEXT_DATA_TAG_TEXT = re.compile(NEXT_DATA_TAG, re.IGNORECASE)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the process-wide requests session used for job page fetches.
+    The session keeps a keep-alive connection pool per host, so repeated
+    fetches from the same job board reuse TCP/TLS connections.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = getattr(settings, 'JOB_FETCH_POOL_MAXSIZE', 16)
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def fetch_page(url):
+    """
+    Fetch a job posting page and return the raw response body (bytes).
+
+    The body is streamed and capped at settings.JOB_FETCH_MAX_BYTES; with
+    JOB_FETCH_EARLY_STOP the download ends once a __NEXT_DATA__ payload
+    holding the whole posting has been received.
+
+    When a fetch cache is configured, fresh entries are returned without a
+    request and stale ones are revalidated with If-None-Match /
+    If-Modified-Since, reusing the cached body on 304 Not Modified.
+    """
+    return fetch_posting(url)[0]
+
+
+def fetch_posting(url, revalidate=False):
+    """
+    Like fetch_page(), but returns (content, headers) with the SNAPSHOT_HEADERS
+    of the response. With revalidate=True even a fresh cache entry is checked
+    with the site (a conditional request) before it is used.
+    """
+    cache = get_fetch_cache()
+    if cache is None:
+        content, response = _download(url)
+        return content, snapshot_headers(response)
+
+    key = normalize_url(url)
+    cached = cache.get(key)
+    if cached is not None and not revalidate and cached.is_fresh(cache.ttl):
+        cache.record('hits')
+        return cached.content, cached.headers
+
+    headers = cached.conditional_headers() if cached is not None else {}
+    content, response = _download(url, headers=headers, not_modified_ok=cached is not None)
+
+    if response.status_code == 304:
+        cache.record('revalidated')
+        cache.set(key, CachedPage(
+            content=cached.content,
+            etag=response.headers.get('ETag', cached.etag),
+            last_modified=response.headers.get('Last-Modified', cached.last_modified),
+            headers=cached.headers,
+        ))
+        return cached.content, cached.headers
+
+    cache.record('misses')
+
+    headers = snapshot_headers(response)
+    cache_control = response.headers.get('Cache-Control', '').lower()
+    # no-cache pages would need revalidating on every use: not worth keeping
+    if 'no-store' not in cache_control and 'no-cache' not in cache_control:
+        cache.set(key, CachedPage(
+            content=content,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            headers=headers,
+        ))
+    return content, headers
+
+
+def snapshot_headers(response):
+    """The response headers worth keeping with a stored page"""
+    return {name: response.headers[name] for name in SNAPSHOT_HEADERS if name in response.headers}
+
+
+def _download(url, headers=None, not_modified_ok=False):
+    """
+    Stream a page body within the byte budget; returns (content, response).
+    With a fetch scheduler configured, the request obeys its host's limits
+    and 429 / 5xx / connection failures are retried with backoff.
+    """
+    scheduler = get_scheduler()
+    if scheduler is None:
+        return _download_once(url, headers, not_modified_ok)
+    return scheduler.call(url, lambda: _download_once(url, headers, not_modified_ok))
+
+
+def _download_once(url, headers=None, not_modified_ok=False):
+    timeout = getattr(settings, 'JOB_FETCH_TIMEOUT', 10)
+    max_bytes = getattr(settings, 'JOB_FETCH_MAX_BYTES', 5 * 1024 * 1024)
+    early_stop = getattr(settings, 'JOB_FETCH_EARLY_STOP', True)
 
+    with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if not_modified_ok and response.status_code == 304:
+            return b'', response
+        response.raise_for_status()
+        content, _ = read_body(response, max_bytes, early_stop=early_stop, is_complete=next_data_complete)
+    return content, response
+
+
+def next_data_complete(content):
+    """True when parse_job_page() would answer from the page's __NEXT_DATA__ alone"""
+    next_data = load_next_data(content)
+    return next_data is not None and bool(job_info_from_next_data(next_data))
 
-def extract_job_description(url):
+
+def extract_job_description(url, snapshot=False, unchanged_hash=None):
     """
     Classic HTML parsing approach - NO AI.
     Extracts job information directly from HTML structure.
     Supports Next.js sites (extracts from __NEXT_DATA__ script tag).
 
     Returns structured data: company_name, position_title, job_description,
-    salary_range, location.
+    salary_range, location. With snapshot=True the fetched page is also
+    stored as a PostingSnapshot and its id returned as 'snapshot'.
+
+    When the fetched page hashes to unchanged_hash (the hash of a page
+    fetched earlier), nothing is parsed and {'unchanged': True} is returned.
+    The page is then revalidated with the site rather than taken from the
+    fetch cache, which could still hold the earlier copy.
     """
     try:
         # Step 1: Fetch the webpage content
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        content, headers = fetch_posting(url, revalidate=bool(unchanged_hash))
 
-        # Step 2: Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        breakpoint  
+        if unchanged_hash and page_hash(content) == unchanged_hash:
+            return {'unchanged': True}
 
-        next_data = extract_from_next_data(soup)
-        if next_data:
-            return next_data
+        # Step 2: Parse HTML with the rules for this job board (in the
+        # parse pool when one is configured)
+        job_info = parse_in_pool(content, url)
 
-        # Step 3: return parsing
-        job_info = {
-            'company_name': extract_company_name(soup),
-            'position_title': extract_position_title(soup),
-            'job_description': extract_job_desc_content(soup),
-            'salary_range': extract_salary(soup),
-            'location': extract_location(soup),
-        }
+        # Step 3: Keep the raw page so it can be re-parsed later
+        if snapshot:
+            from .models import PostingSnapshot
+
+            job_info['snapshot'] = PostingSnapshot.store(url, content, headers).id
 
         return job_info
 
@@ -43,6 +192,67 @@ def extract_job_description(url):
         raise Exception(f"Failed to extract job information: {str(e)}")
 
 
+def extract_job_descriptions(urls, max_workers=None, snapshot=False):
+    """
+    Extract job information for many URLs concurrently.
+
+    Fetches run on a bounded thread pool sharing the pooled session, so the
+    whole batch takes roughly as long as the slowest few pages; parsing is
+    handed to the process pool when JOB_EXTRACTION_PROCESSES is set. Returns one
+    result per URL, in input order: {'url', 'success', 'data'} on success or
+    {'url', 'success', 'error'} on failure. snapshot is passed on to
+    extract_job_description().
+    """
+    if max_workers is None:
+        max_workers = getattr(settings, 'JOB_FETCH_MAX_WORKERS', 16)
+
+    def extract_one(url):
+        try:
+            job_info = extract_job_description(url, snapshot=snapshot)
+            job_info['recruiting_link'] = url
+            return {'url': url, 'success': True, 'data': job_info}
+        except Exception as e:
+            return {'url': url, 'success': False, 'error': str(e)}
+        finally:
+            if snapshot:
+                # Pool threads would otherwise keep their own DB connections open
+                connections.close_all()
+
+    if not urls:
+        return []
+
+    workers = max(1, min(max_workers, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract_one, urls))
+
+
+def parse_job_page(content, url=None):
+    """
+    Parse a fetched job page (bytes or str) into structured job information.
+    The URL selects the site profile; without one the generic rules are used.
+    """
+    # Next.js pages carry everything in __NEXT_DATA__; skip the DOM entirely
+    next_data = load_next_data(content)
+    if next_data is not None:
+        job_info = job_info_from_next_data(next_data)
+        if job_info:
+            return job_info
+
+    soup = BeautifulSoup(content, getattr(settings, 'JOB_HTML_PARSER', 'html.parser'))
+
+    if next_data is None:
+        # The fast path can miss payloads it could not decode itself
+        job_info = extract_from_next_data(soup)
+        if job_info:
+            return job_info
+
+    # Step 3: collect every field in a single pass over the document
+    return extract_fields(
+        soup, extract_text_with_formatting, get_profile(url),
+        fallback_scoring=getattr(settings, 'JOB_DESC_FALLBACK_SCORING', 'length'),
+    )
+
+
 def extract_from_next_data(soup):
     """
     Extract job information from __NEXT_DATA__ script tag (for Next.js sites like Wanted).
@@ -57,6 +267,45 @@ def extract_from_next_data(soup):
         # Parse JSON data
         next_data = json.loads(next_data_script.string)
 
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+    return job_info_from_next_data(next_data)
+
+
+def load_next_data(content):
+    """
+    Fast path for Next.js pages: locate the __NEXT_DATA__ script tag in the
+    raw response body and decode only its JSON payload, without building a
+    DOM. Returns the decoded object, or None when the tag is missing or its
+    payload cannot be decoded (e.g. a non-UTF-8 page).
+    """
+    is_bytes = isinstance(content, (bytes, bytearray))
+    pattern = NEXT_DATA_TAG_BYTES if is_bytes else NEXT_DATA_TAG_TEXT
+    match = pattern.search(content)
+    if not match:
+        return None
+
+    start = match.end()
+    end = content.find(b'</script' if is_bytes else '</script', start)
+    if end == -1:
+        return None
+
+    try:
+        if orjson is not None:
+            # orjson decodes straight from a zero-copy view of the body
+            return orjson.loads(memoryview(content)[start:end] if is_bytes else content[start:end])
+        return json.loads(content[start:end])
+    except ValueError:
+        return None
+
+
+def job_info_from_next_data(next_data):
+    """
+    Build job information from a decoded __NEXT_DATA__ object.
+    Returns complete job info if found, otherwise returns None.
+    """
+    try:
         # For Wanted: props.pageProps.initialData
         job_detail = None
 
@@ -185,248 +434,83 @@ def extract_location_from_json(job_detail):
         return None
 
 
-def extract_company_name(soup):
-    """Extract company name from HTML"""
-    # Common patterns for company name
-    selectors = [
-        ('meta', {'property': 'og:site_name'}),
-        ('meta', {'name': 'author'}),
-        ('h1', {'class': lambda x: x and 'company' in x.lower()}),
-        ('span', {'class': lambda x: x and 'company' in x.lower()}),
-        ('div', {'class': lambda x: x and 'company' in x.lower()}),
-    ]
-
-    for tag, attrs in selectors:
-        element = soup.find(tag, attrs)
-        if element:
-            if tag == 'meta':
-                return element.get('content', '').strip()
-            else:
-                text = element.get_text(strip=True)
-                if text:
-                    return text
-
-    return None
-
-
-def extract_position_title(soup):
-    """Extract position title from HTML"""
-    # Common patterns for job title
-    selectors = [
-        ('meta', {'property': 'og:title'}),
-        ('h1', {}),
-        ('h2', {'class': lambda x: x and any(k in x.lower() for k in ['title', 'position', 'job'])}),
-        ('title', {}),
-    ]
-
-    for tag, attrs in selectors:
-        element = soup.find(tag, attrs)
-        if element:
-            if tag == 'meta':
-                return element.get('content', '').strip()
-            else:
-                text = element.get_text(strip=True)
-                if text and len(text) < 200:  # Reasonable title length
-                    return text
-
-    return None
-
-
-def extract_job_desc_content(soup):
-    """Extract job description with preserved formatting"""
-
-    # Try to extract from __NEXT_DATA__ (Next.js sites like Wanted)
-    breakpoint
-    next_data = extract_from_next_data(soup)
-    breakpoint
-    if next_data:
-        return next_data
-    
-    # Remove noise elements first
-    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']):
-        element.decompose()
-
-    # Common selectors for job description sections
-    job_desc_selectors = [
-        # Wanted
-        {'class': lambda x: x and 'JobDescription_JobDescription' in str(x)},
-        {'data-cy': 'job-description'},
-        # Saramin
-        {'class': 'user_content'},
-        {'class': 'content'},
-        # Jobkorea
-        {'class': 'sumBx'},
-        {'class': 'jd-section'},
-        # LinkedIn
-        {'class': 'show-more-less-html__markup'},
-        # Indeed
-        {'id': 'jobDescriptionText'},
-        # Generic patterns
-        {'class': lambda x: x and 'job-description' in str(x).lower()},
-        {'id': lambda x: x and 'job-description' in str(x).lower()},
-    ]
-
-    job_desc_element = None
-
-    # Try each selector
-    for selector in job_desc_selectors:
-        job_desc_element = soup.find(['div', 'section', 'article'], selector)
-        if job_desc_element:
-            break
-
-    # Fallback: look for largest text block
-    if not job_desc_element:
-        # Find all divs and get the one with most text
-        all_divs = soup.find_all(['div', 'section', 'article'])
-        max_length = 0
-        for div in all_divs:
-            text_length = len(div.get_text(strip=True))
-            if text_length > max_length:
-                max_length = text_length
-                job_desc_element = div
-
-    if not job_desc_element:
-        return "Job description not found"
-
-    # Extract text with formatting preserved
-    return extract_text_with_formatting(job_desc_element)
-
-
-def extract_salary(soup):
-    """Extract salary information from HTML"""
-    # Common patterns for salary
-    salary_keywords = ['salary', 'compensation', '연봉', '급여', '임금']
-
-    # Look in meta tags first
-    meta_tags = soup.find_all('meta')
-    for meta in meta_tags:
-        content = meta.get('content', '')
-        if any(keyword in content.lower() for keyword in salary_keywords):
-            # Try to extract salary pattern
-            import re
-            # Patterns: $50k-70k, 5000만원, etc.
-            salary_patterns = [
-                r'\$[\d,]+k?\s*-?\s*\$?[\d,]+k?',
-                r'[\d,]+만원\s*~?\s*[\d,]+만원',
-                r'[\d,]+원\s*~?\s*[\d,]+원',
-            ]
-            for pattern in salary_patterns:
-                match = re.search(pattern, content)
-                if match:
-                    return match.group(0)
-
-    # Look in text content
-    elements = soup.find_all(['span', 'div', 'p', 'li'])
-    for element in elements:
-        text = element.get_text(strip=True)
-        if any(keyword in text.lower() for keyword in salary_keywords):
-            import re
-            salary_patterns = [
-                r'\$[\d,]+k?\s*-?\s*\$?[\d,]+k?',
-                r'[\d,]+만원\s*~?\s*[\d,]+만원',
-                r'[\d,]+원\s*~?\s*[\d,]+원',
-            ]
-            for pattern in salary_patterns:
-                match = re.search(pattern, text)
-                if match:
-                    return match.group(0)
-
-    return None
-
-
-def extract_location(soup):
-    """Extract location from HTML"""
-    # Common patterns for location
-    selectors = [
-        ('meta', {'property': 'og:location'}),
-        ('span', {'class': lambda x: x and 'location' in str(x).lower()}),
-        ('div', {'class': lambda x: x and 'location' in str(x).lower()}),
-    ]
-
-    for tag, attrs in selectors:
-        element = soup.find(tag, attrs)
-        if element:
-            if tag == 'meta':
-                return element.get('content', '').strip()
-            else:
-                text = element.get_text(strip=True)
-                if text:
-                    return text
-
-    # Look for common location keywords
-    location_keywords = ['location', '위치', '근무지', '지역']
-    elements = soup.find_all(['span', 'div', 'p'])
-    for element in elements:
-        class_str = ' '.join(element.get('class', []))
-        if any(keyword in class_str.lower() for keyword in location_keywords):
-            text = element.get_text(strip=True)
-            if text and len(text) < 100:  # Reasonable location length
-                return text
-
-    return None
+FORMAT_BLOCK_TAGS = frozenset(['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+FORMAT_LIST_TAGS = frozenset(['ul', 'ol'])
+FORMAT_SKIP_KEYWORDS = ['저작권자', '무단전재', '재배포금지', 'copyright', '©']
 
 
-def extract_text_with_formatting(element):
+def iter_formatted_lines(element):
     """
-    Extract text from HTML element while preserving bullets, line breaks, and structure.
-    NO AI - pure HTML parsing.
+    Walk the element's descendants once and yield its text as normalized
+    lines: line breaks for <br> and block elements, '• ' bullets for list
+    items, whitespace collapsed, empty and copyright/legal lines dropped.
     """
-    result = []
+    line = []
+    emitted_any = False         # anything written yet (text, break or bullet)
     previous_was_block = False
+    last_was_break = False
+
+    def finish_line():
+        text = ' '.join(''.join(line).split())
+        line.clear()
+        if text and not any(keyword in text for keyword in FORMAT_SKIP_KEYWORDS):
+            return text
+        return None
 
     for child in element.descendants:
         if isinstance(child, str):
             # Text node
-            text = str(child).strip()
-            if text:
-                result.append(text)
-                previous_was_block = False
-        elif child.name:
-            # Element node
-            if child.name in ['script', 'style']:
+            text = child.strip()
+            if not text:
                 continue
-            elif child.name == 'br':
-                result.append('\n')
-                previous_was_block = True
-            elif child.name in ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                if result and not previous_was_block:
-                    result.append('\n')
-                previous_was_block = True
-            elif child.name == 'li':
-                if result and not result[-1].endswith('\n'):
-                    result.append('\n')
-                result.append('• ')
-                previous_was_block = False
-            elif child.name == 'ul' or child.name == 'ol':
-                if result and not previous_was_block:
-                    result.append('\n')
-                previous_was_block = True
-
-    # Join and clean up
-    text = ''.join(result)
-
-    # Clean up excessive whitespace
-    lines = text.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        line = ' '.join(line.split())  # Normalize spaces
-        if line:  # Skip empty lines
-            cleaned_lines.append(line)
-
-    # Join with single line breaks
-    final_text = '\n'.join(cleaned_lines)
-
-    # Remove excessive blank lines (more than 2)
-    while '\n\n\n' in final_text:
-        final_text = final_text.replace('\n\n\n', '\n\n')
-
-    # Filter out copyright/legal text
-    lines = final_text.split('\n')
-    filtered_lines = []
-    skip_keywords = ['저작권자', '무단전재', '재배포금지', 'copyright', '©']
-
-    for line in lines:
-        if not any(keyword in line for keyword in skip_keywords):
-            filtered_lines.append(line)
-
-    return '\n'.join(filtered_lines).strip()
+            emitted_any = True
+            previous_was_block = False
+            last_was_break = False
+            *complete, rest = text.split('\n')
+            for part in complete:
+                line.append(part)
+                finished = finish_line()
+                if finished:
+                    yield finished
+            line.append(rest)
+            continue
+
+        name = child.name
+        if name in ('script', 'style'):
+            continue
+
+        if name == 'br':
+            breaks = True
+            previous_was_block = True
+        elif name in FORMAT_BLOCK_TAGS or name in FORMAT_LIST_TAGS:
+            breaks = emitted_any and not previous_was_block
+            previous_was_block = True
+        elif name == 'li':
+            breaks = emitted_any and not last_was_break
+            previous_was_block = False
+        else:
+            continue
+
+        if breaks:
+            emitted_any = True
+            last_was_break = True
+            finished = finish_line()
+            if finished:
+                yield finished
+
+        if name == 'li':
+            emitted_any = True
+            last_was_break = False
+            line.append('• ')
+
+    finished = finish_line()
+    if finished:
+        yield finished
+
+
+def extract_text_with_formatting(element):
+    """
+    Extract text from HTML element while preserving bullets, line breaks, and structure.
+    NO AI - pure HTML parsing.
+    """
+    return '\n'.join(iter_formatted_lines(element))
@@ -1,22 +1,82 @@
-from rest_framework import viewsets, status
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from .models import Position, ProcessNote, InterviewEvent
 from .serializers import (
     PositionSerializer, PositionListSerializer,
     ProcessNoteSerializer, InterviewEventSerializer
 )
-from .utils import extract_job_description
+from .bulk import BulkWriteMixin
+from .fetch_cache import get_fetch_cache
+from . import export
+from .conditional import ConditionalGetMixin, make_etag, queryset_version
+from .fieldsets import SparseFieldsetViewMixin
+from .fingerprints import MAX_DISTANCE, content_hash
+from .host_scheduler import get_scheduler
+from .jobs import QueueFull, get_queue
+from .response_cache import ResponseCacheMixin, get_response_cache
+from . import search
+from .stats import get_stats
+from .utils import extract_job_description, extract_job_descriptions
+
+
+def parse_flag(request, name):
+    """Boolean flag from the request body or query string ("false", "0" and "off" are false)"""
+    value = request.data.get(name, request.query_params.get(name))
+    if value is None:
+        return False
+    try:
+        return serializers.BooleanField().to_internal_value(value)
+    except ValidationError:
+        raise ValidationError({name: 'Must be a valid boolean.'})
+
+
+def queue_full_response(error):
+    response = Response(
+        {'error': f'The extraction queue is full ({error}); retry later'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    response['Retry-After'] = '30'
+    return response
+
 
+def cache_id(value):
+    """Normalized id for a response cache scope, or None (e.g. '05' and '5' must share one)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
-class PositionViewSet(viewsets.ModelViewSet):
+
+class PositionViewSet(
+    ResponseCacheMixin, ConditionalGetMixin, SparseFieldsetViewMixin, BulkWriteMixin, viewsets.ModelViewSet
+):
     queryset = Position.objects.all()
+    bulk_upsert_fields = ('recruiting_link',)
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        # ?fields= picks from every field, not just the list columns
+        if self.action == 'list' and 'fields' not in self.request.query_params:
             return PositionListSerializer
         return PositionSerializer
 
+    def response_cache_scopes(self):
+        position_id = cache_id(self.kwargs.get('pk'))
+        if self.action == 'retrieve' and position_id is not None:
+            return [f'position:{position_id}']
+        # Nested notes / events of every position (?expand= or ?fields=)
+        fields = self.get_serializer().fields
+        return ['positions'] + [name for name in ('notes', 'events') if name in fields]
+
     @action(detail=False, methods=['post'])
     def fetch_jd(self, request):
         """Fetch job description from recruiting link and extract information using AI"""
@@ -29,9 +89,57 @@ class PositionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Keep the fetched page only when the caller will save it with a position
+        snapshot = parse_flag(request, 'snapshot')
+
+        if parse_flag(request, 'async'):
+            # Run the extraction on the background queue and return right away
+            try:
+                job, created = get_queue().submit(url, snapshot=snapshot)
+            except QueueFull as e:
+                return queue_full_response(e)
+            return Response(
+                {
+                    'success': True,
+                    'job_id': job.id,
+                    'status': job.status,
+                    'deduplicated': not created,
+                    'status_url': reverse('position-fetch-jd-job', args=[job.id], request=request),
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+
+        # Re-checking a saved position's link: skip work when nothing changed
+        position = None
+        position_id = request.data.get('position')
+        if position_id is not None:
+            position = Position.objects.select_related('snapshot').filter(pk=position_id).first()
+            if position is None:
+                return Response(
+                    {'error': 'Position not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
         try:
             # Extract job information using AI
-            job_info = extract_job_description(url)
+            job_info = extract_job_description(
+                url, snapshot=snapshot,
+                unchanged_hash=position.snapshot.content_hash if position and position.snapshot else None,
+            )
+
+            if position is not None and (
+                job_info.get('unchanged')
+                or position.content_hash and content_hash(job_info.get('job_description')) == position.content_hash
+            ):
+                data = self.extracted_fields(position, url)
+                # The page may have changed around an identical description
+                data['snapshot'] = job_info.get('snapshot', position.snapshot_id)
+                return Response({
+                    'success': True,
+                    'unchanged': True,
+                    'data': data,
+                    'message': 'Job posting has not changed'
+                })
 
             # Add the URL to the extracted data
             job_info['recruiting_link'] = url
@@ -48,10 +156,144 @@ class PositionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @staticmethod
+    def extracted_fields(position, url):
+        """A saved position's fields in the shape fetch_jd returns"""
+        return {
+            'company_name': position.company_name,
+            'position_title': position.position_title,
+            'job_description': position.job_description,
+            'salary_range': position.salary_range,
+            'location': position.location,
+            'snapshot': position.snapshot_id,
+            'recruiting_link': url,
+        }
+
+    @action(detail=True, methods=['get'])
+    def duplicates(self, request, pk=None):
+        """Positions with an identical or near-identical job description"""
+        position = self.get_object()
+        try:
+            max_distance = int(request.query_params.get('max_distance', MAX_DISTANCE))
+        except ValueError:
+            return Response(
+                {'error': 'max_distance must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = []
+        fields = PositionListSerializer.Meta.fields + ['recruiting_link', 'content_hash']
+        for duplicate, distance in position.possible_duplicates(max_distance, fields=fields):
+            item = PositionListSerializer(duplicate).data
+            item['recruiting_link'] = duplicate.recruiting_link
+            item['distance'] = distance
+            item['exact'] = duplicate.content_hash == position.content_hash
+            results.append(item)
+        return Response({'count': len(results), 'results': results})
+
+    @action(detail=False, methods=['get'], url_path=r'fetch_jd_jobs/(?P<job_id>[0-9a-f]+)')
+    def fetch_jd_job(self, request, job_id=None):
+        """Status (and result, once finished) of an asynchronous fetch_jd job"""
+        job = get_queue().get(job_id)
+        if job is None:
+            return Response(
+                {'error': 'Job not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(job.as_dict())
+
+    @action(detail=False, methods=['get'])
+    def fetch_jd_queue_stats(self, request):
+        """Queue depth, throughput and latency of asynchronous fetch_jd jobs"""
+        return Response(get_queue().metrics())
+
+    @action(detail=False, methods=['post'])
+    def fetch_jd_batch(self, request):
+        """Fetch job descriptions for many recruiting links concurrently"""
+        urls = request.data.get('urls')
+
+        if not isinstance(urls, list) or not urls:
+            return Response(
+                {'error': 'A non-empty list of URLs is required in the request body'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = getattr(settings, 'JOB_FETCH_BATCH_LIMIT', 200)
+        if len(urls) > limit:
+            return Response(
+                {'error': f'At most {limit} URLs can be fetched per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not all(isinstance(url, str) and url for url in urls):
+            return Response(
+                {'error': 'Every URL must be a non-empty string'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = extract_job_descriptions(urls, snapshot=parse_flag(request, 'snapshot'))
+        succeeded = sum(1 for result in results if result['success'])
+
+        return Response({
+            'success': succeeded == len(results),
+            'results': results,
+            'message': f'Extracted {succeeded} of {len(results)} job postings'
+        })
+
+    @action(detail=False, methods=['get'])
+    def fetch_host_stats(self, request):
+        """Per-host throttling, retry and circuit breaker state of job page fetches"""
+        scheduler = get_scheduler()
+        if scheduler is None:
+            return Response({'enabled': False})
+        return Response({'enabled': True, 'hosts': scheduler.metrics()})
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Dashboard counts per status and upcoming events, cached until something changes"""
+        return Response(get_stats())
+
+    @action(detail=False, methods=['get'])
+    def fetch_cache_stats(self, request):
+        """Hit/miss counters of the job page fetch cache"""
+        cache = get_fetch_cache()
+        if cache is None:
+            return Response({'enabled': False})
+        return Response({'enabled': True, **cache.stats()})
 
-class ProcessNoteViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def response_cache_stats(self, request):
+        """Hit/miss counters of the API response cache"""
+        cache = get_response_cache()
+        if cache is None:
+            return Response({'enabled': False})
+        return Response({'enabled': True, **cache.stats()})
+
+
+def position_child_scopes(view, table, item):
+    """
+    Response cache scopes of a notes or events request: the one row, the
+    rows of one position (?position_id=) or the whole table, plus the
+    position(s) when ?expand=position nests them.
+    """
+    expanded = isinstance(view.get_serializer().fields.get('position'), serializers.BaseSerializer)
+    item_id = cache_id(view.kwargs.get('pk'))
+    if view.action == 'retrieve' and item_id is not None:
+        return [f'{item}:{item_id}'] + (['positions'] if expanded else [])
+    position_id = cache_id(view.request.query_params.get('position_id'))
+    if position_id is not None:
+        return [f'{table}:{position_id}'] + ([f'position:{position_id}'] if expanded else [])
+    return [table] + (['positions'] if expanded else [])
+
+
+class ProcessNoteViewSet(
+    ResponseCacheMixin, ConditionalGetMixin, SparseFieldsetViewMixin, BulkWriteMixin, viewsets.ModelViewSet
+):
     serializer_class = ProcessNoteSerializer
 
+    def response_cache_scopes(self):
+        return position_child_scopes(self, 'notes', 'note')
+
     def get_queryset(self):
         queryset = ProcessNote.objects.all()
         position_id = self.request.query_params.get('position_id', None)
@@ -63,9 +305,54 @@ class ProcessNoteViewSet(viewsets.ModelViewSet):
         serializer.save()
 
 
-class InterviewEventViewSet(viewsets.ModelViewSet):
+def parse_window_bound(name, value):
+    """ISO 8601 datetime or date (midnight) query parameter as an aware datetime"""
+    if value is None:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day is not None else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Expected an ISO 8601 date or datetime'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+# Calendar feed columns: output name -> InterviewEvent lookup
+CALENDAR_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'event_type': 'event_type',
+    'start': 'start_datetime',
+    'end': 'end_datetime',
+    'location': 'location',
+    'meeting_link': 'meeting_link',
+    'description': 'description',
+    'position': 'position_id',
+    'company_name': 'position__company_name',
+    'position_title': 'position__position_title',
+}
+
+# Longest window the calendar feed serves (a month view with padding weeks fits)
+CALENDAR_MAX_WINDOW = timedelta(days=62)
+
+
+class InterviewEventViewSet(
+    ResponseCacheMixin, ConditionalGetMixin, SparseFieldsetViewMixin, BulkWriteMixin, viewsets.ModelViewSet
+):
     serializer_class = InterviewEventSerializer
 
+    def response_cache_scopes(self):
+        if self.action == 'calendar':
+            # Any event in the window, with its company name
+            return ['events', 'positions']
+        return position_child_scopes(self, 'events', 'event')
+
     def get_queryset(self):
         queryset = InterviewEvent.objects.all()
         position_id = self.request.query_params.get('position_id', None)
@@ -74,12 +361,122 @@ class InterviewEventViewSet(viewsets.ModelViewSet):
 
         if position_id is not None:
             queryset = queryset.filter(position_id=position_id)
-        if start_date is not None:
-            queryset = queryset.filter(start_datetime__gte=start_date)
-        if end_date is not None:
-            queryset = queryset.filter(end_datetime__lte=end_date)
+        if start_date is not None or end_date is not None:
+            # Events overlapping the window, including ones already in progress
+            queryset = queryset.overlapping(
+                parse_window_bound('start_date', start_date),
+                parse_window_bound('end_date', end_date),
+            )
 
         return queryset
 
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Events overlapping a required start_date/end_date window with the
+        fields the calendar shows, joined with their position in one query.
+        ?layout=columnar returns one array per field instead of one object
+        per event.
+        """
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        if not start_date or not end_date:
+            return Response(
+                {'error': 'start_date and end_date are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        start = parse_window_bound('start_date', start_date)
+        end = parse_window_bound('end_date', end_date)
+        if not start < end <= start + CALENDAR_MAX_WINDOW:
+            return Response(
+                {'error': f'end_date must be after start_date and at most {CALENDAR_MAX_WINDOW.days} days later'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = InterviewEvent.objects.overlapping(start, end)
+        position_id = request.query_params.get('position_id')
+        if position_id is not None:
+            queryset = queryset.filter(position_id=position_id)
+
+        def render():
+            rows = list(queryset.values_list(*CALENDAR_FIELDS.values()))
+            names = list(CALENDAR_FIELDS)
+            if request.query_params.get('layout') == 'columnar':
+                events = {name: [row[index] for row in rows] for index, name in enumerate(names)}
+            else:
+                events = [dict(zip(names, row)) for row in rows]
+            return Response({'start': start, 'end': end, 'count': len(rows), 'events': events})
+
+        def respond():
+            # The feed shows position names too, so their changes count
+            etag = make_etag(
+                request.build_absolute_uri(), request.accepted_media_type, queryset_version(queryset),
+                queryset_version(Position.objects.filter(pk__in=queryset.values('position_id'))),
+            )
+            return self.conditional_response(request, etag, None, render)
+
+        return self.cached_response(request, respond)
+
     def perform_create(self, serializer):
         serializer.save()
+
+
+class SearchViewSet(viewsets.ViewSet):
+    """Full-text search over job descriptions and notes (SQLite FTS5, trigram)"""
+    max_limit = 100
+
+    def list(self, request):
+        if not search.available():
+            return Response(
+                {'error': 'Full-text search needs SQLite with the FTS5 trigram tokenizer'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        current_status = request.query_params.get('current_status')
+        if current_status is not None and current_status not in dict(Position.PROCESS_STATUS_CHOICES):
+            return Response(
+                {'error': f'Unknown current_status: {current_status}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        kind = request.query_params.get('kind')
+        if kind is not None and kind not in search.KINDS:
+            return Response(
+                {'error': f"kind must be one of: {', '.join(search.KINDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+            offset = int(request.query_params.get('offset', 0))
+        except ValueError:
+            return Response({'error': 'limit and offset must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = search.search(query, current_status=current_status, kind=kind, limit=max(limit, 1), offset=max(offset, 0))
+        return Response({'query': query, 'count': len(results), 'results': results})
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """
+    Every position with its notes and events, streamed as NDJSON (default,
+    ?format=ndjson) or CSV (?format=csv), gzip-compressed on the fly for
+    clients that accept it
+    """
+    renderer_classes = [export.NDJSONRenderer, export.CSVRenderer]
+
+    def list(self, request):
+        renderer = request.accepted_renderer
+        content = export.stream(renderer.format)
+        compress = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if compress:
+            content = export.gzip(content)
+
+        response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset=utf-8')
+        filename = f"recruit-tracker-{timezone.now():%Y%m%d}.{renderer.format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
@@ -65,10 +65,120 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Cursor pages ({next, previous, results}); add ?count=1 for a total count
+    'DEFAULT_PAGINATION_CLASS': 'applications.pagination.KeysetPagination',
     'PAGE_SIZE': 50
 }
 
+# Job page fetching (applications.utils)
+JOB_FETCH_TIMEOUT = 10
+JOB_FETCH_MAX_WORKERS = int(os.getenv('JOB_FETCH_MAX_WORKERS', '16'))
+JOB_FETCH_POOL_MAXSIZE = JOB_FETCH_MAX_WORKERS
+JOB_FETCH_BATCH_LIMIT = 200
+# Background workers for asynchronous fetch_jd jobs and how many finished
+# jobs are kept for polling (applications.jobs)
+JOB_EXTRACTION_QUEUE_WORKERS = int(os.getenv('JOB_EXTRACTION_QUEUE_WORKERS', '4'))
+JOB_EXTRACTION_QUEUE_RETENTION = 1000
+# Jobs waiting for a worker before new ones are refused with 503
+JOB_EXTRACTION_QUEUE_MAX_DEPTH = 1000
+# Largest body read per page; the download also ends early once a
+# __NEXT_DATA__ payload holding the whole posting has been received (other
+# pages are read in full, since fields often follow the description).
+JOB_FETCH_MAX_BYTES = 5 * 1024 * 1024
+JOB_FETCH_EARLY_STOP = True
+# Hours a snapshot stored by fetch_jd is kept without a position using it
+# (manage.py prune_snapshots)
+POSTING_SNAPSHOT_RETENTION_HOURS = 24
+
+# Per-host politeness for job page fetches (applications.host_scheduler):
+# concurrency cap, token bucket (requests/second + burst), retries with
+# jittered exponential backoff on 429/5xx and a circuit breaker. 'HOSTS'
+# overrides DEFAULT for a domain and its subdomains; set to None to disable.
+# The defaults keep to 2 requests/second and 4 at a time per host, below
+# JOB_FETCH_MAX_WORKERS; opt a board out with e.g. 'HOSTS': {'example.com':
+# {'RATE': None, 'MAX_CONCURRENCY': 16}} when it is known to take more.
+JOB_FETCH_SCHEDULER = {
+    'DEFAULT': {
+        'MAX_CONCURRENCY': 4,
+        'RATE': 2.0,
+        'BURST': 4,
+        'MAX_RETRIES': 3,
+        'BACKOFF_BASE': 0.5,
+        'BACKOFF_MAX': 30.0,
+        'FAILURE_THRESHOLD': 5,
+        'RESET_TIMEOUT': 60.0,
+    },
+    'HOSTS': {},
+}
+
+# Extra site profiles (dotted paths to applications.extraction.SiteProfile
+# instances) added to the built-in ones in applications.site_profiles
+JOB_EXTRACTOR_PROFILES = []
+
+# BeautifulSoup parser backend for job pages ('lxml' and 'html5lib' need
+# their packages installed); compare them with `manage.py benchmark_suite`
+JOB_HTML_PARSER = os.getenv('JOB_HTML_PARSER', 'html.parser')
+
+# How the description fallback ranks blocks when no selector matches:
+# 'length' (most text) or 'density' (text vs. link and markup ratio)
+JOB_DESC_FALLBACK_SCORING = os.getenv('JOB_DESC_FALLBACK_SCORING', 'length')
+
+# Worker processes that parse fetched pages (applications.parse_pool), so
+# concurrent extractions are not serialized on the GIL. 0 parses in-process.
+JOB_EXTRACTION_PROCESSES = int(os.getenv('JOB_EXTRACTION_PROCESSES', '0'))
+JOB_EXTRACTION_START_METHOD = 'spawn'
+
+# Cache for fetched job pages (applications.fetch_cache). Use
+# 'applications.fetch_cache.DjangoFetchCache' to share it through CACHES
+# (without MAX_ENTRIES: the cache's own OPTIONS bound it); set to None to
+# disable.
+JOB_FETCH_CACHE = {
+    'BACKEND': 'applications.fetch_cache.InMemoryFetchCache',
+    'TTL': int(os.getenv('JOB_FETCH_CACHE_TTL', '300')),
+    'MAX_ENTRIES': 256,
+}
+
+# Seconds /api/positions/stats/ stays cached (applications.stats) when
+# nothing is saved. Invalidation goes through the default cache, so
+# multi-process deployments need a shared CACHES backend.
+DASHBOARD_STATS_TTL = int(os.getenv('DASHBOARD_STATS_TTL', '300'))
+
+# Longest interview event in minutes. Event window queries look back this
+# far for events already in progress, so longer durations are rejected.
+INTERVIEW_EVENT_MAX_DURATION = 24 * 60
+
+# POST .../bulk/ (applications.bulk): most items per request, and items
+# written per transaction
+BULK_WRITE_MAX_ITEMS = 50000
+BULK_WRITE_CHUNK_SIZE = 1000
+
+# Positions read per query by the streaming export (applications.export)
+EXPORT_CHUNK_SIZE = 2000
+
+# 'api' holds rendered API responses (applications.response_cache). Any
+# Django backend works: locmem (per process), FileBasedCache (shared by the
+# processes of one host, LOCATION a directory) or RedisCache (LOCATION
+# redis://127.0.0.1:6379, needs the redis package).
+API_CACHE_BACKEND = os.getenv('API_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': API_CACHE_BACKEND,
+        'LOCATION': os.getenv('API_CACHE_LOCATION', 'api-responses'),
+        # Redis evicts by its own maxmemory policy and rejects this option
+        'OPTIONS': {} if 'redis' in API_CACHE_BACKEND.lower() else {'MAX_ENTRIES': 2000},
+    },
+}
+
+# Cache for list/detail responses of the positions, notes and events APIs,
+# invalidated per position by model signals; set to None to disable.
+API_RESPONSE_CACHE = {
+    'ALIAS': 'api',
+    'TTL': int(os.getenv('API_RESPONSE_CACHE_TTL', '300')),
+}
+
 ROOT_URLCONF = 'recruit_tracker.urls'
 
 TEMPLATES = [
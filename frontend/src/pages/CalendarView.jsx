@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react';
 import { Calendar, dateFnsLocalizer } from 'react-big-calendar';
-import { format, parse, startOfWeek, getDay } from 'date-fns';
-import { eventAPI, positionAPI } from '../services/api';
+import { addDays, format, parse, startOfWeek, getDay } from 'date-fns';
+import { eventAPI } from '../services/api';
 import enUS from 'date-fns/locale/en-US';
 import 'react-big-calendar/lib/css/react-big-calendar.css';
 import './CalendarView.css';
@@ -18,40 +18,36 @@ const localizer = dateFnsLocalizer({
   locales,
 });
 
+// The default week view
+const initialRange = () => {
+  const start = startOfWeek(new Date());
+  return { start, end: addDays(start, 7) };
+};
+
 function CalendarView() {
   const [events, setEvents] = useState([]);
-  const [positions, setPositions] = useState({});
+  const [range, setRange] = useState(initialRange);
   const [selectedEvent, setSelectedEvent] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     fetchData();
-  }, []);
+  }, [range]);
 
   const fetchData = async () => {
     try {
-      setLoading(true);
-      const [eventsRes, positionsRes] = await Promise.all([
-        eventAPI.getAll(),
-        positionAPI.getAll(),
-      ]);
-
-      const eventsData = eventsRes.data.results || eventsRes.data;
-      const positionsData = positionsRes.data.results || positionsRes.data;
-
-      // Create position lookup
-      const positionLookup = {};
-      positionsData.forEach(pos => {
-        positionLookup[pos.id] = pos;
+      // Only the visible window, with company names joined by the server
+      const res = await eventAPI.getCalendar({
+        start_date: range.start.toISOString(),
+        end_date: range.end.toISOString(),
       });
-      setPositions(positionLookup);
 
       // Transform events for calendar
-      const calendarEvents = eventsData.map(event => ({
+      const calendarEvents = res.data.events.map(event => ({
         id: event.id,
         title: event.title,
-        start: new Date(event.start_datetime),
-        end: new Date(event.end_datetime),
+        start: new Date(event.start),
+        end: new Date(event.end),
         resource: event,
       }));
 
@@ -63,6 +59,15 @@ function CalendarView() {
     }
   };
 
+  const handleRangeChange = (visible) => {
+    // Week and day views pass the visible days, month view a start/end pair
+    if (Array.isArray(visible)) {
+      setRange({ start: visible[0], end: addDays(visible[visible.length - 1], 1) });
+    } else {
+      setRange({ start: visible.start, end: addDays(visible.end, 1) });
+    }
+  };
+
   const handleSelectEvent = (event) => {
     setSelectedEvent(event);
   };
@@ -143,6 +148,7 @@ function CalendarView() {
           endAccessor="end"
           style={{ height: 600 }}
           onSelectEvent={handleSelectEvent}
+          onRangeChange={handleRangeChange}
           eventPropGetter={eventStyleGetter}
           views={['month', 'week', 'day']}
           defaultView="week"
@@ -169,11 +175,11 @@ function CalendarView() {
               )}
               <p>
                 <strong>Start:</strong>{' '}
-                {new Date(selectedEvent.resource.start_datetime).toLocaleString()}
+                {new Date(selectedEvent.resource.start).toLocaleString()}
               </p>
               <p>
                 <strong>End:</strong>{' '}
-                {new Date(selectedEvent.resource.end_datetime).toLocaleString()}
+                {new Date(selectedEvent.resource.end).toLocaleString()}
               </p>
               {selectedEvent.resource.location && (
                 <p>
@@ -192,11 +198,11 @@ function CalendarView() {
                   </a>
                 </p>
               )}
-              {positions[selectedEvent.resource.position] && (
+              {selectedEvent.resource.company_name && (
                 <p>
                   <strong>Position:</strong>{' '}
-                  {positions[selectedEvent.resource.position].company_name} -{' '}
-                  {positions[selectedEvent.resource.position].position_title}
+                  {selectedEvent.resource.company_name} -{' '}
+                  {selectedEvent.resource.position_title}
                 </p>
               )}
             </div>
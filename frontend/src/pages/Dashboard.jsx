@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
-import { positionAPI, eventAPI } from '../services/api';
+import { positionAPI } from '../services/api';
 import './Dashboard.css';
 
 function Dashboard() {
@@ -21,31 +21,17 @@ function Dashboard() {
   const fetchData = async () => {
     try {
       setLoading(true);
-      const [positionsRes, eventsRes] = await Promise.all([
-        positionAPI.getAll(),
-        eventAPI.getAll({
-          start_date: new Date().toISOString(),
-        }),
-      ]);
+      // Counts, recent positions and upcoming events are computed by the server
+      const { data } = await positionAPI.getStats();
 
-      const positionsData = positionsRes.data.results || positionsRes.data;
-      setPositions(positionsData);
-
-      // Calculate stats
-      const statsData = {
-        total: positionsData.length,
-        applied: positionsData.filter(p => p.current_status === 'applied').length,
-        interviewing: positionsData.filter(p =>
-          ['coding_test', 'technical_interview', 'cultural_fit', 'final_interview'].includes(p.current_status)
-        ).length,
-        offer: positionsData.filter(p => p.current_status === 'offer').length,
-      };
-      setStats(statsData);
-
-      // Get upcoming events (next 7 days)
-      const eventsData = eventsRes.data.results || eventsRes.data;
-      const upcoming = eventsData.slice(0, 5);
-      setUpcomingEvents(upcoming);
+      setPositions(data.recent_positions);
+      setStats({
+        total: data.total,
+        applied: data.by_status.applied,
+        interviewing: data.interviewing,
+        offer: data.by_status.offer,
+      });
+      setUpcomingEvents(data.next_events);
     } catch (error) {
       console.error('Error fetching dashboard data:', error);
     } finally {
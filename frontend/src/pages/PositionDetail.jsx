@@ -37,7 +37,8 @@ function PositionDetail() {
     try {
       setLoading(true);
       const [positionRes, notesRes, eventsRes] = await Promise.all([
-        positionAPI.getOne(id),
+        // Notes and events come from their own (paginated) endpoints
+        positionAPI.getOne(id, { omit: 'notes,events' }),
         noteAPI.getAll(id),
         eventAPI.getAll({ position_id: id }),
       ]);
@@ -15,6 +15,7 @@ function PositionList() {
     salary_range: '',
     current_status: 'applied',
     job_description: '',
+    snapshot: null,
   });
 
   useEffect(() => {
@@ -45,6 +46,7 @@ function PositionList() {
         salary_range: '',
         current_status: 'applied',
         job_description: '',
+        snapshot: null,
       });
       setShowForm(false);
       fetchPositions();
@@ -60,6 +62,8 @@ function PositionList() {
     try {
       const res = await positionAPI.fetchJD({
         url: form.recruiting_link,
+        // Keep the fetched page so the saved position can be re-parsed later
+        snapshot: true,
       });
 
       // Handle response format: { success: true, data: { ... } }
@@ -73,6 +77,7 @@ function PositionList() {
           location: fetchedData.location || form.location,
           salary_range: fetchedData.salary_range || form.salary_range,
           recruiting_link: fetchedData.recruiting_link || form.recruiting_link,
+          snapshot: fetchedData.snapshot ?? form.snapshot,
         });
         alert("JD 정보를 성공적으로 가져왔습니다!");
       } else {
@@ -12,11 +12,16 @@ const api = axios.create({
 // Position endpoints
 export const positionAPI = {
   getAll: () => api.get('/positions/'),
-  getOne: (id) => api.get(`/positions/${id}/`),
+  getOne: (id, params) => api.get(`/positions/${id}/`, { params }),
   create: (data) => api.post('/positions/', data),
   update: (id, data) => api.put(`/positions/${id}/`, data),
   delete: (id) => api.delete(`/positions/${id}/`),
   fetchJD: (data) => api.post(`/positions/fetch_jd/`, data),
+  fetchJDBatch: (urls) => api.post(`/positions/fetch_jd_batch/`, { urls }),
+  fetchJDAsync: (data) => api.post(`/positions/fetch_jd/`, { ...data, async: true }),
+  getFetchJDJob: (jobId) => api.get(`/positions/fetch_jd_jobs/${jobId}/`),
+  getDuplicates: (id, params) => api.get(`/positions/${id}/duplicates/`, { params }),
+  getStats: () => api.get('/positions/stats/'),
 };
 
 // ProcessNote endpoints
@@ -30,6 +35,7 @@ export const noteAPI = {
 // InterviewEvent endpoints
 export const eventAPI = {
   getAll: (params) => api.get('/events/', { params }),
+  getCalendar: (params) => api.get('/events/calendar/', { params }),
   create: (data) => api.post('/events/', data),
   update: (id, data) => api.put(`/events/${id}/`, data),
   delete: (id) => api.delete(`/events/${id}/`),